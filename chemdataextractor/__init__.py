@@ -24,3 +24,4 @@ log.addHandler(logging.NullHandler())
 
 
 from .doc.document import Document
+from .memory import memory_report, clear_caches
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+chemdataextractor.batch
+~~~~~~~~~~~~~~~~~~~~~~~
+
+Extract records from many documents in a resumable run that can be split between machines.
+
+Usage::
+
+    inputs = find_documents('corpus/')
+    checkpoint = Checkpoint('output/checkpoint.jsonl')
+    summary = run_batch(inputs, 'output/', checkpoint, shard=(0, 4))
+
+Each document's records are written to a JSON file in the output directory, at the document's path relative to the
+input directory with ``.json`` appended. Outputs are written to a temporary file that is renamed into place, so an
+interrupted run never leaves a partial output. Each finished document is then appended to the checkpoint file, and
+documents already in the checkpoint are skipped when the run is restarted.
+
+Documents are assigned to shards by a hash of their name, so each machine in a run can be given the same inputs and a
+different shard, and the split doesn't depend on the order the inputs are listed in.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import io
+import json
+import logging
+import os
+import tempfile
+from timeit import default_timer
+import zlib
+
+import six
+
+from .doc.document import Document
+from .utils import ensure_dir
+
+
+log = logging.getLogger(__name__)
+
+
+#: Renames a file over an existing file. Atomic on POSIX systems.
+_replace = getattr(os, 'replace', os.rename)
+
+
+def parse_shard(value):
+    """Return the (index, count) of a shard given as a string like ``'2/8'``, where index is from 0 to count - 1.
+
+    :param string value: The shard.
+    :rtype: tuple(int, int)
+    """
+    try:
+        index, count = [int(part) for part in value.split('/')]
+    except ValueError:
+        raise ValueError('Shard %r is not of the form INDEX/COUNT' % value)
+    if count < 1 or not 0 <= index < count:
+        raise ValueError('Shard index must be from 0 to %s' % (count - 1))
+    return index, count
+
+
+def in_shard(name, shard):
+    """Return whether the document with a name is in a shard.
+
+    :param string name: The document name.
+    :param tuple(int, int) shard: The (index, count) of the shard.
+    """
+    index, count = shard
+    # Mask so the hash is unsigned on Python 2 too
+    return (zlib.crc32(name.encode('utf-8')) & 0xffffffff) % count == index
+
+
+def _name(path):
+    """Return a document name for a path, which is relative, uses forward slashes and doesn't go up any directories."""
+    drive, path = os.path.splitdrive(os.path.normpath(path))
+    return '/'.join(part for part in path.replace(os.sep, '/').split('/') if part not in {'', '.', '..'})
+
+
+def find_documents(directory):
+    """Return the (name, path) of each file in a directory and its subdirectories, sorted by name.
+
+    Hidden files and directories are skipped.
+
+    :param string directory: The directory.
+    :rtype: list(tuple(string, string))
+    """
+    documents = []
+    for root, dirnames, filenames in os.walk(directory):
+        dirnames[:] = [dirname for dirname in dirnames if not dirname.startswith('.')]
+        for filename in filenames:
+            if not filename.startswith('.'):
+                path = os.path.join(root, filename)
+                documents.append((_name(os.path.relpath(path, directory)), path))
+    return sorted(documents)
+
+
+def read_manifest(manifest):
+    """Return the (name, path) of each document listed in a manifest file.
+
+    The manifest lists one path per line. Relative paths are relative to the directory of the manifest, and are used as
+    the document name. Blank lines and lines starting with ``#`` are skipped.
+
+    :param string manifest: Path to the manifest file.
+    :rtype: list(tuple(string, string))
+    """
+    directory = os.path.dirname(os.path.abspath(manifest))
+    documents = []
+    with io.open(manifest, encoding='utf8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                documents.append((_name(line), os.path.join(directory, line)))
+    return documents
+
+
+def write_atomic(path, contents):
+    """Write text to a file by writing a temporary file in the same directory and renaming it into place.
+
+    :param string path: The file to write.
+    :param string contents: The text to write.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    ensure_dir(directory)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+    try:
+        with io.open(fd, 'w', encoding='utf8') as f:
+            f.write(contents)
+            f.flush()
+            os.fsync(f.fileno())
+        _replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class Checkpoint(object):
+    """A file that records each document that a batch run has finished, one JSON object per line.
+
+    Lines are appended and flushed to disk as each document finishes, so the checkpoint is up to date if the run is
+    interrupted. A partly written last line is ignored and removed when the checkpoint is read, so that new entries
+    start on a line of their own.
+    """
+
+    def __init__(self, path):
+        """
+
+        :param string path: Path to the checkpoint file. It is created if it doesn't exist.
+        """
+        self.path = path
+        #: Dictionary of document name to the latest entry for it.
+        self.entries = {}
+        if os.path.isfile(path):
+            with io.open(path, 'rb+') as f:
+                complete = 0
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        log.warning('Removing incomplete last line from checkpoint %s' % path)
+                        f.truncate(complete)
+                        break
+                    complete += len(line)
+                    try:
+                        entry = json.loads(line.decode('utf8'))
+                    except ValueError:
+                        log.warning('Ignoring incomplete line in checkpoint %s' % path)
+                        continue
+                    self.entries[entry['name']] = entry
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def finished(self, name, retry_failed=False):
+        """Return whether a document has been finished, and doesn't need to be processed again.
+
+        :param string name: The document name.
+        :param bool retry_failed: Whether documents that failed count as not finished.
+        """
+        entry = self.entries.get(name)
+        return entry is not None and not (retry_failed and entry['status'] == 'failed')
+
+    def record(self, entry):
+        """Append an entry for a document, which must include its ``name`` and ``status``."""
+        ensure_dir(os.path.dirname(os.path.abspath(self.path)))
+        with io.open(self.path, 'a', encoding='utf8') as f:
+            f.write(six.text_type(json.dumps(entry, ensure_ascii=False)) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries[entry['name']] = entry
+
+
+def checkpoint_path(output_dir, shard=(0, 1)):
+    """Return the default checkpoint path for a shard of a run, so that shards sharing an output directory don't clash.
+
+    :param string output_dir: The output directory.
+    :param tuple(int, int) shard: The (index, count) of the shard.
+    """
+    if shard[1] == 1:
+        return os.path.join(output_dir, 'checkpoint.jsonl')
+    return os.path.join(output_dir, 'checkpoint-%s-of-%s.jsonl' % shard)
+
+
+def output_path(output_dir, name):
+    """Return the path of the output file for a document."""
+    return os.path.join(output_dir, *(name + '.json').split('/'))
+
+
+def extract(path, output):
+    """Extract the records of a document and write them to a JSON file. Return the number of records.
+
+    :param string path: Path to the document.
+    :param string output: Path to the output file.
+    """
+    records = Document.from_file(path).records
+    write_atomic(output, six.text_type(records.to_json(indent=2, ensure_ascii=False)))
+    return len(records)
+
+
+def run_batch(documents, output_dir, checkpoint, shard=(0, 1), retry_failed=False):
+    """Extract the records of each document in a shard that isn't already finished in the checkpoint.
+
+    A document that can't be read or processed is logged and recorded as failed, and the run continues.
+
+    :param list(tuple(string, string)) documents: The (name, path) of each document, as returned by
+                                                  :func:`find_documents` or :func:`read_manifest`.
+    :param string output_dir: The directory to write the output files to.
+    :param Checkpoint checkpoint: The checkpoint of the run.
+    :param tuple(int, int) shard: (Optional) The (index, count) of the shard to process. Default is all documents.
+    :param bool retry_failed: (Optional) Whether to process documents that failed in a previous run again.
+    :returns: Dictionary with the number of documents that were ``processed``, ``failed`` and ``skipped`` because they
+              were already finished, and the number of ``records`` extracted.
+    """
+    summary = {'processed': 0, 'failed': 0, 'skipped': 0, 'records': 0}
+    for name, path in documents:
+        if not in_shard(name, shard):
+            continue
+        if checkpoint.finished(name, retry_failed=retry_failed):
+            summary['skipped'] += 1
+            continue
+        log.info('Extracting %s' % name)
+        start = default_timer()
+        output = output_path(output_dir, name)
+        try:
+            records = extract(path, output)
+        except Exception as e:
+            log.exception('Failed to extract %s' % name)
+            checkpoint.record({
+                'name': name, 'status': 'failed', 'time': default_timer() - start,
+                'error': '%s: %s' % (e.__class__.__name__, e)
+            })
+            summary['failed'] += 1
+            continue
+        checkpoint.record({
+            'name': name, 'status': 'done', 'time': default_timer() - start, 'records': records,
+            'output': os.path.relpath(output, output_dir).replace(os.sep, '/')
+        })
+        summary['processed'] += 1
+        summary['records'] += records
+    return summary
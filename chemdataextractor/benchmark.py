@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+"""
+chemdataextractor.benchmark
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Measure the throughput of the readers, the full extraction pipeline and each pipeline stage in isolation.
+
+Inputs are files (e.g. the documents in tests/data) and synthetic chemistry-like documents of any size, generated with
+paragraphs of experimental procedures that contain NMR, IR and melting point statements, abbreviation definitions and
+tables of properties. Results are plain dictionaries, so they can be written as JSON and compared between releases.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from collections import OrderedDict
+import io
+import logging
+import os
+import platform
+import random
+import sys
+from timeit import default_timer
+from xml.sax.saxutils import escape
+
+import six
+
+from . import __version__
+from .doc.document import Document
+from .doc.table import Table
+from .doc.text import Text
+from .errors import ModelNotFoundError
+from .nlp.lexicon import Lexicon
+from .nlp.tag import NoneTagger, RegexTagger
+from .nlp.tokenize import BaseTokenizer
+from .profiler import Profiler
+
+
+log = logging.getLogger(__name__)
+
+
+SUBSTITUENTS = ['methyl', 'ethyl', 'methoxy', 'chloro', 'bromo', 'fluoro', 'nitro', 'amino', 'hydroxy', 'phenyl',
+                'trifluoromethyl', 'cyano', 'acetyl', 'benzyloxy', 'dimethylamino']
+CORES = ['benzaldehyde', 'benzoic acid', 'phenol', 'aniline', 'pyridine', 'quinoline', 'indole', 'naphthalene',
+         'thiophene', 'benzofuran', 'coumarin', 'acetophenone', 'benzimidazole', 'carbazole', 'pyrimidine']
+SOLVENTS = [('dichloromethane', 'DCM'), ('tetrahydrofuran', 'THF'), ('N,N-dimethylformamide', 'DMF'),
+            ('ethyl acetate', 'EtOAc'), ('dimethyl sulfoxide', 'DMSO'), ('acetonitrile', 'MeCN')]
+REAGENTS = [('triethylamine', 'Et3N'), ('sodium hydride', 'NaH'), ('potassium carbonate', 'K2CO3'),
+            ('N-bromosuccinimide', 'NBS'), ('4-dimethylaminopyridine', 'DMAP'), ('lithium aluminium hydride', 'LAH')]
+COLOURS = ['white', 'colourless', 'pale yellow', 'yellow', 'orange', 'red', 'brown']
+
+
+def _name(rnd):
+    """Return a random substituted compound name."""
+    subs = rnd.sample(SUBSTITUENTS, rnd.randint(1, 2))
+    return '-'.join('%s-%s' % (rnd.randint(2, 6), sub) for sub in subs) + rnd.choice(CORES)
+
+
+def _nmr_peaks(rnd, count):
+    peaks = []
+    for _ in range(count):
+        shift = rnd.uniform(0.8, 8.5)
+        mult = rnd.choice(['s', 'd', 't', 'q', 'm', 'dd'])
+        if mult in {'d', 't', 'q', 'dd'}:
+            peaks.append('%.2f (%s, J = %.1f Hz, %dH)' % (shift, mult, rnd.uniform(1, 16), rnd.randint(1, 3)))
+        else:
+            peaks.append('%.2f (%s, %dH)' % (shift, mult, rnd.randint(1, 3)))
+    return ', '.join(peaks)
+
+
+def _procedure(rnd, name, label):
+    """Return a paragraph describing the synthesis and characterization of a compound."""
+    start, start_label = _name(rnd), '%d%s' % (rnd.randint(1, 20), rnd.choice('abcdef'))
+    solvent, solvent_abbr = rnd.choice(SOLVENTS)
+    reagent, reagent_abbr = rnd.choice(REAGENTS)
+    mp = rnd.uniform(50, 250)
+    return (
+        'A solution of %s (%s) (%.2f g, %.1f mmol) in %s (%s) (%d mL) was treated with %s (%s) (%.1f mmol) and the '
+        'mixture was stirred at %d °C for %d h. The %s was removed under reduced pressure and the residue was '
+        'purified by column chromatography to give %s (%s) as a %s solid (%.2f g, %d%%). Mp %.0f–%.0f °C. '
+        '1H NMR (400 MHz, CDCl3): δ %s. 13C NMR (101 MHz, CDCl3): δ %s. IR (KBr): ν %s cm−1.'
+    ) % (
+        start, start_label, rnd.uniform(0.1, 5), rnd.uniform(0.5, 20), solvent, solvent_abbr, rnd.randint(5, 100),
+        reagent, reagent_abbr, rnd.uniform(0.5, 20), rnd.randint(-78, 120), rnd.randint(1, 48), solvent_abbr, name,
+        label, rnd.choice(COLOURS), rnd.uniform(0.1, 5), rnd.randint(20, 99), mp, mp + rnd.uniform(1, 3),
+        _nmr_peaks(rnd, rnd.randint(3, 8)), ', '.join('%.1f' % rnd.uniform(10, 200) for _ in range(rnd.randint(4, 10))),
+        ', '.join('%d' % rnd.randint(600, 3500) for _ in range(rnd.randint(3, 6)))
+    )
+
+
+def _table(rnd, number, labels):
+    """Return the caption, heading row and rows of a table of properties of compounds."""
+    solvent, solvent_abbr = rnd.choice(SOLVENTS)
+    caption = 'Table %d Photophysical properties of compounds %s in %s' % (number, ', '.join(labels), solvent)
+    headings = ['Compound', 'λabs/nm', 'λem/nm', 'ΦF', 'Mp/°C']
+    rows = [[label, '%d' % rnd.randint(250, 450), '%d' % rnd.randint(350, 650), '%.2f' % rnd.random(),
+             '%d–%d' % (rnd.randint(50, 200), rnd.randint(201, 250))] for label in labels]
+    return caption, headings, rows
+
+
+def _content(paragraphs, tables, seed):
+    """Yield ('h1'|'h2'|'p', text) and ('table', (caption, headings, rows)) items of a synthetic document."""
+    rnd = random.Random(seed)
+    yield 'h1', 'Synthesis and photophysical properties of substituted %s derivatives' % rnd.choice(CORES)
+    labels = []
+    table_every = paragraphs // tables if tables else None
+    table_number = 0
+    for i in range(paragraphs):
+        label = '%d%s' % (i // 6 + 1, 'abcdef'[i % 6])
+        labels.append(label)
+        name = _name(rnd)
+        yield 'h2', '%s (%s)' % (name, label)
+        yield 'p', _procedure(rnd, name, label)
+        if table_every and (i + 1) % table_every == 0 and table_number < tables:
+            table_number += 1
+            yield 'table', _table(rnd, table_number, labels[-6:])
+
+
+def generate_html(paragraphs=100, tables=10, seed=0):
+    """Return a synthetic chemistry-like HTML document as a byte string.
+
+    :param int paragraphs: Number of experimental procedure paragraphs, each with a heading.
+    :param int tables: Number of tables, spread evenly between the paragraphs.
+    :param int seed: Random seed. The same seed always generates the same document.
+    :rtype: bytes
+    """
+    lines = ['<!DOCTYPE html>', '<html>', '<head><meta charset="utf-8"></head>', '<body>']
+    for kind, content in _content(paragraphs, tables, seed):
+        if kind == 'table':
+            caption, headings, rows = content
+            lines.append('<table>')
+            lines.append('<caption>%s</caption>' % escape(caption))
+            lines.append('<thead><tr>%s</tr></thead>' % ''.join('<th>%s</th>' % escape(h) for h in headings))
+            lines.append('<tbody>')
+            for row in rows:
+                lines.append('<tr>%s</tr>' % ''.join('<td>%s</td>' % escape(c) for c in row))
+            lines.append('</tbody>')
+            lines.append('</table>')
+        else:
+            lines.append('<%s>%s</%s>' % (kind, escape(content), kind))
+    lines.extend(['</body>', '</html>'])
+    return '\n'.join(lines).encode('utf-8')
+
+
+def generate_text(paragraphs=100, seed=0):
+    """Return a synthetic chemistry-like plain text document as a byte string.
+
+    :param int paragraphs: Number of experimental procedure paragraphs, each with a heading.
+    :param int seed: Random seed. The same seed always generates the same document.
+    :rtype: bytes
+    """
+    return '\n\n'.join(content for kind, content in _content(paragraphs, 0, seed)).encode('utf-8')
+
+
+def generate_table_html(rows=400, seed=0):
+    """Return an HTML document with one long table of properties of compounds as a byte string.
+
+    As in the tables of real papers, each column repeats a small number of distinct values, so the table measures how
+    well work is shared between identical cells.
+
+    :param int rows: Number of rows.
+    :param int seed: Random seed. The same seed always generates the same document.
+    :rtype: bytes
+    """
+    rnd = random.Random(seed)
+    solvents = [abbr for name, abbr in SOLVENTS]
+    absorptions = ['%d' % rnd.randint(250, 450) for _ in range(6)]
+    yields = ['%.2f' % rnd.random() for _ in range(6)]
+    melting_points = ['%d–%d' % (mp, mp + rnd.randint(1, 3)) for mp in rnd.sample(range(50, 250), 6)]
+    lines = ['<!DOCTYPE html>', '<html>', '<head><meta charset="utf-8"></head>', '<body>', '<table>',
+             '<caption>Table 1 Photophysical properties of the compounds</caption>',
+             '<thead><tr><th>Compound</th><th>Solvent</th><th>λabs/nm</th><th>ΦF</th><th>Mp/°C</th></tr></thead>',
+             '<tbody>']
+    for i in range(rows):
+        cells = ['%d%s' % (i // 6 + 1, 'abcdef'[i % 6]), rnd.choice(solvents), rnd.choice(absorptions),
+                 rnd.choice(yields), rnd.choice(melting_points)]
+        lines.append('<tr>%s</tr>' % ''.join('<td>%s</td>' % escape(c) for c in cells))
+    lines.extend(['</tbody>', '</table>', '</body>', '</html>'])
+    return '\n'.join(lines).encode('utf-8')
+
+
+class _RuleBasedLexicon(Lexicon):
+    """Lexicon of the rule-based taggers, kept apart from the Lexicon of the pipeline."""
+    pass
+
+
+class _WholeTextTokenizer(BaseTokenizer):
+    """Sentence tokenizer that returns the whole text as one sentence."""
+
+    def span_tokenize(self, s):
+        return [(0, len(s))] if s.strip() else []
+
+
+def use_rule_based_taggers(table):
+    """Replace the components of a table that need models with rule-based stand-ins, so it can be processed without
+    the data files.
+
+    The caption, footnotes and cells are part of speech tagged with a :class:`~chemdataextractor.nlp.tag.RegexTagger`,
+    no named entities are tagged, and each caption and footnote is one sentence. The table is also detached from its
+    document, so document abbreviations aren't used. The records differ from those found with the models, but the
+    table logic and its caches do the same work, so this is enough to time them.
+
+    :param Table table: The table.
+    """
+    lexicon = _RuleBasedLexicon()
+    pos_tagger = RegexTagger(lexicon=lexicon)
+    ner_tagger = NoneTagger()
+    table.document = None
+    for el in [table.caption] + table.footnotes:
+        el.sentence_tokenizer = _WholeTextTokenizer()
+    for el in [table.caption] + table.footnotes + [cell for row in table.headings + table.rows for cell in row]:
+        el.lexicon = lexicon
+        el.pos_tagger = pos_tagger
+        el.ner_tagger = ner_tagger
+
+
+def peak_rss():
+    """Return the peak resident set size of this process in bytes, or None if it can't be determined."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def load_inputs(data_dir=None, paragraphs=100, tables=10, seed=0):
+    """Return a list of (name, file name, contents) benchmark inputs.
+
+    :param string data_dir: (Optional) Directory of input files, e.g. tests/data. Files in subdirectories are included.
+    :param int paragraphs: Number of paragraphs in the synthetic documents. 0 for no synthetic documents.
+    :param int tables: Number of tables in the synthetic HTML document.
+    :param int seed: Random seed for the synthetic documents.
+    """
+    inputs = []
+    if data_dir:
+        for root, dirs, files in sorted(os.walk(data_dir)):
+            dirs.sort()
+            for fname in sorted(files):
+                path = os.path.join(root, fname)
+                with io.open(path, 'rb') as f:
+                    inputs.append((os.path.relpath(path, data_dir).replace(os.sep, '/'), fname, f.read()))
+    if paragraphs:
+        inputs.append(('synthetic.html', 'synthetic.html', generate_html(paragraphs, tables, seed)))
+        inputs.append(('synthetic.txt', 'synthetic.txt', generate_text(paragraphs, seed)))
+    return inputs
+
+
+def best_time(func, repeats, setup=None):
+    """Return the first and best times of func, passing it the result of calling setup before each run.
+
+    :param func: Function to time, which takes one argument.
+    :param int repeats: Number of times to run func. Must be at least 1.
+    :param setup: (Optional) Function that returns the argument for func. Not included in the times.
+    :rtype: tuple(float, float)
+    """
+    if repeats < 1:
+        raise ValueError('repeats must be at least 1, not %s' % repeats)
+    times = []
+    for _ in range(repeats):
+        arg = setup() if setup else None
+        start = default_timer()
+        func(arg)
+        times.append(default_timer() - start)
+    return times[0], min(times)
+
+
+def _text_elements(doc):
+    """Return the text elements of a document, including captions."""
+    texts = []
+    for el in doc.elements:
+        if isinstance(el, Text):
+            texts.append(el)
+        elif getattr(el, 'caption', None) is not None:
+            texts.append(el.caption)
+    return texts
+
+
+def _sentences(doc):
+    return [sentence for el in _text_elements(doc) for sentence in el.sentences]
+
+
+def _stages(doc):
+    """Yield (name, component, function, sentences, tokens) for each pipeline stage run on a document.
+
+    Each function runs a stage on inputs prepared by the stages before it, without changing the document. Inputs are
+    prepared as the stages are yielded, so the stages before one that needs a missing model can still be run.
+    """
+    texts = _text_elements(doc)
+    sentences = _sentences(doc)
+    if not sentences:
+        return
+    n = len(sentences)
+    tokens = sum(len(s.word_tokenizer.span_tokenize(s.text)) for s in sentences)
+    yield ('sentence_tokenizer', texts[0].sentence_tokenizer,
+           lambda: [el.sentence_tokenizer.span_tokenize(el.text) for el in texts], n, tokens)
+    yield ('word_tokenizer', sentences[0].word_tokenizer,
+           lambda: [s.word_tokenizer.span_tokenize(s.text) for s in sentences], n, tokens)
+    raw_tokens = [s.raw_tokens for s in sentences]
+    yield ('pos_tagger', sentences[0].pos_tagger,
+           lambda: [s.pos_tagger.tag(t) for s, t in zip(sentences, raw_tokens)], n, tokens)
+    pos_tagged_tokens = [s.pos_tagged_tokens for s in sentences]
+    yield ('ner_tagger', sentences[0].ner_tagger,
+           lambda: [s.ner_tagger.tag(t) for s, t in zip(sentences, pos_tagged_tokens)], n, tokens)
+    detecting = [(s.abbreviation_detector, t) for s, t in zip(sentences, raw_tokens) if s.abbreviation_detector]
+    if detecting:
+        yield ('abbreviation_detector', detecting[0][0],
+               lambda: [detector.detect_spans(t) for detector, t in detecting], len(detecting), tokens)
+    # Each parser class is a separate stage, run on the sentences of the elements that use it
+    parsing = OrderedDict()
+    for s in sentences:
+        tagged_tokens = s.tagged_tokens
+        for parser in s.parsers:
+            parsing.setdefault(parser.__class__, []).append((parser, tagged_tokens))
+    for pairs in parsing.values():
+        yield 'parser', pairs[0][0], lambda pairs=pairs: [list(p.parse(t)) for p, t in pairs], len(pairs), None
+    tables = [el for el in doc.elements if isinstance(el, Table)]
+    if tables:
+        yield 'table', tables[0], lambda: [table.records for table in tables], None, None
+
+
+def _result(input_name, benchmark, component, times, documents=None, sentences=None, tokens=None, error=None):
+    """Return a dictionary of the results of one benchmark."""
+    result = OrderedDict([
+        ('input', input_name),
+        ('benchmark', benchmark),
+        ('component', component),
+        ('documents', documents),
+        ('sentences', sentences),
+        ('tokens', tokens),
+        ('first_time', times[0] if times else None),
+        ('best_time', times[1] if times else None),
+    ])
+    for key in ('documents', 'sentences', 'tokens'):
+        count = result[key]
+        result['%s_per_sec' % key] = count / times[1] if count is not None and times and times[1] else None
+    result['peak_rss'] = peak_rss()
+    result['error'] = error
+    return result
+
+
+def _counts(doc):
+    """Return the number of sentences and tokens in a document, or None if the models they need are missing."""
+    try:
+        sentences = _sentences(doc)
+        return len(sentences), sum(len(s.tokens) for s in sentences)
+    except ModelNotFoundError:
+        return None, None
+
+
+def _error(e):
+    """Return a description of an exception raised by a benchmark."""
+    if isinstance(e, ModelNotFoundError):
+        return six.text_type(e)
+    log.debug('Benchmark failed', exc_info=True)
+    return '%s: %s' % (e.__class__.__name__, e)
+
+
+def benchmark_input(name, fname, contents, repeats=3, stages=True):
+    """Benchmark reading a file, extracting its records and each pipeline stage, and return a list of results.
+
+    Caches that are shared between documents (e.g. of tokenizer and table heading results) are warm after the first
+    run, so both the time of the first run and the best time are given. Benchmarks that fail, e.g. because a model
+    isn't installed, have an error instead of times, and the stages after a failed stage are not run.
+
+    :param string name: Name of the input to use in results.
+    :param string fname: File name, used to determine the file format.
+    :param bytes contents: Contents of the file.
+    :param int repeats: Number of times to run each benchmark.
+    :param bool stages: Whether to benchmark each pipeline stage in isolation.
+    """
+    read = lambda: Document.from_string(contents, fname=fname)
+    # The reader that was used is the last one to finish reading
+    with Profiler() as profiler:
+        doc = read()
+    reader = [stage_name for stage_name in profiler.stages if stage_name.startswith('reader.')][-1].split('.', 1)[1]
+    results = [_result(name, 'reader', reader, best_time(lambda d: read(), repeats), documents=1)]
+    sentences, tokens = _counts(doc)
+    try:
+        times = best_time(lambda d: d.records, repeats, setup=read)
+        results.append(_result(name, 'records', None, times, 1, sentences, tokens))
+    except Exception as e:
+        results.append(_result(name, 'records', None, None, error=_error(e)))
+    if stages:
+        # Stage that is being prepared or run, to name in the results if it fails
+        current = ('stages', None)
+        try:
+            for stage_name, component, func, stage_sentences, stage_tokens in _stages(doc):
+                current = (stage_name, component.__class__.__name__)
+                times = best_time(lambda _: func(), repeats)
+                results.append(_result(name, current[0], current[1], times, 1, stage_sentences, stage_tokens))
+                current = ('stages', None)
+        except Exception as e:
+            results.append(_result(name, current[0], current[1], None, error=_error(e)))
+    return results
+
+
+def run(inputs, repeats=3, stages=True):
+    """Benchmark each input and return a dictionary of results, with details of the version and platform.
+
+    :param list inputs: List of (name, file name, contents) inputs, as returned by :func:`load_inputs`.
+    :param int repeats: Number of times to run each benchmark.
+    :param bool stages: Whether to benchmark each pipeline stage in isolation.
+    """
+    results = []
+    for name, fname, contents in inputs:
+        log.info('Benchmarking %s' % name)
+        results.extend(benchmark_input(name, fname, contents, repeats=repeats, stages=stages))
+    return OrderedDict([
+        ('version', __version__),
+        ('python', platform.python_version()),
+        ('platform', platform.platform()),
+        ('repeats', repeats),
+        ('results', results),
+    ])
+
+
+def format_results(data):
+    """Return a table of benchmark results."""
+    lines = ['ChemDataExtractor %s, Python %s, %s, best of %s' % (
+        data['version'], data['python'], data['platform'], data['repeats']
+    )]
+    lines.append('%-32s %-48s %10s %10s %12s %14s %10s' % (
+        'input', 'benchmark', 'best (s)', 'docs/s', 'sentences/s', 'tokens/s', 'rss (MB)'
+    ))
+    for result in data['results']:
+        benchmark = result['benchmark']
+        if result['component']:
+            benchmark = '%s.%s' % (benchmark, result['component'])
+        if result['error']:
+            lines.append('%-32s %-48s %s' % (result['input'], benchmark, result['error']))
+            continue
+        rates = ['%.1f' % result[key] if result[key] is not None else '-'
+                 for key in ('documents_per_sec', 'sentences_per_sec', 'tokens_per_sec')]
+        rss = '%.0f' % (result['peak_rss'] / 1048576) if result['peak_rss'] is not None else '-'
+        lines.append('%-32s %-48s %10.4f %10s %12s %14s %10s' % (
+            result['input'], benchmark, result['best_time'], rates[0], rates[1], rates[2], rss
+        ))
+    return '\n'.join(lines)
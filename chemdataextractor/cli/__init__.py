@@ -13,44 +13,117 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-import json
 import logging
+import os
 
 import click
 import six
 
 from .. import __version__
+from .. import batch
+from ..data import model_cache
 from ..doc import Document
+from ..memory import format_memory_report, memory_report, set_cache_limit
+from ..profiler import Profiler
 
 
 log = logging.getLogger(__name__)
 
 
+def _cache_limit(ctx, param, value):
+    """Parse NAME=SIZE cache limits, where SIZE is a number of entries or 'none' for unbounded."""
+    limits = []
+    for limit in value:
+        name, _, size = limit.partition('=')
+        try:
+            limits.append((name, None if size.lower() == 'none' else int(size)))
+        except ValueError:
+            raise click.BadParameter('%s is not of the form NAME=SIZE' % limit)
+    return limits
+
+
 @click.group()
 @click.option('--verbose', '-v', is_flag=True, help='Verbose debug logging.')
+@click.option('--cache-limit', multiple=True, callback=_cache_limit, metavar='NAME=SIZE', help='Maximum number of entries of a cache or lexicon. May be repeated.')
+@click.option('--model-budget', type=float, metavar='MB', help='Memory budget for loaded models, in megabytes.')
 @click.version_option(__version__, '--version', '-V')
 @click.help_option('--help', '-h')
 @click.pass_context
-def cli(ctx, verbose):
+def cli(ctx, verbose, cache_limit, model_budget):
     """ChemDataExtractor command line interface."""
     log.debug('ChemDataExtractor v%s' % __version__)
     logging.basicConfig(level=logging.DEBUG if verbose else logging.INFO)
     logging.getLogger('requests').setLevel(logging.WARN)
+    for name, maxsize in cache_limit:
+        set_cache_limit(name, maxsize)
+    if model_budget is not None:
+        model_cache.budget = int(model_budget * 1024 * 1024)
     ctx.obj = {}
 
 
+def _shard(ctx, param, value):
+    """Parse an INDEX/COUNT shard."""
+    if value is None:
+        return 0, 1
+    try:
+        return batch.parse_shard(value)
+    except ValueError as e:
+        raise click.BadParameter(six.text_type(e))
+
+
 @cli.command()
 @click.option('--output', '-o', type=click.File('w', encoding='utf8'), help='Output file.', default=click.get_text_stream('stdout'))
-@click.argument('input', type=click.File('rb'), default=click.get_binary_stream('stdin'))
+@click.option('--manifest', type=click.Path(exists=True, dir_okay=False), help='File listing the paths of documents to extract, one per line.')
+@click.option('--output-dir', type=click.Path(file_okay=False), help='Directory to write a JSON file for each document to, when extracting a directory or manifest.')
+@click.option('--shard', callback=_shard, metavar='INDEX/COUNT', help='Only extract the documents in this shard, e.g. 0/4 for the first of four.')
+@click.option('--checkpoint', type=click.Path(dir_okay=False), help='File that records finished documents. Defaults to a file in the output directory.')
+@click.option('--retry-failed', is_flag=True, help='Extract documents that failed in a previous run again.')
+@click.option('--profile', is_flag=True, help='Print the time spent in each pipeline stage.')
+@click.option('--profile-json', type=click.File('w', encoding='utf8'), help='Write the time spent in each pipeline stage to a JSON file.')
+@click.option('--memory-report', 'show_memory', is_flag=True, help='Print the size of each cache and loaded model.')
+@click.argument('input', type=click.Path(exists=True, allow_dash=True), default='-')
 @click.pass_obj
-def extract(ctx, input, output):
-    """Run ChemDataExtractor on a document."""
+def extract(ctx, input, output, manifest, output_dir, shard, checkpoint, retry_failed, profile, profile_json, show_memory):
+    """Run ChemDataExtractor on a document, or on each document in a directory or manifest.
+
+    Extracting a directory or manifest writes the records of each document to the output directory. Finished documents
+    are recorded in a checkpoint file and skipped if the run is restarted.
+    """
     log.info('chemdataextractor.extract')
-    log.info('Reading %s' % input.name)
-    doc = Document.from_file(input, fname=input.name)
-    records = [record.serialize(primitive=True) for record in doc.records]
-    jsonstring = json.dumps(records, indent=2, ensure_ascii=False)
-    output.write(jsonstring)
+    batch_mode = manifest is not None or os.path.isdir(input)
+    if batch_mode and output_dir is None:
+        raise click.UsageError('--output-dir is required to extract a directory or manifest')
+    if not batch_mode and (output_dir is not None or shard != (0, 1) or checkpoint is not None):
+        raise click.UsageError('--output-dir, --shard and --checkpoint can only be used with a directory or manifest')
+    profiler = Profiler() if profile or profile_json else None
+    if profiler:
+        profiler.start()
+    docs = []
+    try:
+        if batch_mode:
+            documents = batch.read_manifest(manifest) if manifest is not None else batch.find_documents(input)
+            checkpoint = batch.Checkpoint(checkpoint or batch.checkpoint_path(output_dir, shard))
+            summary = batch.run_batch(documents, output_dir, checkpoint, shard=shard, retry_failed=retry_failed)
+        else:
+            log.info('Reading %s' % input)
+            doc = Document.from_file(click.get_binary_stream('stdin') if input == '-' else input)
+            records = doc.records
+            docs.append(doc)
+    finally:
+        if profiler:
+            profiler.stop()
+    if batch_mode:
+        log.info('%(processed)s documents extracted, %(failed)s failed, %(skipped)s already finished' % summary)
+    else:
+        records.write_json(output, indent=2, ensure_ascii=False)
+    if profile:
+        click.echo(profiler.report(), err=True)
+    if profile_json:
+        profile_json.write(six.text_type(profiler.to_json(indent=2)))
+    if show_memory:
+        click.echo(format_memory_report(memory_report(documents=docs)), err=True)
+    if batch_mode and summary['failed']:
+        click.get_current_context().exit(1)
 
 
 @cli.command()
@@ -66,9 +139,10 @@ def read(ctx, input, output):
         output.write(u'%s : %s\n=====\n' % (element.__class__.__name__, six.text_type(element)))
 
 
-from . import cluster, config, data, tokenize, pos, chemdner, cem, dict, evaluate
+from . import bench, cluster, config, data, tokenize, pos, chemdner, cem, dict, evaluate, serve
 
 
+cli.add_command(bench.bench)
 cli.add_command(cluster.cluster_cli)
 cli.add_command(config.config_cli)
 cli.add_command(data.data_cli)
@@ -78,3 +152,4 @@ cli.add_command(chemdner.chemdner_cli)
 cli.add_command(cem.cem)
 cli.add_command(dict.dict_cli)
 cli.add_command(evaluate.evaluate)
+cli.add_command(serve.serve)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+chemdataextractor.cli.bench
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Command for benchmarking document processing throughput.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import json
+import logging
+import os
+
+import click
+
+from .. import benchmark
+
+
+log = logging.getLogger(__name__)
+
+
+#: Documents in the test data directory of a source checkout, used as benchmark inputs if present.
+TEST_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'tests', 'data')
+
+
+@click.command()
+@click.option('--data', type=click.Path(exists=True, file_okay=False), help='Directory of input documents. Defaults to tests/data in a source checkout.')
+@click.option('--paragraphs', type=int, default=100, show_default=True, help='Number of paragraphs in the synthetic documents. 0 for none.')
+@click.option('--tables', type=int, default=10, show_default=True, help='Number of tables in the synthetic HTML document.')
+@click.option('--seed', type=int, default=0, show_default=True, help='Random seed for the synthetic documents.')
+@click.option('--repeats', '-r', type=click.IntRange(min=1), default=3, show_default=True, help='Number of times to run each benchmark.')
+@click.option('--no-stages', is_flag=True, help='Don\'t benchmark each pipeline stage in isolation.')
+@click.option('--json', 'json_output', type=click.File('w', encoding='utf8'), help='Write the results to a JSON file.')
+@click.pass_obj
+def bench(ctx, data, paragraphs, tables, seed, repeats, no_stages, json_output):
+    """Benchmark reading and extracting documents."""
+    if data is None and os.path.isdir(TEST_DATA_DIR):
+        data = TEST_DATA_DIR
+    inputs = benchmark.load_inputs(data, paragraphs=paragraphs, tables=tables, seed=seed)
+    if not inputs:
+        raise click.ClickException('No input documents')
+    results = benchmark.run(inputs, repeats=repeats, stages=not no_stages)
+    click.echo(benchmark.format_results(results))
+    if json_output:
+        json_output.write(json.dumps(results, indent=2, ensure_ascii=False))
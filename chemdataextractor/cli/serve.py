@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+chemdataextractor.cli.serve
+~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Command for running a long-running extraction service.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import logging
+
+import click
+
+from ..errors import ModelNotFoundError
+from ..server import ExtractionService, make_server, serve_jsonl
+
+
+log = logging.getLogger(__name__)
+
+
+@click.command()
+@click.option('--host', default='127.0.0.1', show_default=True, help='Host to listen on.')
+@click.option('--port', type=int, default=8000, show_default=True, help='Port to listen on.')
+@click.option('--socket', 'socket_path', type=click.Path(dir_okay=False), help='Listen on a Unix socket at this path instead of a host and port.')
+@click.option('--jsonl', is_flag=True, help='Read JSON requests from stdin and write JSON responses to stdout, one per line.')
+@click.option('--max-batch', type=int, default=32, show_default=True, help='Maximum number of requests to process in one batch.')
+@click.option('--max-wait', type=float, default=0.01, show_default=True, help='Seconds to wait for more requests to add to a batch.')
+@click.pass_obj
+def serve(ctx, host, port, socket_path, jsonl, max_batch, max_wait):
+    """Run an extraction service that keeps models loaded between requests.
+
+    Over HTTP, POST a document, plain text, or a JSON request to /extract. GET /metrics for throughput, latency and
+    cache statistics.
+    """
+    service = ExtractionService(max_batch=max_batch, max_wait=max_wait)
+    try:
+        service.warm_up()
+    except (ModelNotFoundError, IOError) as e:
+        log.warning('Could not load models: %s' % e)
+    except Exception:
+        # Requests report their own errors, so a failed warm up shouldn't stop the service from starting
+        log.exception('Failed to warm up models')
+    service.start()
+    try:
+        if jsonl:
+            serve_jsonl(service, click.get_text_stream('stdin'), click.get_text_stream('stdout'))
+            return
+        server = make_server(service, host=host, port=port, socket_path=socket_path)
+        log.info('Serving on %s' % (socket_path or 'http://%s:%s' % server.server_address[:2]))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    finally:
+        service.stop()
@@ -11,9 +11,14 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
+from collections import OrderedDict
+from contextlib import contextmanager
 import io
 import logging
 import os
+import threading
+from timeit import default_timer
+import weakref
 
 import appdirs
 import requests
@@ -127,22 +132,266 @@ def find_data(path, warn=True):
     return full_path
 
 
-#: A dictionary used to cache models so they only need to be loaded once.
-_model_cache = {}
-
-
-def load_model(path):
-    """Load a model from a pickle file in the data directory. Cached so model is only loaded once."""
-    abspath = find_data(path)
-    cached = _model_cache.get(abspath)
-    if cached is not None:
-        log.debug('Using cached copy of %s' % path)
-        return cached
-    log.debug('Loading model %s' % path)
-    try:
-        with io.open(abspath, 'rb') as f:
-            model = six.moves.cPickle.load(f)
-    except IOError:
-        raise ModelNotFoundError('Could not load %s. Have you run `cde data download`?' % path)
-    _model_cache[abspath] = model
-    return model
+class LoadedModel(object):
+    """A model that has been loaded, with the components that use it and how long it took to load."""
+
+    def __init__(self, path, model=None, size=0, load_time=0.0):
+        #: Path to the model file, as given when it was loaded.
+        self.path = path
+        #: The unpickled model, shared by all its users, or None for a model that each user loads a copy of.
+        self.model = model
+        #: Approximate size in bytes of one copy of the model.
+        self.size = size
+        #: Time in seconds taken to load the model.
+        self.load_time = load_time
+        #: Number of times the model was loaded again from the cache.
+        self.hits = 0
+        #: The components that use the model. Each must have an ``unload()`` method.
+        self.users = weakref.WeakSet()
+
+    def __repr__(self):
+        return '<LoadedModel: %s>' % self.path
+
+    @property
+    def copies(self):
+        """Number of copies of the model in memory."""
+        return 1 if self.model is not None else len(self.users)
+
+    @property
+    def memory(self):
+        """Approximate size in bytes of all copies of the model."""
+        return self.size * self.copies
+
+    def serialize(self):
+        """Convert LoadedModel to python dictionary."""
+        return {
+            'path': self.path,
+            'size': self.size,
+            'copies': self.copies,
+            'users': len(self.users),
+            'load_time': self.load_time,
+            'hits': self.hits,
+        }
+
+
+class ModelCache(object):
+    """The models that have been loaded, so each is only loaded once, under an optional memory budget.
+
+    Pickled models are loaded with :meth:`load` and shared by all components that use the same file. Components that
+    load their own copy of a model, like the CRF taggers and DAWG dictionaries, record it with :meth:`register` so it is
+    counted too.
+
+    If the total size of loaded models goes over the budget, the least recently loaded models are unloaded, starting
+    with models that are no longer used by any component. Components that used an unloaded model load it again when
+    they next need it. Models of components that are in the middle of a call, marked with :meth:`in_use`, are not
+    unloaded until the call ends.
+    """
+
+    def __init__(self, budget=None):
+        """
+
+        :param int budget: (Optional) Memory budget in bytes. None for unbounded.
+        """
+        #: Memory budget in bytes, or None for unbounded.
+        self.budget = budget
+        #: Number of models loaded from disk.
+        self.loads = 0
+        #: Total time in seconds taken to load models from disk.
+        self.load_time = 0.0
+        #: Number of models unloaded to stay within the budget.
+        self.evictions = 0
+        self._models = OrderedDict()
+        self._lock = threading.RLock()
+        self._in_use = {}
+        self._unload_pending = set()
+
+    def __len__(self):
+        return len(self._models)
+
+    def __contains__(self, path):
+        return find_data(path, warn=False) in self._models
+
+    @property
+    def models(self):
+        """List of :class:`LoadedModel`, least recently loaded first."""
+        return list(self._models.values())
+
+    @property
+    def memory(self):
+        """Approximate size in bytes of all loaded models."""
+        return sum(loaded.memory for loaded in self._models.values())
+
+    def load(self, path, user=None):
+        """Load a pickled model from the data directory, or return the copy that is already loaded.
+
+        :param string path: Path to the model file within the data directory.
+        :param user: (Optional) The component that uses the model. Its ``unload()`` method is called if the model is
+                     unloaded.
+        """
+        abspath = find_data(path)
+        with self._lock:
+            loaded = self._models.pop(abspath, None)
+            if loaded is not None:
+                log.debug('Using cached copy of %s' % path)
+                loaded.hits += 1
+            else:
+                log.debug('Loading model %s' % path)
+                start = default_timer()
+                try:
+                    with io.open(abspath, 'rb') as f:
+                        model = six.moves.cPickle.load(f)
+                except IOError:
+                    raise ModelNotFoundError('Could not load %s. Have you run `cde data download`?' % path)
+                from .memory import approximate_size
+                loaded = self._loaded(path, model, approximate_size(model), default_timer() - start)
+            self._models[abspath] = loaded
+            if user is not None:
+                loaded.users.add(user)
+            self._enforce_budget(keep=abspath)
+            return loaded.model
+
+    def register(self, path, user, load_time=0.0, size=None):
+        """Record that a component has loaded its own copy of a model file.
+
+        :param string path: Path to the model file within the data directory.
+        :param user: The component that loaded the model. Its ``unload()`` method is called if the model is unloaded.
+        :param float load_time: (Optional) Time in seconds taken to load the model.
+        :param int size: (Optional) Approximate size in bytes of the loaded model. Defaults to the size of the file.
+        """
+        abspath = find_data(path, warn=False)
+        with self._lock:
+            loaded = self._models.pop(abspath, None)
+            if loaded is None:
+                size = size if size is not None else os.path.getsize(abspath)
+                loaded = self._loaded(path, None, size, load_time)
+            else:
+                loaded.hits += 1
+            self._models[abspath] = loaded
+            loaded.users.add(user)
+            self._enforce_budget(keep=abspath)
+
+    def _loaded(self, path, model, size, load_time):
+        self.loads += 1
+        self.load_time += load_time
+        log.debug('Loaded %s in %.3fs, %.1f MB' % (path, load_time, size / 1024 / 1024))
+        return LoadedModel(path, model, size, load_time)
+
+    def release(self, user):
+        """Record that a component no longer uses any models. Models that each user loads a copy of are removed.
+
+        Pickled models stay loaded, so they don't need to be loaded from disk again if they are used again. Use
+        :meth:`unload` to remove them.
+        """
+        with self._lock:
+            for abspath, loaded in list(self._models.items()):
+                loaded.users.discard(user)
+                if loaded.model is None and not loaded.users:
+                    del self._models[abspath]
+
+    @contextmanager
+    def in_use(self, user):
+        """Context manager that stops the models of a component being unloaded while it uses them.
+
+        Loading another model part way through a call, like the word clusters loaded by a lexicon while a tagger is
+        tagging, can go over the budget. The models of components that are in use are kept, and the budget is enforced
+        again when the outermost call ends.
+
+        :param user: The component that uses the models.
+        """
+        with self._lock:
+            self._in_use[user] = self._in_use.get(user, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_use[user] -= 1
+                if not self._in_use[user]:
+                    del self._in_use[user]
+                    for abspath in list(self._unload_pending):
+                        self.unload(abspath)
+                    self._enforce_budget(keep=None)
+
+    def _used(self, loaded):
+        """Return whether any component that uses a model is in use."""
+        return any(user in self._in_use for user in loaded.users)
+
+    def unload(self, path=None):
+        """Unload a model, or all models, and tell the components that use them to unload them.
+
+        A model that is used by a component that is in use, marked with :meth:`in_use`, is unloaded when the component's
+        outermost call ends.
+
+        :param string path: (Optional) Path to the model file within the data directory. Default is all models.
+        """
+        with self._lock:
+            abspaths = [find_data(path, warn=False)] if path is not None else list(self._models)
+            for abspath in abspaths:
+                loaded = self._models.get(abspath)
+                if loaded is None:
+                    self._unload_pending.discard(abspath)
+                elif self._used(loaded):
+                    log.debug('Model %s is in use, unloading it later' % loaded.path)
+                    self._unload_pending.add(abspath)
+                else:
+                    log.debug('Unloading model %s' % loaded.path)
+                    del self._models[abspath]
+                    self._unload_pending.discard(abspath)
+                    for user in list(loaded.users):
+                        user.unload()
+
+    def _enforce_budget(self, keep):
+        """Unload the least recently loaded models until the loaded models are within the budget."""
+        if self.budget is None:
+            return
+        while self.memory > self.budget:
+            candidates = [abspath for abspath, loaded in self._models.items()
+                          if abspath != keep and not self._used(loaded)]
+            if not candidates:
+                break
+            unused = [abspath for abspath in candidates if not self._models[abspath].users]
+            victim = unused[0] if unused else candidates[0]
+            log.debug('Model memory over budget, unloading %s' % self._models[victim].path)
+            self.unload(victim)
+            self.evictions += 1
+
+    def serialize(self):
+        """Convert ModelCache metrics to python dictionary."""
+        with self._lock:
+            return {
+                'budget': self.budget,
+                'memory': self.memory,
+                'loads': self.loads,
+                'load_time': self.load_time,
+                'evictions': self.evictions,
+                'models': [loaded.serialize() for loaded in self._models.values()],
+            }
+
+
+def _model_budget():
+    """Return the model memory budget in bytes from the ``model_budget_mb`` config value."""
+    budget = config.get('model_budget_mb')
+    return int(float(budget) * 1024 * 1024) if budget is not None else None
+
+
+#: The models that have been loaded. Set the ``model_budget_mb`` config value to limit the memory they use.
+model_cache = ModelCache(budget=_model_budget())
+
+
+def load_model(path, user=None):
+    """Load a model from a pickle file in the data directory. Cached so model is only loaded once.
+
+    :param string path: Path to the model file within the data directory.
+    :param user: (Optional) The component that uses the model. Its ``unload()`` method is called if the model is
+                 unloaded, for example to stay within the memory budget of :data:`model_cache`.
+    """
+    return model_cache.load(path, user=user)
+
+
+def unload_model(path=None):
+    """Unload a model, or all models if no path is given, from every component that uses it.
+
+    Components load models again the next time they need them.
+
+    :param string path: (Optional) Path to the model file within the data directory.
+    """
+    model_cache.unload(path)
@@ -17,6 +17,7 @@ import collections
 import io
 import json
 import logging
+import mmap
 
 import six
 
@@ -26,12 +27,30 @@ from .table import Table
 from .figure import Figure
 from ..errors import ReaderError
 from ..model import ModelList
+from ..profiler import Profiler, stage
 from ..text import get_encoding
+from ..utils import iter_decompressed
 
 
 log = logging.getLogger(__name__)
 
 
+#: Number of bytes at the start of a file that readers inspect to detect whether they can read it.
+SNIFF_SIZE = 65536
+
+
+def _read_contents(member, f):
+    """Return the contents of a file, memory-mapped if it is the uncompressed file f on disk, otherwise read."""
+    if member is f:
+        try:
+            if f.tell() == 0:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, EnvironmentError, ValueError):
+            # Not a file on disk (e.g. BytesIO or a pipe), or an empty file
+            pass
+    return member.read()
+
+
 @python_2_unicode_compatible
 class BaseDocument(six.with_metaclass(ABCMeta, collections.Sequence)):
     """Abstract base class for a Document."""
@@ -92,6 +111,10 @@ class Document(BaseDocument):
             with open('paper.html', 'rb') as f:
                 doc = Document.from_file(f)
 
+        Gzip, bzip2 and xz compressed files, and zip or tar archives that contain a single file, are decompressed as they
+        are read. Uncompressed files on disk are memory-mapped instead of being read into memory. Use
+        :meth:`from_archive` for archives that contain more than one file.
+
         .. note::
 
             Always open files in binary mode by using the 'rb' parameter.
@@ -101,10 +124,48 @@ class Document(BaseDocument):
         :param list[chemdataextractor.reader.base.BaseReader] readers: (Optional) List of readers to use.
         """
         if isinstance(f, six.string_types):
-            f = io.open(f, 'rb')
+            with io.open(f, 'rb') as fobj:
+                return cls.from_file(fobj, fname=fname, readers=readers)
         if not fname and hasattr(f, 'name'):
             fname = f.name
-        return cls.from_string(f.read(), fname=fname, readers=readers)
+        members = iter_decompressed(f, name=fname)
+        try:
+            name, member = next(members)
+        except StopIteration:
+            raise ReaderError('No files in archive')
+        fstring = _read_contents(member, f)
+        try:
+            if next(members, None) is not None:
+                raise ReaderError('Archive contains more than one file, use Document.from_archive')
+            return cls.from_string(fstring, fname=name, readers=readers)
+        finally:
+            if isinstance(fstring, mmap.mmap):
+                fstring.close()
+
+    @classmethod
+    def from_archive(cls, f, readers=None):
+        """Iterate a Document for each file in a zip or tar archive, which may itself be compressed.
+
+        Usage::
+
+            for name, doc in Document.from_archive('corpus.tar.gz'):
+                print(name, doc.records.serialize())
+
+        Each file is decompressed as it is read, so archives don't need to be unpacked to disk first. Any other file is
+        treated as an archive that contains just itself.
+
+        :param file|string f: A file-like object or path to a file.
+        :param list[chemdataextractor.reader.base.BaseReader] readers: (Optional) List of readers to use.
+        :returns: Iterator of (file name, Document) pairs.
+        """
+        for name, member in iter_decompressed(f):
+            fstring = _read_contents(member, f)
+            try:
+                doc = cls.from_string(fstring, fname=name, readers=readers)
+            finally:
+                if isinstance(fstring, mmap.mmap):
+                    fstring.close()
+            yield name, doc
 
     @classmethod
     def from_string(cls, fstring, fname=None, readers=None):
@@ -119,7 +180,7 @@ class Document(BaseDocument):
 
             This method expects a byte string, not a unicode string (in contrast to most methods in ChemDataExtractor).
 
-        :param bytes fstring: A byte string containing the contents of a file.
+        :param bytes fstring: A byte string or other bytes-like object (e.g. an mmap) containing the contents of a file.
         :param string fname: (Optional) The filename. Used to help determine file format.
         :param list[chemdataextractor.reader.base.BaseReader] readers: (Optional) List of readers to use.
         """
@@ -130,12 +191,17 @@ class Document(BaseDocument):
         if isinstance(fstring, six.text_type):
             raise ReaderError('from_string expects a byte string, not a unicode string')
 
+        # Readers detect the format from the start of the file and share parsed trees, so fallbacks don't re-parse
+        prefix = fstring[:SNIFF_SIZE]
+        shared = {}
         for reader in readers:
             # Skip reader if we don't think it can read file
-            if not reader.detect(fstring, fname=fname):
+            if not reader.detect(prefix, fname=fname):
                 continue
             try:
-                d = reader.readstring(fstring)
+                with stage('reader', reader) as s:
+                    d = reader.readshared(fstring, shared)
+                    s.count(len(d.elements))
                 log.debug('Parsed document with %s' % reader.__class__.__name__)
                 return d
             except ReaderError:
@@ -151,6 +217,12 @@ class Document(BaseDocument):
     @property
     def records(self):
         """Return chemical records extracted from this document."""
+        with stage('record_merging') as s:
+            records = self._records()
+            s.count(len(records))
+        return records
+
+    def _records(self):
         records = ModelList()
         contextual_records = []
         head_def_record = None
@@ -297,6 +369,23 @@ class Document(BaseDocument):
             i += 1
         return records
 
+    def profile(self):
+        """Extract records from this document, timing each stage of the pipeline.
+
+        Usage::
+
+            doc = Document.from_file('paper.html')
+            print(doc.profile().report())
+
+        Stages that have already run for this document are memoized, so they are not timed again. To include reading
+        the document, run a :class:`~chemdataextractor.profiler.Profiler` around :meth:`from_file` instead.
+
+        :rtype: chemdataextractor.profiler.Profiler
+        """
+        with Profiler() as profiler:
+            self.records
+        return profiler
+
     def get_element_with_id(self, id):
         """Return the element with the specified ID."""
         # Should we maintain a hashmap of ids to make this more efficient? Probably overkill.
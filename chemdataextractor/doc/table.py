@@ -11,8 +11,9 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
-import logging
 from collections import defaultdict
+import copy
+import logging
 
 from ..model import Compound, ModelList
 from ..parse.table import CompoundHeadingParser, CompoundCellParser, UvvisAbsHeadingParser, UvvisAbsCellParser, \
@@ -25,7 +26,8 @@ from ..parse.table import CompoundHeadingParser, CompoundCellParser, UvvisAbsHea
 # TODO: Sort out the above import... import module instead
 from ..nlp.tag import NoneTagger
 from ..nlp.tokenize import FineWordTokenizer
-from ..utils import memoized_property
+from ..profiler import stage
+from ..utils import BoundedCache, memoized_property
 from .element import CaptionedElement
 from .text import Sentence
 
@@ -54,6 +56,13 @@ class Table(CaptionedElement):
         (TempInHeadingParser(),)
     ]
 
+    #: Cache of heading cell parse results, shared by all tables. Set to None to disable.
+    heading_cache = BoundedCache(maxsize=20000, name='table.heading_cache')
+
+    #: Cache of cell annotations and value parser results. Cells with identical text are always annotated and parsed
+    #: once per table. Set to a BoundedCache to also share results between all tables in this process.
+    cell_cache = None
+
     def __init__(self, caption, label=None, headings=None, rows=None, footnotes=None, **kwargs):
         super(Table, self).__init__(caption=caption, label=label, **kwargs)
         self.headings = headings if headings is not None else []  # list(list(Cell))
@@ -103,43 +112,113 @@ class Table(CaptionedElement):
         html_lines.append('</table>')
         return '\n'.join(html_lines)
 
+    def _parse_heading(self, tagged_tokens):
+        """Return a (results, disallowed) tuple for each of the table parsers applied to heading cell tokens."""
+        parses = []
+        for parsers in self.parsers:
+            with stage('parser', parsers[0]) as s:
+                results = tuple(parsers[0].parse(tagged_tokens))
+                s.count(len(results))
+            disallowed = False
+            if len(parsers) > 2 and parsers[2] is not None:
+                with stage('parser', parsers[2]):
+                    disallowed = bool(list(parsers[2].parse(tagged_tokens)))
+            parses.append((results, disallowed))
+        return tuple(parses)
+
+    def _parse_cell(self, value_parser, cell, cell_cache):
+        """Return the value parser results for a cell, reusing results for cells with the same tagged tokens."""
+        cell.annotate(cell_cache)
+        tagged_tokens = cell.tagged_tokens
+        key = ('results', value_parser, tuple(tagged_tokens))
+        results = cell_cache.get(key)
+        if results is None:
+            with stage('parser', value_parser) as s:
+                results = list(value_parser.parse(tagged_tokens))
+                s.count(len(results))
+            cell_cache[key] = results
+            if key not in cell_cache:
+                # Caching is disabled, so the results aren't shared with any other cell
+                return results
+        # Results are modified when merging in contextual information, so each cell gets its own copy
+        return copy.deepcopy(results) if results else []
+
+    def _parse_heading_cell(self, cell, abbreviations, cell_cache):
+        """Return a (results, disallowed) tuple for each of the table parsers applied to a heading cell.
+
+        Headings recur across tables, so parses are stored in :attr:`heading_cache` by normalized cell text, along with
+        the cell processing and table parsers used. Cells that may contain a document abbreviation with an entity tag
+        aren't cached, because abbreviation tags depend on the document.
+        """
+        text = ' '.join(cell.text.split())
+        if self.heading_cache is None or any(abbr in text for abbr in abbreviations):
+            cell.annotate(cell_cache)
+            return self._parse_heading(cell.tagged_tokens)
+        key = (text, cell.word_tokenizer, cell.pos_tagger, cell.ner_tagger, tuple(self.parsers))
+        parses = self.heading_cache.get(key)
+        if parses is None:
+            cell.annotate(cell_cache)
+            parses = self._parse_heading(cell.tagged_tokens)
+            self.heading_cache[key] = parses
+        return parses
+
+    @staticmethod
+    def _referenced_records(references, footnote_records):
+        """Return the records of the footnotes with an id in references, in footnote order."""
+        if not references:
+            return []
+        references = set(references)
+        return [record for footnote_id, records in footnote_records if footnote_id in references for record in records]
+
     @property
     def records(self):
         """Chemical records that have been parsed from the table."""
+        with stage('table') as s:
+            records = self._records()
+            s.count(len(records))
+        return records
+
+    def _records(self):
         caption_records = self.caption.records
+        # Parse each footnote only once, and keep the records with the footnote id for resolving cell references
+        footnote_records = [(footnote.id, footnote.records) for footnote in self.footnotes]
         # Parse headers to extract contextual data and determine value parser for the column
         value_parsers = {}
         header_compounds = defaultdict(list)
+        cell_cache = self.cell_cache if self.cell_cache is not None else BoundedCache(maxsize=None)
         table_records = ModelList()
         seen_compound_col = False
         log.debug('Parsing table headers')
+        # First tokens of abbreviations that would change the entity tags of heading cells in this document
+        abbreviations = set()
+        if self.heading_cache is not None and self.document is not None:
+            abbreviations = {abbr[0] for abbr, long, tag in self.document.abbreviation_definitions if tag is not None}
 
         for i, col_headings in enumerate(zip(*self.headings)):
             # log.info('Considering column %s' % i)
-            for parsers in self.parsers:
+            col_parses = [self._parse_heading_cell(cell, abbreviations, cell_cache) for cell in col_headings]
+            for j, parsers in enumerate(self.parsers):
                 log.debug(parsers)
                 heading_parser = parsers[0]
                 value_parser = parsers[1] if len(parsers) > 1 else None
-                disallowed_parser = parsers[2] if len(parsers) > 2 else None
                 allowed = False
                 disallowed = False
-                for cell in col_headings:
-                    log.debug(cell.tagged_tokens)
-                    results = list(heading_parser.parse(cell.tagged_tokens))
+                for cell, cell_parses in zip(col_headings, col_parses):
+                    results, disallowed_match = cell_parses[j]
                     if results:
                         allowed = True
                         log.debug('Heading column %s: Match %s: %s' % (i, heading_parser.__class__.__name__, [c.serialize() for c in results]))
                     # Results from every parser are stored as header compounds
                     header_compounds[i].extend(results)
-                    # Referenced footnote records are also stored
-                    for footnote in self.footnotes:
-                        # print('%s - %s - %s' % (footnote.id, cell.references, footnote.id in cell.references))
-                        if footnote.id in cell.references:
-                            log.debug('Adding footnote %s to column %s: %s' % (footnote.id, i, [c.serialize() for c in footnote.records]))
-                            # print('Footnote records: %s' % [c.to_primitive() for c in footnote.records])
-                            header_compounds[i].extend(footnote.records)
+                    # Referenced footnote records are also stored. Merging is first-come-first-served, so they only need
+                    # storing once, at the position they first appear.
+                    if j == 0:
+                        cell_footnote_records = self._referenced_records(cell.references, footnote_records)
+                        if cell_footnote_records:
+                            log.debug('Adding footnotes to column %s: %s' % (i, [c.serialize() for c in cell_footnote_records]))
+                        header_compounds[i].extend(cell_footnote_records)
                     # Check if the disallowed parser matches this cell
-                    if disallowed_parser and list(disallowed_parser.parse(cell.tagged_tokens)):
+                    if disallowed_match:
                         log.debug('Column %s: Disallowed %s' % (i, heading_parser.__class__.__name__))
                         disallowed = True
                 # If heading parser matches and disallowed parser doesn't, store the value parser
@@ -186,27 +265,36 @@ class Table(CaptionedElement):
                 log.debug('No compound column found in table, assuming first column')
                 value_parsers[0] = CompoundCellParser()
 
+            # Contextual compounds that are merged into every cell of a column, and into every row
+            contextual_header_compounds = {
+                i: [c for c in header_compounds[i] if c.is_contextual] for i in value_parsers
+            }
+            row_context_compounds = [c for c in caption_records if c.is_contextual]
+            # Also merge from any footnotes that are referenced from the caption
+            row_context_compounds.extend(self._referenced_records(self.caption.references, footnote_records))
+
+            # Serializing records for debug messages is slow, so only do it if they will be logged
+            debug = log.isEnabledFor(logging.DEBUG)
             for row in self.rows:
                 row_compound = Compound()
                 # Keep cell records that are contextual to merge at the end
                 contextual_cell_compounds = []
                 for i, cell in enumerate(row):
-                    log.debug(cell.tagged_tokens)
                     if i in value_parsers:
-                        results = list(value_parsers[i].parse(cell.tagged_tokens))
+                        results = self._parse_cell(value_parsers[i], cell, cell_cache)
+                        log.debug(cell.tagged_tokens)
                         if results:
-                            log.debug('Cell column %s: Match %s: %s' % (i, value_parsers[i].__class__.__name__, [c.serialize() for c in results]))
+                            if debug:
+                                log.debug('Cell column %s: Match %s: %s' % (i, value_parsers[i].__class__.__name__, [c.serialize() for c in results]))
+                            cell_footnote_records = self._referenced_records(cell.references, footnote_records)
                         # For each result, merge in values from elsewhere
                         for result in results:
                             # Merge each header_compounds[i]
-                            for header_compound in header_compounds[i]:
-                                if header_compound.is_contextual:
-                                    result.merge_contextual(header_compound)
+                            for header_compound in contextual_header_compounds[i]:
+                                result.merge_contextual(header_compound)
                             # Merge footnote compounds
-                            for footnote in self.footnotes:
-                                if footnote.id in cell.references:
-                                    for footnote_compound in footnote.records:
-                                        result.merge_contextual(footnote_compound)
+                            for footnote_compound in cell_footnote_records:
+                                result.merge_contextual(footnote_compound)
                             if result.is_contextual:
                                 # Don't merge cell as a value compound if there are no values
                                 contextual_cell_compounds.append(result)
@@ -220,19 +308,13 @@ class Table(CaptionedElement):
                     prev = table_records[-1]
                     row_compound.names = prev.names
                     row_compound.labels = prev.labels
-                # Merge contextual information from caption into the full row
-                for caption_compound in caption_records:
-                    if caption_compound.is_contextual:
-                        row_compound.merge_contextual(caption_compound)
-                # And also merge from any footnotes that are referenced from the caption
-                for footnote in self.footnotes:
-                    if footnote.id in self.caption.references:
-                        # print('Footnote records: %s' % [c.to_primitive() for c in footnote.records])
-                        for fn_compound in footnote.records:
-                            row_compound.merge_contextual(fn_compound)
-
-                log.debug(row_compound.serialize())
-                if row_compound.serialize():
+                # Merge contextual information from caption and caption footnotes into the full row
+                for context_compound in row_context_compounds:
+                    row_compound.merge_contextual(context_compound)
+
+                if debug:
+                    log.debug(row_compound.serialize())
+                if not row_compound.is_empty():
                     table_records.append(row_compound)
 
         # TODO: If no rows have name or label, see if one is in the caption
@@ -251,6 +333,22 @@ class Cell(Sentence):
     # pos_tagger = NoneTagger()
     ner_tagger = NoneTagger()
 
+    def annotate(self, cache):
+        """Tokenize and part of speech tag this cell, sharing the results between cells with identical text.
+
+        Tokens and part of speech tags depend only on the cell text and start offset, and the tokenizer, lexicon and
+        tagger used, so cells that match on all of these reuse the first annotation stored in cache. Named entity tags
+        can depend on document abbreviations, so are still determined for each cell.
+
+        :param cache: A BoundedCache or dict to store annotations in.
+        """
+        key = ('annotation', self.text, self.start, self.word_tokenizer, self.lexicon, self.pos_tagger)
+        annotation = cache.get(key)
+        if annotation is None:
+            cache[key] = (self.tokens, self.pos_tagged_tokens)
+        else:
+            self._tokens, self._pos_tagged_tokens = annotation
+
     @memoized_property
     def abbreviation_definitions(self):
         """Empty list. Abbreviation detection is disabled within table cells."""
@@ -14,7 +14,6 @@ from __future__ import unicode_literals
 from abc import abstractproperty
 import collections
 import logging
-import re
 
 import six
 
@@ -28,11 +27,12 @@ from ..parse.tg import TgParser
 from ..parse.nmr import NmrParser
 from ..parse.uvvis import UvvisParser
 from ..nlp.lexicon import ChemLexicon
-from ..nlp.cem import CemTagger, IGNORE_PREFIX, IGNORE_SUFFIX, SPECIALS, SPLITS
+from ..nlp.cem import CemTagger
 from ..nlp.abbrev import ChemAbbreviationDetector
 from ..nlp.tag import NoneTagger
 from ..nlp.pos import ChemCrfPosTagger
-from ..nlp.tokenize import ChemSentenceTokenizer, ChemWordTokenizer, regex_span_tokenize
+from ..nlp.tokenize import ChemSentenceTokenizer, ChemWordTokenizer
+from ..profiler import stage
 from ..text import CONTROL_RE
 from ..utils import memoized_property, python_2_unicode_compatible
 from .element import BaseElement
@@ -139,7 +139,9 @@ class Text(collections.Sequence, BaseText):
     def sentences(self):
         """Return a list of Sentences that make up this text passage."""
         sents = []
-        spans = self.sentence_tokenizer.span_tokenize(self.text)
+        with stage('sentence_tokenizer', self.sentence_tokenizer) as s:
+            spans = list(self.sentence_tokenizer.span_tokenize(self.text))
+            s.count(len(spans))
         for span in spans:
             sent = Sentence(
                 text=self.text[span[0]:span[1]],
@@ -306,6 +308,8 @@ class Sentence(BaseText):
     abbreviation_detector = ChemAbbreviationDetector()
     pos_tagger = ChemCrfPosTagger()  # ChemPerceptronTagger()
     ner_tagger = CemTagger()
+    #: Processor that adjusts the boundaries of chemical entity mentions and splits them, shared with CemTagger.
+    cem_span_processor = CemTagger.span_processor
     parsers = []
 
     def __init__(self, text, start=0, end=None, word_tokenizer=None, lexicon=None, abbreviation_detector=None, pos_tagger=None, ner_tagger=None, parsers=None, **kwargs):
@@ -321,13 +325,19 @@ class Sentence(BaseText):
     @memoized_property
     def tokens(self):
         """Return a list of token Spans for this sentence."""
-        spans = self.word_tokenizer.span_tokenize(self.text)
+        with stage('word_tokenizer', self.word_tokenizer) as s:
+            spans = list(self.word_tokenizer.span_tokenize(self.text))
+            s.count(len(spans))
+        texts = [self.text[span[0]:span[1]] for span in spans]
+        # Register all the tokens with the lexicon together, which is faster than one at a time
+        with stage('lexicon'):
+            self.lexicon.add_many(texts)
         toks = [Token(
-            text=self.text[span[0]:span[1]],
+            text=text,
             start=span[0] + self.start,
             end=span[1] + self.start,
             lexicon=self.lexicon
-        ) for span in spans]
+        ) for text, span in zip(texts, spans)]
         return toks
 
     @property
@@ -339,7 +349,10 @@ class Sentence(BaseText):
     def pos_tagged_tokens(self):
         """Return a list of part of speech tags for the tokens in this sentence."""
         # log.debug('Getting pos tags')
-        return self.pos_tagger.tag(self.raw_tokens)
+        raw_tokens = self.raw_tokens
+        with stage('pos_tagger', self.pos_tagger) as s:
+            s.count(len(raw_tokens))
+            return self.pos_tagger.tag(raw_tokens)
 
     @property
     def pos_tags(self):
@@ -353,7 +366,10 @@ class Sentence(BaseText):
         No corrections from abbreviation detection are performed.
         """
         # log.debug('Getting unprocessed_ner_tags')
-        return self.ner_tagger.tag(self.pos_tagged_tokens)
+        pos_tagged_tokens = self.pos_tagged_tokens
+        with stage('ner_tagger', self.ner_tagger) as s:
+            s.count(len(pos_tagged_tokens))
+            return self.ner_tagger.tag(pos_tagged_tokens)
 
     @memoized_property
     def unprocessed_ner_tags(self):
@@ -370,7 +386,10 @@ class Sentence(BaseText):
         if self.abbreviation_detector:
             # log.debug('Detecting abbreviations')
             ners = self.unprocessed_ner_tags
-            for abbr_span, long_span in self.abbreviation_detector.detect_spans(self.raw_tokens):
+            with stage('abbreviation_detector', self.abbreviation_detector) as s:
+                definitions = list(self.abbreviation_detector.detect_spans(self.raw_tokens))
+                s.count(len(definitions))
+            for abbr_span, long_span in definitions:
                 abbr = self.raw_tokens[abbr_span[0]:abbr_span[1]]
                 long = self.raw_tokens[long_span[0]:long_span[1]]
                 # Check if long is entirely tagged as one named entity type
@@ -418,74 +437,17 @@ class Sentence(BaseText):
         # log.debug('Getting cems')
         spans = []
         # print(self.text.encode('utf8'))
-        for result in chemical_name.scan(self.tagged_tokens):
-            # parser scan yields (result, startindex, endindex) - we just use the indexes here
-            tokens = self.tokens[result[1]:result[2]]
-            start = tokens[0].start
-            end = tokens[-1].end
-            # Adjust boundaries to exclude disallowed prefixes/suffixes
-            currenttext = self.text[start-self.start:end-self.start].lower()
-            for prefix in IGNORE_PREFIX:
-                if currenttext.startswith(prefix):
-                    # print('%s removing %s' % (currenttext, prefix))
-                    start += len(prefix)
-                    break
-            for suffix in IGNORE_SUFFIX:
-                if currenttext.endswith(suffix):
-                    # print('%s removing %s' % (currenttext, suffix))
-                    end -= len(suffix)
-                    break
-            # Adjust boundaries to exclude matching brackets at start and end
-            currenttext = self.text[start-self.start:end-self.start]
-            for bpair in [('(', ')'), ('[', ']')]:
-                if len(currenttext) > 2 and currenttext[0] == bpair[0] and currenttext[-1] == bpair[1]:
-                    level = 1
-                    for k, char in enumerate(currenttext[1:]):
-                        if char == bpair[0]:
-                            level += 1
-                        elif char == bpair[1]:
-                            level -= 1
-                        if level == 0 and k == len(currenttext) - 2:
-                            start += 1
-                            end -= 1
-                            break
-
-            # If entity has been reduced to nothing by adjusting boundaries, skip it
-            if start >= end:
-                continue
-
-            currenttext = self.text[start-self.start:end-self.start]
-
-            # Do splits
-            split_spans = []
-            comps = list(regex_span_tokenize(currenttext, '(-|\+|\)?-to-\(?|···|/|\s)'))
-            if len(comps) > 1:
-                for split in SPLITS:
-                    if all(re.search(split, currenttext[comp[0]:comp[1]]) for comp in comps):
-                        # print('%s splitting %s' % (currenttext, [currenttext[comp[0]:comp[1]] for comp in comps]))
-                        for comp in comps:
-                            span = Span(text=currenttext[comp[0]:comp[1]], start=start+comp[0], end=start+comp[1])
-                            # print('SPLIT: %s - %s' % (currenttext, repr(span)))
-                            split_spans.append(span)
-                        break
-                else:
-                    split_spans.append(Span(text=currenttext, start=start, end=end))
-            else:
-                split_spans.append(Span(text=currenttext, start=start, end=end))
-
-            # Do specials
-            for split_span in split_spans:
-                for special in SPECIALS:
-                    m = re.search(special, split_span.text)
-                    if m:
-                        # print('%s special %s' % (split_span.text, m.groups()))
-                        for i in range(1, len(m.groups()) + 1):
-                            span = Span(text=m.group(i), start=split_span.start+m.start(i), end=split_span.start+m.end(i))
-                            # print('SUBMATCH: %s - %s' % (currenttext, repr(span)))
-                            spans.append(span)
-                        break
-                else:
-                    spans.append(split_span)
+        tagged_tokens = self.tagged_tokens
+        with stage('cems') as s:
+            for result in chemical_name.scan(tagged_tokens):
+                # parser scan yields (result, startindex, endindex) - we just use the indexes here
+                tokens = self.tokens[result[1]:result[2]]
+                start = tokens[0].start
+                end = tokens[-1].end
+                currenttext = self.text[start-self.start:end-self.start]
+                for text, span_start, span_end in self.cem_span_processor.process(currenttext):
+                    spans.append(Span(text=text, start=start+span_start, end=start+span_end))
+            s.count(len(spans))
         return spans
 
     @memoized_property
@@ -509,15 +471,17 @@ class Sentence(BaseText):
         # Ensure no control characters are sent to a parser (need to be XML compatible)
         tagged_tokens = [(CONTROL_RE.sub('', token), tag) for token, tag in self.tagged_tokens]
         for parser in self.parsers:
-            for record in parser.parse(tagged_tokens):
-                p = record.serialize()
-                if not p:  # TODO: Potential performance issues?
+            with stage('parser', parser) as s:
+                records = list(parser.parse(tagged_tokens))
+                s.count(len(records))
+            for record in records:
+                if record.is_empty():
                     continue
                 # Skip duplicate records
                 if record in compounds:
                     continue
                 # Skip just labels that have already been seen (bit of a hack)
-                if all(k in {'labels', 'roles'} for k in p.keys()) and set(record.labels).issubset(seen_labels):
+                if all(k in {'labels', 'roles'} for k in record.populated_fields()) and set(record.labels).issubset(seen_labels):
                     continue
                 seen_labels.update(record.labels)
                 compounds.append(record)
@@ -542,6 +506,38 @@ class Sentence(BaseText):
         return NotImplemented
 
 
+def tag_sentences(sentences):
+    """Part of speech and named entity tag many sentences at once.
+
+    Sentences are grouped by tagger, and the ``tag_sents`` method of each tagger is called once for its group, so the
+    tagger can process the sentences together. The tags are memoized on each sentence, exactly as if its
+    :attr:`Sentence.pos_tagged_tokens` and :attr:`Sentence.unprocessed_ner_tagged_tokens` had been used. Sentences that
+    have already been tagged are skipped.
+
+    :param list[Sentence] sentences: The sentences to tag.
+    """
+    pos_groups = collections.OrderedDict()
+    for sent in sentences:
+        if not hasattr(sent, '_pos_tagged_tokens'):
+            pos_groups.setdefault(sent.pos_tagger, []).append(sent)
+    for tagger, sents in pos_groups.items():
+        tokens = [sent.raw_tokens for sent in sents]
+        with stage('pos_tagger', tagger) as s:
+            s.count(sum(len(t) for t in tokens))
+            for sent, tagged in zip(sents, tagger.tag_sents(tokens)):
+                sent._pos_tagged_tokens = tagged
+    ner_groups = collections.OrderedDict()
+    for sent in sentences:
+        if not hasattr(sent, '_unprocessed_ner_tagged_tokens'):
+            ner_groups.setdefault(sent.ner_tagger, []).append(sent)
+    for tagger, sents in ner_groups.items():
+        tokens = [sent.pos_tagged_tokens for sent in sents]
+        with stage('ner_tagger', tagger) as s:
+            s.count(sum(len(t) for t in tokens))
+            for sent, tagged in zip(sents, tagger.tag_sents(tokens)):
+                sent._unprocessed_ner_tagged_tokens = tagged
+
+
 @python_2_unicode_compatible
 class Span(object):
     """A text span within a sentence."""
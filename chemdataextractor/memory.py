@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+chemdataextractor.memory
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Report and limit the memory used by caches and loaded models.
+
+Usage::
+
+    report = memory_report()
+    print(format_memory_report(report))
+    clear_caches()
+
+The caches that are reported are the models in :data:`~chemdataextractor.data.model_cache`, the lexemes of each
+:class:`~chemdataextractor.nlp.lexicon.Lexicon`, every named :class:`~chemdataextractor.utils.BoundedCache` (including
+the caches of :func:`~chemdataextractor.utils.memoize`) and, optionally, the memoized values of documents. Sizes are
+approximate: they are found by following the contents of each cache, and large containers are estimated from a sample
+of their items.
+
+Limits on the number of entries in caches and lexicons can be set with :func:`set_cache_limit`, or in the
+``cache_limits`` config value, e.g.::
+
+    cache_limits:
+      lexicon.ChemLexicon: 500000
+      table.heading_cache: 5000
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from collections import OrderedDict
+import itertools
+import numbers
+import sys
+import types
+
+import six
+
+from . import data
+from .doc.document import BaseDocument
+from .doc.element import BaseElement
+from .nlp.abbrev import AbbreviationDetector
+from .nlp.lexicon import Lexeme, Lexicon
+from .nlp.tag import BaseTagger
+from .nlp.tokenize import BaseTokenizer
+from .parse.base import BaseParser
+from .utils import BoundedCache, Singleton, cache_limits, memoized_attributes
+
+
+#: Number of items that are measured to estimate the size of a large container.
+SAMPLE_SIZE = 200
+
+#: Maximum depth of nested objects to follow when measuring sizes.
+MAX_DEPTH = 32
+
+#: Types that are sized without following their contents.
+_LEAF_TYPES = (six.text_type, six.binary_type, numbers.Number, type, types.ModuleType, types.FunctionType,
+               types.BuiltinFunctionType, types.MethodType, type(None))
+
+#: Objects shared by the pipeline, which are not counted as part of the documents that refer to them.
+_SHARED_TYPES = (BaseDocument, Lexicon, Lexeme, BaseTagger, BaseTokenizer, BaseParser, AbbreviationDetector,
+                 BoundedCache)
+
+
+def approximate_size(obj, exclude=(), sample=SAMPLE_SIZE):
+    """Return the approximate size in bytes of obj and everything it refers to.
+
+    Builtin containers and the attributes of objects are followed. Objects referred to more than once are counted once.
+    For containers with more than ``sample`` items, only the first ``sample`` items are measured and the rest are
+    assumed to be the same size on average.
+
+    :param obj: The object to measure.
+    :param tuple exclude: (Optional) Types of objects that aren't counted or followed.
+    :param int sample: (Optional) Number of items to measure in large containers.
+    :rtype: int
+    """
+    return int(_size(obj, set(), exclude, sample, 0))
+
+
+def _size(obj, seen, exclude, sample, depth):
+    if id(obj) in seen or (exclude and isinstance(obj, exclude)):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj, 0)
+    if depth >= MAX_DEPTH or isinstance(obj, _LEAF_TYPES):
+        return size
+    if isinstance(obj, dict):
+        children = itertools.chain.from_iterable(six.iteritems(obj))
+        count = 2 * len(obj)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        children = iter(obj)
+        count = len(obj)
+    else:
+        children = []
+        if hasattr(obj, '__dict__'):
+            children.append(obj.__dict__)
+        for cls in type(obj).__mro__:
+            for slot in vars(cls).get('__slots__', ()):
+                if hasattr(obj, slot):
+                    children.append(getattr(obj, slot))
+        count = len(children)
+    if count <= sample:
+        return size + sum(_size(child, seen, exclude, sample, depth + 1) for child in children)
+    sampled = sum(_size(child, seen, exclude, sample, depth + 1) for child in itertools.islice(children, sample))
+    return size + sampled * count / sample
+
+
+def _document_elements(document):
+    """Yield each element of a document, including the elements within them such as sentences and table cells."""
+    stack = list(document.elements)
+    while stack:
+        el = stack.pop()
+        yield el
+        for value in vars(el).values():
+            if isinstance(value, BaseElement):
+                stack.append(value)
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, BaseElement):
+                        stack.append(item)
+                    elif isinstance(item, list):
+                        stack.extend(cell for cell in item if isinstance(cell, BaseElement))
+
+
+def _lexicons():
+    """Return the Lexicon instances that have been created, by class name."""
+    lexicons = [(cls.__name__, instance) for cls, instance in Singleton._instances.items() if isinstance(instance, Lexicon)]
+    return sorted(lexicons, key=lambda item: item[0])
+
+
+def _named_caches():
+    """Return the live named caches, grouped by name."""
+    caches = OrderedDict()
+    for cache in sorted(BoundedCache._named, key=lambda c: c.name):
+        caches.setdefault(cache.name, []).append(cache)
+    return caches
+
+
+def memory_report(documents=()):
+    """Return the number of entries and approximate size of each loaded model, lexicon and named cache.
+
+    :param list[Document] documents: (Optional) Documents to also report the memoized values of, e.g. the documents a
+                                     long-running process is holding on to.
+    :rtype: OrderedDict
+    :returns: Dictionary of name to a dictionary with the ``kind`` (model, lexicon, cache or document), ``entries``,
+              ``maxsize`` and ``bytes``.
+    """
+    report = OrderedDict()
+    for loaded in sorted(data.model_cache.models, key=lambda loaded: loaded.path):
+        # Models are measured when they are loaded, and the entries are the number of copies in memory
+        report[loaded.path] = {
+            'kind': 'model',
+            'entries': loaded.copies,
+            'maxsize': None,
+            'bytes': loaded.memory,
+        }
+    for name, lexicon in _lexicons():
+        # Clusters are loaded with load_model, so they are reported with the models
+        report['lexicon.%s' % name] = {
+            'kind': 'lexicon',
+            'entries': len(lexicon.lexemes),
+            'maxsize': lexicon.max_lexemes,
+            'bytes': approximate_size(lexicon.lexemes),
+        }
+    for name, caches in _named_caches().items():
+        report[name] = {
+            'kind': 'cache',
+            'entries': sum(len(cache) for cache in caches),
+            'maxsize': caches[0].maxsize,
+            'bytes': approximate_size([cache._data for cache in caches]),
+        }
+    for i, document in enumerate(documents):
+        values = [getattr(el, attr) for el in _document_elements(document) for attr in memoized_attributes(el)]
+        report['document.%s' % i] = {
+            'kind': 'document',
+            'entries': len(values),
+            'maxsize': None,
+            'bytes': approximate_size(values, exclude=_SHARED_TYPES),
+        }
+    return report
+
+
+def format_memory_report(report):
+    """Return a table of a memory report, as returned by :func:`memory_report`."""
+    lines = ['%-48s %-8s %10s %10s %12s' % ('name', 'kind', 'entries', 'maxsize', 'size (kB)')]
+    for name, item in report.items():
+        lines.append('%-48s %-8s %10d %10s %12.1f' % (
+            name, item['kind'], item['entries'], '' if item['maxsize'] is None else item['maxsize'],
+            item['bytes'] / 1024
+        ))
+    total = sum(item['bytes'] for item in report.values())
+    lines.append('%-48s %-8s %10s %10s %12.1f' % ('total', '', '', '', total / 1024))
+    return '\n'.join(lines)
+
+
+def clear_caches(documents=()):
+    """Remove all entries from the lexicons and named caches.
+
+    Loaded models are not removed. Use :func:`~chemdataextractor.data.unload_model` to unload them.
+
+    :param list[Document] documents: (Optional) Documents to also remove the memoized values of. They are computed
+                                     again when they are next used.
+    """
+    for name, lexicon in _lexicons():
+        lexicon.lexemes.clear()
+    for caches in _named_caches().values():
+        for cache in caches:
+            cache.clear()
+    for document in documents:
+        for el in list(_document_elements(document)):
+            for attr in memoized_attributes(el):
+                delattr(el, attr)
+
+
+def set_cache_limit(name, maxsize):
+    """Set the maximum number of entries of a cache or lexicon, discarding entries over the new limit.
+
+    The limit applies to all caches with the name, including caches created later.
+
+    :param string name: The name of a cache, as in :func:`memory_report`, or ``lexicon.<class name>`` for a lexicon.
+    :param int maxsize: Maximum number of entries. None for unbounded.
+    """
+    cache_limits[name] = maxsize
+    for cache in _named_caches().get(name, []):
+        cache.resize(maxsize)
+    for lexicon_name, lexicon in _lexicons():
+        if name == 'lexicon.%s' % lexicon_name:
+            lexicon.max_lexemes = maxsize
+            if maxsize is not None and len(lexicon.lexemes) > maxsize:
+                lexicon.lexemes.clear()
@@ -26,10 +26,22 @@ from .utils import python_2_unicode_compatible
 log = logging.getLogger(__name__)
 
 
+#: Marker for a field that has no stored value on a Model instance.
+_UNSET = object()
+
+#: Default values of these types are shared between Model instances instead of being copied.
+_IMMUTABLE_TYPES = six.string_types + six.integer_types + (float, bool, tuple, frozenset)
+
+#: Serialized values that are omitted from the output unless the field is null=True.
+_EMPTY_VALUES = [None, '', []]
+
+
 class BaseType(six.with_metaclass(ABCMeta)):
 
     # This is assigned by ModelMeta to match the attribute on the Model
     name = None
+    # Name of the instance slot that stores the value. None for fields added to a Model class after it was created.
+    slot = None
 
     def __init__(self, default=None, null=False, required=False, contextual=False):
         """
@@ -49,16 +61,52 @@ class BaseType(six.with_metaclass(ABCMeta)):
         # Check if Model class is being called, rather than Model instance
         if instance is None:
             return self
-        # Get value from Model instance if available
-        value = instance._values.get(self.name)
-        # If value is None or empty string then return the default value, if set
-        # if value in [None, ''] and self.default is not None:
-        #     return self.default
+        value = self._load(instance)
+        if value is _UNSET:
+            value = self.default
+            # Mutable defaults are only copied onto the instance when first requested, so in-place changes persist
+            if value is not None and not isinstance(value, _IMMUTABLE_TYPES):
+                value = copy.copy(value)
+                self._store(instance, value)
         return value
 
     def __set__(self, instance, value):
         """Descriptor for assigning a value to a field in a Model."""
-        instance._values[self.name] = self.process(value)
+        self._store(instance, self.process(value))
+
+    def _load(self, instance):
+        """Return the value stored on a Model instance, or _UNSET."""
+        if self.slot is not None:
+            return getattr(instance, self.slot, _UNSET)
+        extra = getattr(instance, '_extra', None)
+        if extra is None:
+            return _UNSET
+        return extra.get(self.name, _UNSET)
+
+    def _store(self, instance, value):
+        """Store a value on a Model instance."""
+        if self.slot is not None:
+            setattr(instance, self.slot, value)
+        else:
+            extra = getattr(instance, '_extra', None)
+            if extra is None:
+                extra = instance._extra = {}
+            extra[self.name] = value
+
+    def _clear(self, instance):
+        """Remove any value stored on a Model instance, so the default applies again."""
+        if self.slot is not None:
+            if hasattr(instance, self.slot):
+                delattr(instance, self.slot)
+        else:
+            extra = getattr(instance, '_extra', None)
+            if extra is not None:
+                extra.pop(self.name, None)
+
+    def _peek(self, instance):
+        """Return the value for a Model instance without copying a default onto it."""
+        value = self._load(instance)
+        return self.default if value is _UNSET else value
 
     def process(self, value):
         """Convert an assigned value into the desired data format."""
@@ -123,50 +171,154 @@ class ListType(BaseType):
     def __set__(self, instance, value):
         """Descriptor for assigning a value to a ListField in a Model."""
         # Run process for the nested field type for each value in list
-        instance._values[self.name] = [self.field.process(v) for v in value]
+        self._store(instance, [self.field.process(v) for v in value])
 
     def serialize(self, value, primitive=False):
         """Serialize this field."""
         return [self.field.serialize(v, primitive=primitive) for v in value]
 
 
+def _serialize_value(value, primitive):
+    return value
+
+
+def _serialize_model(value, primitive):
+    return value.serialize(primitive=primitive)
+
+
+def _compile_field(field):
+    """Return a (serializer, kind) tuple for a field.
+
+    The serializer converts a non-None value of the field. The kind describes what the serialized value looks like, so
+    emptiness can be checked without serializing: 'value' (unchanged), 'model' (a dict, never empty), 'list' (empty
+    if the value is empty) or 'custom' (unknown).
+    """
+    serialize = type(field).serialize
+    if isinstance(field, ListType) and serialize is ListType.serialize:
+        item_serializer, item_kind = _compile_field(field.field)
+        if item_kind == 'value':
+            return (lambda value, primitive: list(value)), 'list'
+        return (lambda value, primitive: [item_serializer(v, primitive) for v in value]), 'list'
+    if isinstance(field, ModelType) and serialize is ModelType.serialize:
+        return _serialize_model, 'model'
+    if isinstance(field, (StringType, FloatType)) and serialize is BaseType.serialize:
+        return _serialize_value, 'value'
+    return (lambda value, primitive: field.serialize(value, primitive=primitive)), 'custom'
+
+
+class ModelSerializer(object):
+    """Serializer specialized for the fields of a Model class.
+
+    The serialization plan for each field is worked out once, so serializing a Model doesn't need to look up fields or
+    inspect values to find nested Models. ModelMeta builds one of these per Model class when it is first needed.
+    """
+
+    def __init__(self, model_class):
+        self.plan = []
+        for field_name, field in six.iteritems(model_class.fields):
+            serializer, kind = _compile_field(field)
+            self.plan.append((field.name, field._peek, serializer, kind, field.null))
+
+    def serialize(self, model, primitive=False):
+        """Convert a Model to a python dictionary."""
+        data = {}
+        for name, peek, serializer, kind, null in self.plan:
+            value = peek(model)
+            if value is not None:
+                value = serializer(value, primitive)
+            # Skip empty fields unless field.null
+            if not null and value in _EMPTY_VALUES:
+                continue
+            data[name] = value
+        return data
+
+    def populated_fields(self, model):
+        """Yield the names of the fields that would be included when serializing a Model."""
+        for name, peek, serializer, kind, null in self.plan:
+            if null:
+                yield name
+                continue
+            value = peek(model)
+            if value is None:
+                continue
+            if kind == 'model':
+                yield name
+            elif kind == 'list':
+                if value:
+                    yield name
+            else:
+                if kind == 'custom':
+                    value = serializer(value, False)
+                if value not in _EMPTY_VALUES:
+                    yield name
+
+
 class ModelMeta(ABCMeta):
-    """"""
+    """Metaclass for Models that collects the fields and, for Model classes that define ``__slots__``, gives each field a
+    fixed storage slot on instances.
+
+    Slots are opt-in, because two base classes that both add slots can't be combined with multiple inheritance. The
+    built-in models define ``__slots__ = ()`` to get compact instances. The fields of other Model classes, and fields
+    that are added to a Model class after it is created (e.g. ``Compound.boiling_points = ListType(...)``), have their
+    values kept in a small overflow dict that is only created for instances that use them.
+    """
 
     def __new__(mcs, name, bases, attrs):
         fields = {}
+        slotted = '__slots__' in attrs
+        slots = attrs.get('__slots__', ())
+        slots = [slots] if isinstance(slots, six.string_types) else list(slots)
         for attr_name, attr_value in six.iteritems(attrs):
             if isinstance(attr_value, BaseType):
                 # Set the name attribute on the Type to the attribute name on the Model
                 attr_value.name = six.text_type(attr_name)
+                if slotted:
+                    attr_value.slot = str('_%s' % attr_name)
+                    slots.append(attr_value.slot)
                 fields[attr_name] = attr_value
+        if slotted:
+            attrs['__slots__'] = tuple(slots)
         cls = super(ModelMeta, mcs).__new__(mcs, name, bases, attrs)
-        cls.fields = cls.fields.copy()
+        # Collect the fields of every base, so models can combine fields with multiple inheritance
+        cls.fields = {}
+        for base in reversed(cls.__mro__[1:]):
+            cls.fields.update(getattr(base, 'fields', {}))
         cls.fields.update(fields)
         return cls
 
     def __setattr__(cls, key, value):
         if isinstance(value, BaseType):
             value.name = six.text_type(key)
+            value.slot = None
             cls.fields[key] = value
+            # Serializer needs to be rebuilt to include the new field
+            super(ModelMeta, cls).__setattr__('_serializer', None)
         return super(ModelMeta, cls).__setattr__(key, value)
 
+    @property
+    def serializer(cls):
+        """The ModelSerializer for this Model class."""
+        serializer = cls.__dict__.get('_serializer')
+        if serializer is None:
+            serializer = ModelSerializer(cls)
+            super(ModelMeta, cls).__setattr__('_serializer', serializer)
+        return serializer
+
 
 @python_2_unicode_compatible
 class BaseModel(six.with_metaclass(ModelMeta)):
     """"""
 
+    # Instances still get a __dict__ (created on first use) so arbitrary attributes can be set on them
+    __slots__ = ('_extra', '__dict__', '__weakref__')
+
     fields = {}
 
     def __init__(self, **raw_data):
         """"""
-        self._values = {}
+        # Fields without a value return their default, so only the supplied values need to be stored
         for key, value in six.iteritems(raw_data):
             setattr(self, key, value)
-        # Set defaults
-        for key, field in six.iteritems(self.fields):
-            if key not in raw_data:
-                setattr(self, key, copy.copy(field.default))
 
     def __repr__(self):
         return '<%s>' % (self.__class__.__name__,)
@@ -177,9 +329,52 @@ class BaseModel(six.with_metaclass(ModelMeta)):
     def __eq__(self, other):
         # TODO: Check this actually works as expected (what about default values?)
         if isinstance(other, self.__class__):
-            return self._values == other._values
+            return self._field_values() == other._field_values()
         return False
 
+    def __getstate__(self):
+        state = {}
+        for name, field in six.iteritems(self.fields):
+            value = field._load(self)
+            if value is not _UNSET:
+                state[name] = value
+        attrs = getattr(self, '__dict__', None)
+        if attrs:
+            return state, attrs
+        return state
+
+    def __setstate__(self, state):
+        attrs = None
+        if isinstance(state, tuple):
+            state, attrs = state
+        elif set(state) == {'_values'} and '_values' not in self.fields:
+            # Pickled by a version that kept all field values in a _values dict
+            state = state['_values']
+        for name, value in six.iteritems(state):
+            if name in self.fields:
+                self.fields[name]._store(self, value)
+        if attrs:
+            self.__dict__.update(attrs)
+
+    def __deepcopy__(self, memo):
+        # Copy the stored values directly, which is much faster than the generic deepcopy via __getstate__
+        new = self.__class__.__new__(self.__class__)
+        memo[id(self)] = new
+        for name, field in six.iteritems(self.fields):
+            value = field._load(self)
+            if value is not _UNSET:
+                if value is not None and not isinstance(value, _IMMUTABLE_TYPES):
+                    value = copy.deepcopy(value, memo)
+                field._store(new, value)
+        attrs = getattr(self, '__dict__', None)
+        if attrs:
+            new.__dict__.update(copy.deepcopy(attrs, memo))
+        return new
+
+    def _field_values(self):
+        """Return a dict of the value of every field, including defaults."""
+        return {name: field._peek(self) for name, field in six.iteritems(self.fields)}
+
     def __iter__(self):
         return iter(self.fields)
 
@@ -187,7 +382,7 @@ class BaseModel(six.with_metaclass(ModelMeta)):
         """Handle deletion of field values by setting to default if specified."""
         # Set to default value
         if attr in self.fields:
-            setattr(self, attr, self.fields[attr].default)
+            self.fields[attr]._clear(self)
         else:
             super(BaseModel, self).__delattr__(attr)
 
@@ -233,8 +428,8 @@ class BaseModel(six.with_metaclass(ModelMeta)):
     @property
     def is_contextual(self):
         for k in self:
-            value = getattr(self, k)
             field = self.fields.get(k)
+            value = field._peek(self)
             # Not contextual if any contextual=False field has a value
             if value not in [None, '', []]:
                 # If a ListType, it depends on the contained type
@@ -257,18 +452,17 @@ class BaseModel(six.with_metaclass(ModelMeta)):
 
     def serialize(self, primitive=False):
         """Convert Model to python dictionary."""
-        # Serialize fields to a dict
-        data = {}
-        for field_name in self:
-            value = getattr(self, field_name)
-            field = self.fields.get(field_name)
-            if value is not None:
-                value = field.serialize(value, primitive=primitive)
-            # Skip empty fields unless field.null
-            if not field.null and value in [None, '', []]:
-                continue
-            data[field.name] = value
-        return data
+        return type(self).serializer.serialize(self, primitive=primitive)
+
+    def populated_fields(self):
+        """Return the names of the fields that are included when this Model is serialized."""
+        return list(type(self).serializer.populated_fields(self))
+
+    def is_empty(self):
+        """Return True if this Model would serialize to an empty dictionary, without serializing it."""
+        for _ in type(self).serializer.populated_fields(self):
+            return False
+        return True
 
     def to_json(self, *args, **kwargs):
         """Convert Model to JSON."""
@@ -311,8 +505,40 @@ class ModelList(MutableSequence):
         """Convert ModelList to JSON."""
         return json.dumps(self.serialize(), *args, **kwargs)
 
+    def iter_json(self, **kwargs):
+        """Yield the JSON for this ModelList in chunks, serializing one Model at a time.
+
+        Joining the chunks gives the same output as :meth:`to_json` with the same keyword arguments, but the serialized
+        form of the whole list never has to be held in memory.
+        """
+        indent = kwargs.get('indent')
+        if not self.models:
+            yield '[]'
+            return
+        item_separator = json.JSONEncoder(indent=indent, separators=kwargs.get('separators')).item_separator
+        if indent is None:
+            start, separator, end = '[', item_separator, ']'
+        else:
+            pad = indent if isinstance(indent, six.string_types) else ' ' * indent
+            start, separator, end = '[\n' + pad, item_separator + '\n' + pad, '\n]'
+        yield start
+        for i, model in enumerate(self.models):
+            if i > 0:
+                yield separator
+            chunk = json.dumps(model.serialize(), **kwargs)
+            # Strings in JSON can't contain a literal newline, so each newline is a line break that needs indenting
+            yield chunk if indent is None else chunk.replace('\n', '\n' + pad)
+        yield end
+
+    def write_json(self, f, **kwargs):
+        """Write the JSON for this ModelList to a file-like object, serializing one Model at a time."""
+        for chunk in self.iter_json(**kwargs):
+            f.write(chunk)
+
 
 class UvvisPeak(BaseModel):
+    __slots__ = ()
+
     #: Peak value, i.e. wavelength
     value = StringType()
     #: Peak value units
@@ -326,6 +552,8 @@ class UvvisPeak(BaseModel):
 
 
 class UvvisSpectrum(BaseModel):
+    __slots__ = ()
+
     solvent = StringType(contextual=True)
     temperature = StringType(contextual=True)
     temperature_units = StringType(contextual=True)
@@ -336,6 +564,8 @@ class UvvisSpectrum(BaseModel):
 
 
 class IrPeak(BaseModel):
+    __slots__ = ()
+
     value = StringType()
     units = StringType(contextual=True)
     strength = StringType()
@@ -343,6 +573,8 @@ class IrPeak(BaseModel):
 
 
 class IrSpectrum(BaseModel):
+    __slots__ = ()
+
     solvent = StringType(contextual=True)
     temperature = StringType(contextual=True)
     temperature_units = StringType(contextual=True)
@@ -353,6 +585,8 @@ class IrSpectrum(BaseModel):
 
 
 class NmrPeak(BaseModel):
+    __slots__ = ()
+
     shift = StringType()
     intensity = StringType()
     multiplicity = StringType()
@@ -363,6 +597,8 @@ class NmrPeak(BaseModel):
 
 
 class NmrSpectrum(BaseModel):
+    __slots__ = ()
+
     nucleus = StringType(contextual=True)
     solvent = StringType(contextual=True)
     frequency = StringType(contextual=True)
@@ -378,6 +614,8 @@ class NmrSpectrum(BaseModel):
 
 class MeltingPoint(BaseModel):
     """A melting point measurement."""
+    __slots__ = ()
+
     value = StringType()
     units = StringType(contextual=True)
     solvent = StringType(contextual=True)
@@ -388,6 +626,8 @@ class MeltingPoint(BaseModel):
 
 class GlassTransition(BaseModel):
     """A glass transition temperature."""
+    __slots__ = ()
+
     value = StringType()
     units = StringType(contextual=True)
     method = StringType(contextual=True)
@@ -396,6 +636,8 @@ class GlassTransition(BaseModel):
 
 class QuantumYield(BaseModel):
     """A quantum yield measurement."""
+    __slots__ = ()
+
     value = StringType()
     units = StringType(contextual=True)
     solvent = StringType(contextual=True)
@@ -412,6 +654,8 @@ class QuantumYield(BaseModel):
 
 class FluorescenceLifetime(BaseModel):
     """A fluorescence lifetime measurement."""
+    __slots__ = ()
+
     value = StringType()
     units = StringType(contextual=True)
     solvent = StringType(contextual=True)
@@ -424,6 +668,8 @@ class FluorescenceLifetime(BaseModel):
 
 class ElectrochemicalPotential(BaseModel):
     """An oxidation or reduction potential, from cyclic voltammetry."""
+    __slots__ = ()
+
     value = StringType()
     units = StringType(contextual=True)
     type = StringType(contextual=True)
@@ -436,6 +682,8 @@ class ElectrochemicalPotential(BaseModel):
 
 
 class Compound(BaseModel):
+    __slots__ = ()
+
     names = ListType(StringType())
     labels = ListType(StringType())
     roles = ListType(StringType())
@@ -20,6 +20,37 @@ from ..text import bracket_level
 log = logging.getLogger(__name__)
 
 
+#: Tokens that end a bracketed abbreviation candidate.
+BRACKET_ENDS = {')', ';', ','}
+
+
+def _is_valid(abbr, long):
+    """Return True if the characters of abbr occur in order in long, with the first at the start of a word."""
+    # Disallowed characters - @ typically in emails
+    if '@' in long:
+        return False
+    # Each character of lower must be the lowercase of the character at the same index in long
+    lower = long.lower()
+    if len(lower) != len(long) or 'Σ' in long:
+        # Lowercasing changed the length or used the final sigma rule, so lowercase each character separately
+        lower = ''.join(c if len(c) == 1 else '\x00' for c in (c.lower() for c in long))
+    l_i = len(long) - 1
+    for a_i in range(len(abbr) - 1, -1, -1):
+        current = abbr[a_i].lower()
+        # Ignore non-alphanumeric  # TODO: Greek!
+        if not current.isalnum():
+            continue
+        # Find the previous occurrence, which must be at the start of a word for the first character of abbr
+        l_i = lower.rfind(current, 0, l_i + 1)
+        if a_i == 0:
+            while l_i > 0 and long[l_i-1].isalnum():
+                l_i = lower.rfind(current, 0, l_i)
+        if l_i < 0:
+            return False
+        l_i -= 1
+    return True
+
+
 class AbbreviationDetector(object):
     """Detect abbreviation definitions in a list of tokens.
 
@@ -34,11 +65,22 @@ class AbbreviationDetector(object):
     abbr_max = 10
     #: String equivalents to use when detecting abbreviations.
     abbr_equivs = []
+    #: Regular expression that matches property values, which are not allowed as abbreviations.
+    PROPERTY_VALUE_RE = re.compile('^\d+(\.\d+)?(g|m[lL]|cm)$')
 
     def __init__(self, abbr_min=None, abbr_max=None, abbr_equivs=None):
         self.abbr_min = abbr_min if abbr_min is not None else self.abbr_min
         self.abbr_max = abbr_max if abbr_max is not None else self.abbr_max
         self.abbr_equivs = abbr_equivs if abbr_equivs is not None else self.abbr_equivs
+        self._equivs_source = None
+        self._equivs_re = None
+
+    def _get_equivs_re(self):
+        """Return a regular expression that matches any string that has an equivalent, compiled once per abbr_equivs."""
+        if self.abbr_equivs is not self._equivs_source:
+            self._equivs_source = self.abbr_equivs
+            self._equivs_re = re.compile('|'.join(re.escape(before) for before, after in self.abbr_equivs), re.U)
+        return self._equivs_re
 
     def _is_allowed_abbr(self, tokens):
         """Return True if text is an allowed abbreviation."""
@@ -47,7 +89,7 @@ class AbbreviationDetector(object):
             if self.abbr_min <= len(abbr_text) <= self.abbr_max and bracket_level(abbr_text) == 0:
                 if abbr_text[0].isalnum() and any(c.isalpha() for c in abbr_text):
                     # Disallow property values
-                    if re.match('^\d+(\.\d+)?(g|m[lL]|cm)$', abbr_text):
+                    if self.PROPERTY_VALUE_RE.match(abbr_text):
                         return False
                     return True
         return False
@@ -59,6 +101,13 @@ class AbbreviationDetector(object):
     def _get_candidates(self, tokens):
         candidates = []
         bracket_spans = []
+        # Index of the nearest bracket end token after each token, found in a single pass backwards through the tokens
+        next_ends = [None] * len(tokens)
+        next_end = None
+        for i in range(len(tokens) - 1, -1, -1):
+            next_ends[i] = next_end
+            if tokens[i] in BRACKET_ENDS:
+                next_end = i
         for i, t1 in enumerate(tokens):
             if t1 == '=':
                 # abbr = long
@@ -70,11 +119,8 @@ class AbbreviationDetector(object):
                     if long_span:
                         candidates.append((abbr_span, long_span))
                         #candidates.append((abbr, long))
-            if t1 == '(':
-                for j, t2 in enumerate(tokens[i+1:]):
-                    if t2 in {')', ';', ','}:
-                        bracket_spans.append((i+1, i+j+1))
-                        break
+            if t1 == '(' and next_ends[i] is not None:
+                bracket_spans.append((i+1, next_ends[i]))
         for span in bracket_spans:
             inside = tokens[span[0]:span[1]]
             if self._is_allowed_abbr(inside):
@@ -129,34 +175,17 @@ class AbbreviationDetector(object):
 
     def _is_valid_long(self, abbr, tokens):
         """"""
-
-        def _is_valid(abbr, long):
-            # Disallowed characters - @ typically in emails
-            if '@' in long:
-                return False
-            l_i = len(long) - 1
-            for a_i in range(len(abbr) - 1, -1, -1):
-                current = abbr[a_i].lower()
-                #print('current: %s' % current)
-                # Ignore non-alphanumeric  # TODO: Greek!
-                if not current.isalnum():
-                    continue
-                while (l_i >= 0 and not long[l_i].lower() == current) or (a_i == 0 and l_i > 0 and long[l_i-1].isalnum()):
-                    #print('L: %s' % long[l_i])
-                    l_i -= 1
-                if l_i < 0:
-                    #print('l_i < 0 : fail')
-                    return False
-                l_i -= 1
-            return True
-
         abbr = ''.join(abbr)
-        longs = {' '.join(tokens)}
-        for before, after in self.abbr_equivs:
-            newlongs = set()
-            for long in longs:
-                newlongs.add(long.replace(before, after))
-            longs.update(newlongs)
+        long = ' '.join(tokens)
+        longs = {long}
+        # Only expand the equivalents if one occurs, otherwise no replacement can change the long form
+        if self.abbr_equivs and self._get_equivs_re().search(long):
+            for before, after in self.abbr_equivs:
+                newlongs = set()
+                for long in longs:
+                    if before in long:
+                        newlongs.add(long.replace(before, after))
+                longs.update(newlongs)
         for long in longs:
             if _is_valid(abbr, long):
                 return True
@@ -16,7 +16,9 @@ import re
 
 import six
 
+from ..profiler import stage
 from ..text import bracket_level
+from ..utils import BoundedCache
 from .lexicon import ChemLexicon
 from .tag import BaseTagger, CrfTagger, DictionaryTagger
 
@@ -326,6 +328,16 @@ SPLITS = [
     '^(ester|amide)$'
 ]
 
+#: STOP_RES combined into a single regular expression that matches wherever any of them match.
+STOP_RE = re.compile('|'.join('(?:%s)' % stop_re for stop_re in STOP_RES))
+
+#: STRIP_START and STRIP_END as sets, for fast membership tests.
+STRIP_START_SET = frozenset(STRIP_START)
+STRIP_END_SET = frozenset(STRIP_END)
+
+#: Regular expression that matches a bracketed label at the end of an entity, e.g. 2a or IV
+LABEL_RE = re.compile('^(\d{1,2}[A-Za-z]?|I|II|III|IV|V|VI|VII|VIII|IX)$')
+
 # Special case boundary adjustments (only used for cems output)
 SPECIALS = [
     '(?:^|-)([CONS])-\w+ases?$',
@@ -353,6 +365,120 @@ SPECIALS = [
 ]
 
 
+class CemSpanProcessor(object):
+    """Adjust the boundaries of chemical entity mentions and split them into separate entities.
+
+    The rule lists are compiled once when the processor is created. Results are cached by mention text, because the
+    same mentions occur many times in a document.
+    """
+
+    #: Regular expression that splits a mention into the components that are checked against the splits.
+    SPLIT_COMPONENT_RE = re.compile('(-|\+|\)?-to-\(?|···|/|\s)', re.U)
+
+    def __init__(self, ignore_prefix=IGNORE_PREFIX, ignore_suffix=IGNORE_SUFFIX, splits=SPLITS, specials=SPECIALS,
+                 cache_size=20000):
+        """
+
+        :param list[string] ignore_prefix: Beginnings to remove from mentions. The first that matches is removed.
+        :param list[string] ignore_suffix: Endings to remove from mentions. The first that matches is removed.
+        :param list[string] splits: Regular expressions. Split a mention if all its components match one of them.
+        :param list[string] specials: Regular expressions. Replace a mention with the groups of the first that matches.
+        :param int cache_size: Maximum number of mentions to cache the results for. None for unbounded, 0 to disable.
+        """
+        # Alternatives are tried in order, so a match is the first prefix in the list that the text starts with
+        self.prefix_re = re.compile('|'.join(re.escape(prefix) for prefix in ignore_prefix), re.U)
+        # Matched against the reversed text, so a match is the reverse of the first suffix that the text ends with
+        self.suffix_re = re.compile('|'.join(re.escape(suffix[::-1]) for suffix in ignore_suffix), re.U)
+        self.split_res = [re.compile(split) for split in splits]
+        self.special_res = [re.compile(special) for special in specials]
+        self.cache = BoundedCache(maxsize=cache_size, name='cem.span_cache')
+
+    def ignore_bounds(self, text):
+        """Return the start and end of the lowercase text without any ignored prefix and suffix.
+
+        :param string text: Lowercase mention text.
+        :rtype: tuple(int, int)
+        """
+        start = 0
+        end = len(text)
+        prefix = self.prefix_re.match(text)
+        if prefix:
+            start += prefix.end()
+        suffix = self.suffix_re.match(text[::-1])
+        if suffix:
+            end -= suffix.end()
+        return start, end
+
+    def _components(self, text):
+        """Return the spans of the components between the split characters in text."""
+        comps = []
+        left = 0
+        for m in self.SPLIT_COMPONENT_RE.finditer(text):
+            right, next = m.span()
+            if right != 0:
+                comps.append((left, right))
+            left = next
+        comps.append((left, len(text)))
+        return comps
+
+    def process(self, text):
+        """Return (text, start, end) for each entity in a chemical entity mention, with offsets relative to its text.
+
+        :param string text: Mention text.
+        :rtype: tuple(tuple(string, int, int))
+        """
+        results = self.cache.get(text)
+        if results is None:
+            results = tuple(self._process(text))
+            self.cache[text] = results
+        return results
+
+    def _process(self, text):
+        # Adjust boundaries to exclude disallowed prefixes/suffixes
+        lowertext = text.lower()
+        start, end = self.ignore_bounds(lowertext)
+        # Suffix is removed from the end of the original text, which lowercasing may have lengthened
+        end -= len(lowertext) - len(text)
+        # Adjust boundaries to exclude matching brackets at start and end
+        currenttext = text[start:end]
+        if len(currenttext) > 2:
+            for bopen, bclose in [('(', ')'), ('[', ']')]:
+                # Bracket level returns to zero at the last character if the numbers of brackets are equal
+                if (currenttext[0] == bopen and currenttext[-1] == bclose and
+                        currenttext.count(bopen) == currenttext.count(bclose)):
+                    start += 1
+                    end -= 1
+                    break
+
+        # If entity has been reduced to nothing by adjusting boundaries, skip it
+        if start >= end:
+            return []
+
+        currenttext = text[start:end]
+
+        # Do splits
+        split_spans = [(currenttext, start, end)]
+        comps = self._components(currenttext)
+        if len(comps) > 1:
+            for split_re in self.split_res:
+                if all(split_re.search(currenttext[comp[0]:comp[1]]) for comp in comps):
+                    split_spans = [(currenttext[comp[0]:comp[1]], start + comp[0], start + comp[1]) for comp in comps]
+                    break
+
+        # Do specials
+        spans = []
+        for split_text, split_start, split_end in split_spans:
+            for special_re in self.special_res:
+                m = special_re.search(split_text)
+                if m:
+                    for i in range(1, len(m.groups()) + 1):
+                        spans.append((m.group(i), split_start + m.start(i), split_start + m.end(i)))
+                    break
+            else:
+                spans.append((split_text, split_start, split_end))
+        return spans
+
+
 class CiDictCemTagger(DictionaryTagger):
     """Case-insensitive CEM dictionary tagger."""
     lexicon = ChemLexicon()
@@ -514,22 +640,13 @@ class CemTagger(BaseTagger):
     #: The individual chemical entity taggers to use.
     taggers = [CrfCemTagger(), CiDictCemTagger(), CsDictCemTagger()]
     lexicon = ChemLexicon()
+    #: Processor that adjusts the boundaries of entities and splits them.
+    span_processor = CemSpanProcessor()
 
     def _in_stoplist(self, entity):
         """Return True if the entity is in the stoplist."""
-        start = 0
-        end = len(entity)
         # Adjust boundaries to exclude disallowed prefixes/suffixes
-        for prefix in IGNORE_PREFIX:
-            if entity.startswith(prefix):
-                # print('%s removing %s' % (currenttext, prefix))
-                start += len(prefix)
-                break
-        for suffix in IGNORE_SUFFIX:
-            if entity.endswith(suffix):
-                # print('%s removing %s' % (currenttext, suffix))
-                end -= len(suffix)
-                break
+        start, end = self.span_processor.ignore_bounds(entity)
         # Return True if entity has been reduced to nothing by adjusting boundaries
         if start >= end:
             return True
@@ -538,18 +655,32 @@ class CemTagger(BaseTagger):
         if entity in STOPLIST:
             return True
         # log.debug('Entity: %s', entity)
-        for stop_re in STOP_RES:
-            if re.search(stop_re, entity):
-                log.debug('Killed: %s', entity)
-                return True
+        if STOP_RE.search(entity):
+            log.debug('Killed: %s', entity)
+            return True
 
     def tag(self, tokens):
         """Run individual chemical entity mention taggers and return union of matches, with some postprocessing."""
+        return self.tag_sents([tokens])[0]
+
+    def tag_sents(self, sentences):
+        """Tag many sentences at once. Each individual tagger tags all the sentences before the next one is run.
+
+        :param list(list(tuple(str, str))) sentences: The (token, pos tag) tuples of each sentence.
+        """
+        sentences = list(sentences)
+        just_tokens = [[t[0] for t in tokens] for tokens in sentences]
+        outputs = []
+        for tagger in self.taggers:
+            with stage('cem_tagger', tagger):
+                outputs.append(tagger.tag_sents(sentences if isinstance(tagger, CrfCemTagger) else just_tokens))
+        return [self._combine(tokens, [output[j] for output in outputs]) for j, tokens in enumerate(sentences)]
+
+    def _combine(self, tokens, tag_gens):
+        """Return the union of the matches of the individual taggers for a sentence, with some postprocessing."""
         # Combine output from individual taggers
         tags = [None] * len(tokens)
-        just_tokens = [t[0] for t in tokens]
-        for tagger in self.taggers:
-            tag_gen = tagger.tag(tokens) if isinstance(tagger, CrfCemTagger) else tagger.tag(just_tokens)
+        for tag_gen in tag_gens:
             for i, (token, newtag) in enumerate(tag_gen):
                 if newtag == 'I-CM' and not (i == 0 or tag_gen[i - 1][1] not in {'B-CM', 'I-CM'}):
                     tags[i] = 'I-CM'  # Always overwrite I-CM
@@ -561,12 +692,12 @@ class CemTagger(BaseTagger):
             lex = self.lexicon[token]
             nexttag = tags[i+1] if i < len(tags) - 1 else None
             # Trim disallowed first tokens
-            if tag == 'B-CM' and lex.lower in STRIP_START:
+            if tag == 'B-CM' and lex.lower in STRIP_START_SET:
                 tags[i] = None
                 if nexttag == 'I-CM':
                     tags[i+1] = 'B-CM'
             # Trim disallowed final tokens
-            if nexttag is None and lex.lower in STRIP_END:
+            if nexttag is None and lex.lower in STRIP_END_SET:
                 tags[i] = None
         # Filter certain entities
         for i, tag in enumerate(tags):
@@ -574,12 +705,9 @@ class CemTagger(BaseTagger):
             if tag == 'B-CM':
                 entity_tokens = [self.lexicon[token].lower]
                 end_i = i + 1
-                for j, subsequent in enumerate(tags[i+1:]):
-                    if subsequent == 'I-CM':
-                        end_i += 1
-                        entity_tokens.append(self.lexicon[tokens[i+j+1][0]].lower)
-                    else:
-                        break
+                while end_i < len(tags) and tags[end_i] == 'I-CM':
+                    entity_tokens.append(self.lexicon[tokens[end_i][0]].lower)
+                    end_i += 1
 
                 # Fix combined '1H NMR' on end  # TODO: Also 13C, etc.?
                 if len(entity_tokens) > 2 and entity_tokens[-1] == 'nmr' and entity_tokens[-2] == '1h':
@@ -607,7 +735,7 @@ class CemTagger(BaseTagger):
                     else:
                         # Remove bracketed alphanumeric from end
                         if len(entity_tokens) >= 4 and entity_tokens[-1] == ')' and entity_tokens[-3] == '(':
-                            if re.match('^(\d{1,2}[A-Za-z]?|I|II|III|IV|V|VI|VII|VIII|IX)$', entity_tokens[-2]):
+                            if LABEL_RE.match(entity_tokens[-2]):
                                 log.debug('Removing %s from end of CEM', entity_tokens[-2])
                                 tags[end_i-3:end_i] = [None, None, None]
         tokentags = list(six.moves.zip(tokens, tags))
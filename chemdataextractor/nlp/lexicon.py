@@ -12,17 +12,56 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 import logging
+import unicodedata
 
 import six
 
-from ..data import load_model
-from ..text import word_shape, is_ascii, is_punct, like_url, like_number
+from ..data import load_model, model_cache
+from ..text import char_shape, word_shape, is_ascii, is_punct, like_url, like_number
 from ..text.normalize import Normalizer, ChemNormalizer
-from ..utils import Singleton
+from ..utils import Singleton, cache_limits
 
 log = logging.getLogger(__name__)
 
 
+#: Cache of (shape, is_digit, is_upper, is_lower, is_punct, is_ascii) for each character, used by Lexicon.add_many.
+_char_table = {}
+
+
+def _char_features(text):
+    """Return the shape, upper_count, lower_count, digit_count, is_punct and is_ascii features of text in one pass.
+
+    Gives the same results as word_shape, is_punct, is_ascii and the Lexicon count methods, but classifies each
+    character by a single lookup in a table that is shared between all texts.
+    """
+    upper_count = lower_count = digit_count = 0
+    all_punct = all_ascii = True
+    shape = []
+    prev_m = ''
+    seq = 0
+    for c in text:
+        features = _char_table.get(c)
+        if features is None:
+            features = _char_table[c] = (
+                char_shape(c), c.isdigit(), c.isupper(), c.islower(), unicodedata.category(c).startswith('P'),
+                ord(c) < 128
+            )
+        m, c_digit, c_upper, c_lower, c_punct, c_ascii = features
+        digit_count += c_digit
+        upper_count += c_upper
+        lower_count += c_lower
+        all_punct = all_punct and c_punct
+        all_ascii = all_ascii and c_ascii
+        if m == prev_m:
+            seq += 1
+        else:
+            seq = 0
+            prev_m = m
+        if seq < 3:
+            shape.append(m)
+    return ''.join(shape), upper_count, lower_count, digit_count, all_punct, all_ascii
+
+
 class Lexeme(object):
     """"""
 
@@ -86,11 +125,23 @@ class Lexicon(six.with_metaclass(Singleton)):
     #: Path to the Brown clusters model file for this Lexicon.
     clusters_path = None
 
+    #: Maximum number of lexemes to store, or None for unbounded. When it is reached, all stored lexemes are discarded
+    #: and added again as they are next used. Overridden by the ``lexicon.<class name>`` entry in ``cache_limits``.
+    max_lexemes = None
+
+    #: Feature methods that add_many computes inline, unless a subclass overrides them.
+    _feature_methods = (
+        'normalized', 'lower', 'first', 'suffix', 'shape', 'length', 'upper_count', 'lower_count', 'digit_count',
+        'is_alpha', 'is_ascii', 'is_digit', 'is_lower', 'is_upper', 'is_title', 'is_punct', 'is_hyphenated', 'like_url',
+        'like_number'
+    )
+
     def __init__(self):
         """"""
         self.lexemes = {}
         self.clusters = {}
         self._loaded_clusters = False
+        self.max_lexemes = cache_limits.get('lexicon.%s' % self.__class__.__name__, self.max_lexemes)
 
     def __len__(self):
         """The current number of lexemes stored."""
@@ -103,6 +154,8 @@ class Lexicon(six.with_metaclass(Singleton)):
         """
         # logging.debug('Adding to lexicon: %s' % text)
         if text not in self.lexemes:
+            if self.max_lexemes is not None and len(self.lexemes) >= self.max_lexemes:
+                self.lexemes.clear()
             normalized = self.normalized(text)
             self.lexemes[text] = Lexeme(
                 text=text,
@@ -128,6 +181,55 @@ class Lexicon(six.with_metaclass(Singleton)):
                 cluster=self.cluster(normalized)
             )
 
+    def add_many(self, texts):
+        """Add many texts to the lexicon at once, for example all the tokens of a sentence.
+
+        The character-level features of each new text are computed in a single pass using a table of character classes
+        that is shared between all texts, which is faster than adding each text individually. If a subclass overrides
+        any of the feature methods, each text is added with :meth:`add` instead.
+
+        :param list[string] texts: The texts to add.
+        """
+        new = [text for text in dict.fromkeys(texts) if text not in self.lexemes]
+        if not new:
+            return
+        if self.max_lexemes is not None and len(self.lexemes) + len(new) > self.max_lexemes:
+            self.lexemes.clear()
+            # Texts over the limit aren't stored now, and are added one at a time if they are looked up
+            new = new[:self.max_lexemes]
+        cls = type(self)
+        for name in self._feature_methods:
+            if six.get_unbound_function(getattr(cls, name)) is not six.get_unbound_function(getattr(Lexicon, name)):
+                for text in new:
+                    self.add(text)
+                return
+        for text in new:
+            normalized = self.normalizer(text)
+            shape, upper_count, lower_count, digit_count, all_punct, all_ascii = _char_features(normalized)
+            self.lexemes[text] = Lexeme(
+                text=text,
+                normalized=normalized,
+                lower=normalized.lower(),
+                first=normalized[:1],
+                suffix=normalized[-3:],
+                shape=shape,
+                length=len(normalized),
+                upper_count=upper_count,
+                lower_count=lower_count,
+                digit_count=digit_count,
+                is_alpha=normalized.isalpha(),
+                is_ascii=all_ascii,
+                is_digit=normalized.isdigit(),
+                is_lower=normalized.islower(),
+                is_upper=normalized.isupper(),
+                is_title=normalized.istitle(),
+                is_punct=all_punct,
+                is_hyphenated='-' in normalized and not normalized == '-',
+                like_url=like_url(normalized),
+                like_number=like_number(normalized),
+                cluster=self.cluster(normalized)
+            )
+
     def __getitem__(self, text):
         """Return the requested lexeme from the Lexicon.
 
@@ -140,10 +242,20 @@ class Lexicon(six.with_metaclass(Singleton)):
 
     def cluster(self, text):
         """"""
-        if not self._loaded_clusters and self.clusters_path:
-            self.clusters = load_model(self.clusters_path)
-            self._loaded_clusters = True
-        return self.clusters.get(text, None)
+        if not self.clusters_path:
+            return self.clusters.get(text, None)
+        with model_cache.in_use(self):
+            if not self._loaded_clusters:
+                self.clusters = load_model(self.clusters_path, user=self)
+                self._loaded_clusters = True
+            return self.clusters.get(text, None)
+
+    def unload(self):
+        """Unload the clusters model. It is loaded again the next time it is needed."""
+        if self._loaded_clusters:
+            self.clusters = {}
+            self._loaded_clusters = False
+        model_cache.release(self)
 
     def normalized(self, text):
         """"""
@@ -17,12 +17,13 @@ import logging
 import pickle
 import random
 import re
+from timeit import default_timer
 
 import dawg
 import pycrfsuite
 import six
 
-from ..data import load_model, find_data
+from ..data import load_model, find_data, model_cache
 from .lexicon import Lexicon
 
 
@@ -217,20 +218,28 @@ class ApTagger(six.with_metaclass(ABCMeta, BaseTagger)):
 
     def tag(self, tokens):
         """Return a list of (token, tag) tuples for a given list of tokens."""
-        # Lazy load model first time we tag
-        if not self.classes:
-            self.load(self.model)
-        prev, prev2 = self.START
-        tags = []
-        for i, token in enumerate(tokens):
-            tag = self.tagdict.get(token)
-            if not tag:
-                features = self._get_features(i, tokens, prev, prev2)
-                tag = self.perceptron.predict(features)
-            tags.append((token, tag))
-            prev2 = prev
-            prev = tag
-        return tags
+        return self.tag_sents([tokens])[0]
+
+    def tag_sents(self, sentences):
+        """Return a list of (token, tag) tuples for each sentence, loading the model once for all of them."""
+        with model_cache.in_use(self):
+            # Lazy load model first time we tag
+            if not self.classes:
+                self.load(self.model)
+            tagged_sents = []
+            for tokens in sentences:
+                prev, prev2 = self.START
+                tags = []
+                for i, token in enumerate(tokens):
+                    tag = self.tagdict.get(token)
+                    if not tag:
+                        features = self._get_features(i, tokens, prev, prev2)
+                        tag = self.perceptron.predict(features)
+                    tags.append((token, tag))
+                    prev2 = prev
+                    prev = tag
+                tagged_sents.append(tags)
+            return tagged_sents
 
     def train(self, sentences, nr_iter=5):
         """Train a model from sentences.
@@ -266,9 +275,18 @@ class ApTagger(six.with_metaclass(ABCMeta, BaseTagger)):
 
     def load(self, model):
         """Load pickled model."""
-        self.perceptron.weights, self.tagdict, self.classes, self.clusters = load_model(model)
+        model_cache.release(self)
+        self.perceptron.weights, self.tagdict, self.classes, self.clusters = load_model(model, user=self)
         self.perceptron.classes = self.classes
 
+    def unload(self):
+        """Unload the model. It is loaded again the next time the tagger is used."""
+        self.perceptron.weights = {}
+        self.perceptron.classes = set()
+        self.tagdict = {}
+        self.classes = set()
+        model_cache.release(self)
+
     @abstractmethod
     def _get_features(self, i, context, prev, prev2):
         """Map tokens into a feature representation."""
@@ -319,18 +337,36 @@ class CrfTagger(BaseTagger):
 
     def load(self, model):
         log.debug('Loading %s' % model)
+        model_cache.release(self)
+        start = default_timer()
         self._tagger.open(find_data(model))
         self._loaded_model = True
+        model_cache.register(model, self, load_time=default_timer() - start)
+
+    def unload(self):
+        """Close the model. It is opened again the next time the tagger is used."""
+        if self._loaded_model:
+            self._tagger.close()
+            self._tagger = pycrfsuite.Tagger()
+            self._loaded_model = False
+        model_cache.release(self)
 
     def tag(self, tokens):
         """Return a list of ((token, tag), label) tuples for a given list of (token, tag) tuples."""
-        # Lazy load model first time we tag
-        if not self._loaded_model:
-            self.load(self.model)
-        features = [self._get_features(tokens, i) for i in range(len(tokens))]
-        labels = self._tagger.tag(features)
-        tagged_sent = list(zip(tokens, labels))
-        return tagged_sent
+        return self.tag_sents([tokens])[0]
+
+    def tag_sents(self, sentences):
+        """Return a list of ((token, tag), label) tuples for each sentence, opening the model once for all of them."""
+        with model_cache.in_use(self):
+            # Lazy load model first time we tag
+            if not self._loaded_model:
+                self.load(self.model)
+            tagged_sents = []
+            for tokens in sentences:
+                features = [self._get_features(tokens, i) for i in range(len(tokens))]
+                labels = self._tagger.tag(features)
+                tagged_sents.append(list(zip(tokens, labels)))
+            return tagged_sents
 
     def train(self, sentences, model):
         """Train the CRF tagger using CRFSuite.
@@ -373,13 +409,29 @@ class DictionaryTagger(BaseTagger):
         self.case_sensitive = case_sensitive if case_sensitive is not None else self.case_sensitive
         self.lexicon = lexicon if lexicon is not None else self.lexicon
         self._loaded_model = False
+        self._loaded_file = False
         if words is not None:
             self.build(words)
 
     def load(self, model):
         """Load pickled DAWG from disk."""
+        model_cache.release(self)
+        start = default_timer()
         self._dawg.load(find_data(model))
         self._loaded_model = True
+        self._loaded_file = True
+        model_cache.register(model, self, load_time=default_timer() - start)
+
+    def unload(self):
+        """Unload a DAWG that was loaded from disk. It is loaded again the next time the tagger is used.
+
+        A DAWG that was built from a list of words is kept, because it can't be loaded again.
+        """
+        if self._loaded_file:
+            self._dawg = dawg.CompletionDAWG()
+            self._loaded_model = False
+            self._loaded_file = False
+        model_cache.release(self)
 
     def save(self, path):
         """Save pickled DAWG to disk."""
@@ -390,6 +442,9 @@ class DictionaryTagger(BaseTagger):
         words = [self._normalize(tokens) for tokens in words]
         self._dawg = dawg.CompletionDAWG(words)
         self._loaded_model = True
+        if self._loaded_file:
+            self._loaded_file = False
+            model_cache.release(self)
 
     def _normalize(self, tokens):
         """Normalization transform to apply to both dictionary words and input tokens."""
@@ -400,8 +455,17 @@ class DictionaryTagger(BaseTagger):
 
     def tag(self, tokens):
         """Return a list of (token, tag) tuples for a given list of tokens."""
-        if not self._loaded_model:
-            self.load(self.model)
+        return self.tag_sents([tokens])[0]
+
+    def tag_sents(self, sentences):
+        """Return a list of (token, tag) tuples for each sentence, loading the DAWG once for all of them."""
+        with model_cache.in_use(self):
+            if not self._loaded_model:
+                self.load(self.model)
+            return [self._tag(tokens) for tokens in sentences]
+
+    def _tag(self, tokens):
+        """Tag the tokens of one sentence with the loaded DAWG."""
         tags = [None] * len(tokens)
         norm = self._normalize(tokens)
         length = len(norm)
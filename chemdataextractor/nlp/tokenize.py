@@ -18,7 +18,8 @@ import re
 import six
 
 from ..text import bracket_level, GREEK
-from ..data import load_model
+from ..data import load_model, model_cache
+from ..utils import BoundedCache
 
 
 log = logging.getLogger(__name__)
@@ -78,6 +79,40 @@ def regex_span_tokenize(s, regex):
     yield left, len(s)
 
 
+def _sequence_set(seqs):
+    """Compile a list of sequences into a set for fast membership tests."""
+    return frozenset(seqs)
+
+
+def _sequence_regex(seqs):
+    """Compile a list of sequences into a regular expression that matches wherever any of them occur."""
+    return re.compile('|'.join(re.escape(seq) for seq in seqs), re.U)
+
+
+def _suffix_table(seqs):
+    """Compile a list of sequences into a dict of the sequences that end with each character, in list order."""
+    table = {}
+    for seq in seqs:
+        table.setdefault(seq[-1:], []).append(seq)
+    return {char: tuple(group) for char, group in table.items()}
+
+
+def _prefix_table(seqs):
+    """Compile a list of sequences into a dict of the sequences that start with each character, in list order."""
+    table = {}
+    for seq in seqs:
+        table.setdefault(seq[:1], []).append(seq)
+    return {char: tuple(group) for char, group in table.items()}
+
+
+def _contraction_table(contractions):
+    """Compile a list of (word, index) contractions into a dict, keeping the first index for each word."""
+    table = {}
+    for word, index in contractions:
+        table.setdefault(word, index)
+    return table
+
+
 class SentenceTokenizer(BaseTokenizer):
     """Sentence tokenizer that uses the Punkt algorithm by Kiss & Strunk (2006)."""
 
@@ -92,13 +127,19 @@ class SentenceTokenizer(BaseTokenizer):
         """Return a list of integer offsets that identify sentences in the given text.
 
         :param string s: The text to tokenize into sentences.
-        :rtype: iter(tuple(int, int))
+        :rtype: list(tuple(int, int))
         """
-        if self._tokenizer is None:
-            self._tokenizer = load_model(self.model)
-        # for debug in tokenizer.debug_decisions(s):
-        #     log.debug(format_debug_decision(debug))
-        return self._tokenizer.span_tokenize(s)
+        with model_cache.in_use(self):
+            if self._tokenizer is None:
+                self._tokenizer = load_model(self.model, user=self)
+            # for debug in tokenizer.debug_decisions(s):
+            #     log.debug(format_debug_decision(debug))
+            return list(self._tokenizer.span_tokenize(s))
+
+    def unload(self):
+        """Unload the model. It is loaded again the next time it is needed."""
+        self._tokenizer = None
+        model_cache.release(self)
 
 
 class ChemSentenceTokenizer(SentenceTokenizer):
@@ -239,10 +280,87 @@ class WordTokenizer(BaseTokenizer):
     }
     #: Don't split around hyphens if only these characters before or after.
     NO_SPLIT_CHARS = '0123456789,\'"“”„‟‘’‚‛`´′″‴‵‶‷⁗'
+    #: Maximum number of whitespace-delimited chunks to cache the sub-spans of. None for unbounded, 0 to disable.
+    cache_size = 0
 
     def __init__(self, split_last_stop=True):
         #: Whether to split off the final full stop (unless preceded by NO_SPLIT_STOP). Default True.
         self.split_last_stop = split_last_stop
+        #: Cache of the sub-spans of each chunk, relative to the start of the chunk, keyed by ``_chunk_key``. It is
+        #: cleared automatically when a rule list is replaced, but must be cleared manually after any other change to
+        #: the rules.
+        self.chunk_cache = BoundedCache(maxsize=self.cache_size, name='word_tokenizer.chunk_cache')
+        self._rule_tables = {}
+
+    def _rules(self, name, compiler):
+        """Return a rule attribute compiled by the given function, recompiling it if the attribute is replaced."""
+        source = getattr(self, name)
+        key = (name, compiler)
+        compiled = self._rule_tables.get(key)
+        if compiled is None or compiled[0] is not source:
+            compiled = (source, compiler(source))
+            self._rule_tables[key] = compiled
+        return compiled[1]
+
+    def _check_rules(self):
+        """Clear the chunk cache if any compiled rule attribute has been replaced since it was compiled."""
+        stale = [key for key, compiled in self._rule_tables.items() if getattr(self, key[0]) is not compiled[0]]
+        if stale:
+            for key in stale:
+                del self._rule_tables[key]
+            self.chunk_cache.clear()
+
+    def _chunk_key(self, s, span, nextspan):
+        """Return the key to cache the sub-spans of a whitespace-delimited chunk under.
+
+        The key must include everything that ``_subspan`` uses to split the chunk. This is the chunk text and whether
+        the final full stop should be split off because it is the last chunk.
+        """
+        return s[span[0]:span[1]], self.split_last_stop and nextspan is None
+
+    def _is_split_sequence(self, text, lowertext):
+        """Return True if the text is a single split sequence or a sequence that is never split."""
+        return (text in self._rules('SPLIT', _sequence_set) or
+                text in self._rules('SPLIT_END_WORD', _sequence_set) or
+                text in self._rules('SPLIT_START_WORD', _sequence_set) or
+                lowertext in self._rules('NO_SPLIT', _sequence_set))
+
+    def _split_last_stop(self, text, span, nextspan):
+        """Return spans with the full stop split off the end of the final token, or None."""
+        # Allow certain characters to follow the full stop, but don't split ellipsis
+        if self.split_last_stop and nextspan is None and text not in self._rules('NO_SPLIT_STOP', _sequence_set) and not text[-3:] == '...':
+            if text[-1] == '.':
+                return self._split_span(span, -1)
+            ind = text.rfind('.')
+            if ind > -1 and all(t in '\'‘’"“”)]}' for t in text[ind + 1:]):
+                return self._split_span(span, ind, 1)
+
+    def _split_end_word(self, text, span):
+        """Return spans with a SPLIT_END_WORD sequence split off the end of a word, or None."""
+        for spl in self._rules('SPLIT_END_WORD', _suffix_table).get(text[-1], ()):
+            if text.endswith(spl) and len(text) > len(spl) and text[-len(spl) - 1].isalpha():
+                return self._split_span(span, -len(spl), 0)
+
+    def _split_start_word(self, text, span):
+        """Return spans with a SPLIT_START_WORD sequence split off the start of a word, or None."""
+        for spl in self._rules('SPLIT_START_WORD', _prefix_table).get(text[0], ()):
+            if text.startswith(spl) and len(text) > len(spl) and text[-len(spl) - 1].isalpha():
+                return self._split_span(span, len(spl), 0)
+
+    def _split_around(self, text, span):
+        """Return spans split around the first SPLIT sequence that occurs in the text, or None."""
+        # The regular expression quickly rules out text that contains none of the sequences
+        if self._rules('SPLIT', _sequence_regex).search(text):
+            for spl in self.SPLIT:
+                ind = text.find(spl)
+                if ind > -1:
+                    return self._split_span(span, ind, len(spl))
+
+    def _split_contraction(self, lowertext, span):
+        """Return spans split at the specified index if the text is a contraction, or None."""
+        index = self._rules('CONTRACTIONS', _contraction_table).get(lowertext)
+        if index is not None:
+            return self._split_span(span, index)
 
     def _split_span(self, span, index, length=0):
         """Split a span into two or three separate spans at certain indices."""
@@ -256,7 +374,7 @@ class WordTokenizer(BaseTokenizer):
         lowertext = text.lower()
 
         # Skip if only a single character or a split sequence
-        if span[1] - span[0] < 2 or text in self.SPLIT or text in self.SPLIT_END_WORD or text in self.SPLIT_START_WORD or lowertext in self.NO_SPLIT:
+        if span[1] - span[0] < 2 or self._is_split_sequence(text, lowertext):
             return [span]
 
         # Skip if it looks like URL
@@ -264,53 +382,51 @@ class WordTokenizer(BaseTokenizer):
             return [span]
 
         # Split full stop at end of final token (allow certain characters to follow) unless ellipsis
-        if self.split_last_stop and nextspan is None and text not in self.NO_SPLIT_STOP and not text[-3:] == '...':
-            if text[-1] == '.':
-                return self._split_span(span, -1)
-            ind = text.rfind('.')
-            if ind > -1 and all(t in '\'‘’"“”)]}' for t in text[ind + 1:]):
-                return self._split_span(span, ind, 1)
+        split = self._split_last_stop(text, span, nextspan)
+        if split:
+            return split
 
         # Split off certain sequences at the end of a word
-        for spl in self.SPLIT_END_WORD:
-            if text.endswith(spl) and len(text) > len(spl) and text[-len(spl) - 1].isalpha():
-                return self._split_span(span, -len(spl), 0)
+        split = self._split_end_word(text, span)
+        if split:
+            return split
 
         # Split off certain sequences at the start of a word
-        for spl in self.SPLIT_START_WORD:
-            if text.startswith(spl) and len(text) > len(spl) and text[-len(spl) - 1].isalpha():
-                return self._split_span(span, len(spl), 0)
+        split = self._split_start_word(text, span)
+        if split:
+            return split
 
         # Split around certain sequences
-        for spl in self.SPLIT:
-            ind = text.find(spl)
-            if ind > -1:
-                return self._split_span(span, ind, len(spl))
+        split = self._split_around(text, span)
+        if split:
+            return split
 
         # Split around certain sequences unless followed by a digit
-        for spl in self.SPLIT_NO_DIGIT:
-            ind = text.rfind(spl)
-            if ind > -1 and (len(text) <= ind + len(spl) or not text[ind + len(spl)].isdigit()):
-                return self._split_span(span, ind, len(spl))
+        if self._rules('SPLIT_NO_DIGIT', _sequence_regex).search(text):
+            for spl in self.SPLIT_NO_DIGIT:
+                ind = text.rfind(spl)
+                if ind > -1 and (len(text) <= ind + len(spl) or not text[ind + len(spl)].isdigit()):
+                    return self._split_span(span, ind, len(spl))
 
         # Characters to split around, but with exceptions
-        for i, char in enumerate(text):
-            if char == '-':
-                before = lowertext[:i]
-                after = lowertext[i+1:]
-                # By default we split on hyphens
-                split = True
-                if before in self.NO_SPLIT_PREFIX or after in self.NO_SPLIT_SUFFIX:
-                    split = False  # Don't split if prefix or suffix in list
-                elif not before.strip(self.NO_SPLIT_CHARS) or not after.strip(self.NO_SPLIT_CHARS):
-                    split = False  # Don't split if prefix or suffix entirely consist of certain characters
-                if split:
-                    return self._split_span(span, i, 1)
+        i = text.find('-')
+        while i > -1:
+            before = lowertext[:i]
+            after = lowertext[i+1:]
+            # By default we split on hyphens
+            split = True
+            if before in self.NO_SPLIT_PREFIX or after in self.NO_SPLIT_SUFFIX:
+                split = False  # Don't split if prefix or suffix in list
+            elif not before.strip(self.NO_SPLIT_CHARS) or not after.strip(self.NO_SPLIT_CHARS):
+                split = False  # Don't split if prefix or suffix entirely consist of certain characters
+            if split:
+                return self._split_span(span, i, 1)
+            i = text.find('-', i + 1)
 
         # Split contraction words
-        for contraction in self.CONTRACTIONS:
-            if lowertext == contraction[0]:
-                return self._split_span(span, contraction[1])
+        split = self._split_contraction(lowertext, span)
+        if split:
+            return split
         return [span]
 
     def span_tokenize(self, s):
@@ -318,13 +434,40 @@ class WordTokenizer(BaseTokenizer):
         # First get spans by splitting on all whitespace
         # Includes: \u0020 \u00A0 \u1680 \u180E \u2000 \u2001 \u2002 \u2003 \u2004 \u2005 \u2006 \u2007 \u2008 \u2009 \u200A \u202F \u205F \u3000
         spans = [(left, right) for left, right in regex_span_tokenize(s, '\s+') if not left == right]
-        i = 0
-        # Recursively split spans according to rules
-        while i < len(spans):
-            subspans = self._subspan(s, spans[i], spans[i + 1] if i + 1 < len(spans) else None)
-            spans[i:i+1] = [subspan for subspan in subspans if subspan[1] - subspan[0] > 0]
+        if self.chunk_cache.maxsize == 0:
+            return self._split_spans(s, spans)
+        self._check_rules()
+        tokens = []
+        for i, span in enumerate(spans):
+            nextspan = spans[i + 1] if i + 1 < len(spans) else None
+            key = self._chunk_key(s, span, nextspan)
+            subspans = self.chunk_cache.get(key)
+            if subspans is None:
+                subspans = tuple((start - span[0], end - span[0]) for start, end in self._split_spans(s, [span], nextspan))
+                self.chunk_cache[key] = subspans
+            tokens.extend((span[0] + start, span[0] + end) for start, end in subspans)
+        return tokens
+
+    def _split_spans(self, s, spans, nextspan=None):
+        """Recursively split spans according to rules.
+
+        :param string s: The sentence string.
+        :param list(tuple(int, int)) spans: The spans to split.
+        :param tuple(int, int) nextspan: The span that follows the last span, or None if it is the end of the sentence.
+        :rtype: list(tuple(int, int))
+        """
+        # Spans still to be split are kept in reverse order on a stack, so the next span is always at the end and
+        # splitting a span never moves the spans after it
+        pending = spans[::-1]
+        spans = []
+        while pending:
+            span = pending.pop()
+            subspans = self._subspan(s, span, pending[-1] if pending else nextspan)
+            nonempty = [subspan for subspan in subspans if subspan[1] - subspan[0] > 0]
             if len(subspans) == 1:
-                i += 1
+                spans.extend(nonempty)
+            else:
+                pending.extend(reversed(nonempty))
         return spans
 
 
@@ -441,6 +584,10 @@ class ChemWordTokenizer(WordTokenizer):
     SPLIT_END_NO_DIGIT = ['(aq)', '(aq.)', '(s)', '(l)', '(g)']
     #: Don't split around slash when both preceded and followed by these characters
     NO_SPLIT_SLASH = ['+', '-', '−']
+    #: Regular expression that matches a number followed by a bracketed peak strength/shape, e.g. 1650(br)
+    PEAK_SHAPE_RE = re.compile('^(\d+\.\d+|\d{3,})(\([a-z]+\))$', re.I)
+    #: Regular expression that matches the characters that are split around with exceptions
+    SPLIT_CHARS_RE = re.compile('[:;x+−±/>→(-]')
     #: Regular expression that matches a numeric quantity with units
     QUANTITY_RE = re.compile(r'^((\d\d\d)g|([-−]?\d+\.\d+|10[-−]\d+)(g|s|m|N|V)([-−]?[1-4])?|(\d*[-−]?\d+\.?\d*)([pnµμm]A|[µμmk]g|[kM]J|m[lL]|[nµμm]?M|[nµμmc]m|kN|[mk]V|[mkMG]?W|[mnpμµ]s|Hz|[Mm][Oo][Ll](e|ar)?s?|k?Pa|ppm|min)([-−]?[1-4])?)$')
     #: Don't split on hyphen if the prefix matches this regular expression
@@ -531,6 +678,8 @@ class ChemWordTokenizer(WordTokenizer):
         'turn', 'type', 'unesterified', 'untreated', 'vacancies', 'vacancy', 'variable', 'water', 'yeast', 'yield',
         'zwitterion'
     }
+    #: Maximum number of whitespace-delimited chunks to cache the sub-spans of. None for unbounded, 0 to disable.
+    cache_size = 20000
 
     def _closing_bracket_index(self, text, bpair=('(', ')')):
         """Return the index of the closing bracket that matches the opening bracket at the start of the text."""
@@ -554,6 +703,12 @@ class ChemWordTokenizer(WordTokenizer):
             if level == 0:
                 return len(text) - i - 2
 
+    def _chunk_key(self, s, span, nextspan):
+        """"""
+        # The NMR isotope rule also depends on whether the next chunk is NMR
+        key = super(ChemWordTokenizer, self)._chunk_key(s, span, nextspan)
+        return key + (nextspan is not None and s[nextspan[0]:nextspan[1]] == 'NMR',)
+
     def _is_number(self, text):
         """Return True if the text is a number."""
         try:
@@ -576,7 +731,7 @@ class ChemWordTokenizer(WordTokenizer):
         lowertext = text.lower()
 
         # Skip if only a single character or a split sequence
-        if span[1] - span[0] < 2 or text in self.SPLIT or text in self.SPLIT_END_WORD or text in self.SPLIT_START_WORD or lowertext in self.NO_SPLIT:
+        if span[1] - span[0] < 2 or self._is_split_sequence(text, lowertext):
             return [span]
 
         # Skip if it looks like URL
@@ -584,33 +739,29 @@ class ChemWordTokenizer(WordTokenizer):
             return [span]
 
         # Split full stop at end of final token (allow certain characters to follow) unless ellipsis
-        if self.split_last_stop and nextspan is None and text not in self.NO_SPLIT_STOP and not text[-3:] == '...':
-            if text[-1] == '.':
-                return self._split_span(span, -1)
-            ind = text.rfind('.')
-            if ind > -1 and all(t in '\'‘’"“”)]}' for t in text[ind + 1:]):
-                return self._split_span(span, ind, 1)
+        split = self._split_last_stop(text, span, nextspan)
+        if split:
+            return split
 
         # Split off certain sequences at the end of a token
-        for spl in self.SPLIT_END:
+        for spl in self._rules('SPLIT_END', _suffix_table).get(text[-1], ()):
             if text.endswith(spl) and len(text) > len(spl):
                 return self._split_span(span, -len(spl), 0)
 
         # Split off certain sequences at the end of a word
-        for spl in self.SPLIT_END_WORD:
-            if text.endswith(spl) and len(text) > len(spl) and text[-len(spl) - 1].isalpha():
-                return self._split_span(span, -len(spl), 0)
+        split = self._split_end_word(text, span)
+        if split:
+            return split
 
-        # Split off certain sequences at the end of a word
-        for spl in self.SPLIT_START_WORD:
-            if text.startswith(spl) and len(text) > len(spl) and text[-len(spl) - 1].isalpha():
-                return self._split_span(span, len(spl), 0)
+        # Split off certain sequences at the start of a word
+        split = self._split_start_word(text, span)
+        if split:
+            return split
 
         # Split around certain sequences
-        for spl in self.SPLIT:
-            ind = text.find(spl)
-            if ind > -1:
-                return self._split_span(span, ind, len(spl))
+        split = self._split_around(text, span)
+        if split:
+            return split
 
         # Split around certain sequences unless followed by a digit
         # - We skip this because of difficulty with chemical names.
@@ -620,7 +771,7 @@ class ChemWordTokenizer(WordTokenizer):
         #         return self._split_span(span, ind, len(spl))
 
         # Split off certain sequences at the end of a token unless preceded by a digit
-        for spl in self.SPLIT_END_NO_DIGIT:
+        for spl in self._rules('SPLIT_END_NO_DIGIT', _suffix_table).get(text[-1], ()):
             if text.endswith(spl) and len(text) > len(spl) and not text[-len(spl) - 1].isdigit():
                 return self._split_span(span, -len(spl), 0)
 
@@ -633,7 +784,7 @@ class ChemWordTokenizer(WordTokenizer):
             return self._split_span(span, 2, 1)
 
         # Split things like \d+\.\d+([a-z]+) e.g. UV-vis/IR peaks with bracketed strength/shape
-        m = re.match('^(\d+\.\d+|\d{3,})(\([a-z]+\))$', text, re.I)
+        m = self.PEAK_SHAPE_RE.match(text)
         if m:
             return self._split_span(span, m.start(2), 1)
 
@@ -650,7 +801,9 @@ class ChemWordTokenizer(WordTokenizer):
         # TODO: Consider splitting around comma in limited circumstances. Mainly to fix whitespace errors.
 
         # Characters to split around, but with exceptions
-        for i, char in enumerate(text):
+        for m in self.SPLIT_CHARS_RE.finditer(text):
+            i = m.start()
+            char = text[i]
             before = text[:i]
             after = text[i+1:]
             if char in {':', ';'}:
@@ -750,9 +903,9 @@ class ChemWordTokenizer(WordTokenizer):
             return self._split_span(span, 2, 0)
 
         # Split contraction words
-        for contraction in self.CONTRACTIONS:
-            if lowertext == contraction[0]:
-                return self._split_span(span, contraction[1])
+        split = self._split_contraction(lowertext, span)
+        if split:
+            return split
 
         if nextspan:
             nexttext = s[nextspan[0]:nextspan[1]]
@@ -878,17 +1031,21 @@ class FineWordTokenizer(WordTokenizer):
     NO_SPLIT_PREFIX = {}
     #: Don't split around hyphens with these suffixes.
     NO_SPLIT_SUFFIX = {}
+    #: Maximum number of whitespace-delimited chunks to cache the sub-spans of. None for unbounded, 0 to disable.
+    cache_size = 20000
+
+    #: Regular expression that matches boundaries between greek and non-greek characters
+    GREEK_BOUNDARY_RE = re.compile('(?<=[{0}])(?=[^{0}])|(?<=[^{0}])(?=[{0}])'.format(
+        ''.join(re.escape(char) for char in sorted(GREEK))), re.U)
 
     def _subspan(self, s, span, nextspan):
         """Recursively subdivide spans based on a series of rules."""
 
         # Split on boundaries between greek and non-greek
         text = s[span[0]:span[1]]
-        for i, char in enumerate(text):
-            if i < len(text) - 1:
-                nextchar = text[i + 1]
-                if (char in GREEK and nextchar not in GREEK) or (char not in GREEK and nextchar in GREEK):
-                    return [(span[0], span[0] + i + 1), (span[0] + i + 1, span[1])]
+        m = self.GREEK_BOUNDARY_RE.search(text)
+        if m:
+            return [(span[0], span[0] + m.start()), (span[0] + m.start(), span[1])]
 
         # Perform all normal WordTokenizer splits
         return super(FineWordTokenizer, self)._subspan(s,span, nextspan)
@@ -251,7 +251,7 @@ class SolventInHeadingParser(BaseParser):
             c.fluorescence_lifetimes = [FluorescenceLifetime(**context)]
             c.electrochemical_potentials = [ElectrochemicalPotential(**context)]
             c.uvvis_spectra = [UvvisSpectrum(**context)]
-        if c.serialize():
+        if not c.is_empty():
             yield c
 
 
@@ -289,7 +289,7 @@ class SolventCellParser(BaseParser):
             c.fluorescence_lifetimes = [FluorescenceLifetime(**context)]
             c.electrochemical_potentials = [ElectrochemicalPotential(**context)]
             c.uvvis_spectra = [UvvisSpectrum(**context)]
-        if c.serialize():
+        if not c.is_empty():
             yield c
 
 
@@ -702,6 +702,6 @@ class CaptionContextParser(BaseParser):
             c.fluorescence_lifetimes = [FluorescenceLifetime(**context)]
             c.electrochemical_potentials = [ElectrochemicalPotential(**context)]
             c.uvvis_spectra = [UvvisSpectrum(**context)]
-        if c.serialize():
+        if not c.is_empty():
             # print(c.to_primitive())
             yield c
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+chemdataextractor.profiler
+~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Measure the time spent in each stage of the document processing pipeline.
+
+Usage::
+
+    with Profiler() as profiler:
+        doc = Document.from_file('paper.html')
+        records = doc.records
+    print(profiler.report())
+
+Profiling is off unless a :class:`Profiler` is running. When it is off, each pipeline stage costs one function call.
+A Profiler only times the stages that run in the thread that started it.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from collections import OrderedDict
+import json
+import threading
+from timeit import default_timer
+
+
+#: The ``active`` attribute is the running Profiler of the current thread, or None if profiling is off.
+_local = threading.local()
+
+
+class _NullStage(object):
+    """Stage returned when profiling is off. Does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def count(self, items):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage(object):
+    """Time one run of a pipeline stage and add it to the stats of a Profiler."""
+
+    __slots__ = ('profiler', 'name', 'items', 'start', 'child_time')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.items = 0
+        self.start = None
+        self.child_time = 0.0
+
+    def __enter__(self):
+        self.profiler._stack.append(self)
+        self.start = default_timer()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        elapsed = default_timer() - self.start
+        stack = self.profiler._stack
+        stack.pop()
+        # Time spent in this stage doesn't count towards the self time of the stage it was run from
+        if stack:
+            stack[-1].child_time += elapsed
+        stats = self.profiler.stages.get(self.name)
+        if stats is None:
+            stats = self.profiler.stages[self.name] = StageStats()
+        stats.calls += 1
+        stats.items += self.items
+        stats.time += elapsed
+        stats.self_time += elapsed - self.child_time
+
+    def count(self, items):
+        """Add to the number of items processed in this run of the stage."""
+        self.items += items
+
+
+def stage(name, obj=None):
+    """Return a context manager that times a pipeline stage if a Profiler is running.
+
+    Usage::
+
+        with stage('word_tokenizer') as s:
+            spans = tokenizer.span_tokenize(text)
+            s.count(len(spans))
+
+    :param string name: Name of the stage.
+    :param obj: (Optional) Object that runs the stage. Its class name is appended to the stage name, so each class of
+                parser or tagger is timed separately.
+    """
+    active = getattr(_local, 'active', None)
+    if active is None:
+        return _NULL_STAGE
+    if obj is not None:
+        name = '%s.%s' % (name, obj.__class__.__name__)
+    return _Stage(active, name)
+
+
+class StageStats(object):
+    """Statistics for one pipeline stage."""
+
+    __slots__ = ('calls', 'items', 'time', 'self_time')
+
+    def __init__(self):
+        #: Number of times the stage was run.
+        self.calls = 0
+        #: Number of items (e.g. sentences, tokens, records) processed by the stage.
+        self.items = 0
+        #: Wall time in seconds, including the time spent in stages run from within this stage.
+        self.time = 0.0
+        #: Wall time in seconds, excluding the time spent in stages run from within this stage.
+        self.self_time = 0.0
+
+    def __repr__(self):
+        return '<StageStats: %s calls, %s items, %.6fs>' % (self.calls, self.items, self.time)
+
+    def serialize(self):
+        """Convert StageStats to python dictionary."""
+        return {'calls': self.calls, 'items': self.items, 'time': self.time, 'self_time': self.self_time}
+
+
+class Profiler(object):
+    """Collect the wall time, call count and item count of each pipeline stage while it is running.
+
+    Stages are timed for all documents processed while the profiler is running. Results of many stages are memoized on
+    document elements, so stages that have already run for a document before the profiler was started are not timed
+    again. Profilers can be nested, in which case stages are only counted by the innermost one. Stages run in other
+    threads are not timed.
+    """
+
+    def __init__(self):
+        #: Dictionary of stage name to :class:`StageStats`, in the order the stages first finished.
+        self.stages = OrderedDict()
+        #: Wall time in seconds that the profiler has been running.
+        self.total_time = 0.0
+        self._stack = []
+        self._previous = None
+        self._start = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def running(self):
+        """Whether the profiler is running."""
+        return self._start is not None
+
+    def start(self):
+        """Start timing pipeline stages."""
+        if self.running:
+            raise RuntimeError('Profiler is already running')
+        self._previous = getattr(_local, 'active', None)
+        _local.active = self
+        self._start = default_timer()
+
+    def stop(self):
+        """Stop timing pipeline stages."""
+        if not self.running:
+            raise RuntimeError('Profiler is not running')
+        self.total_time += default_timer() - self._start
+        self._start = None
+        _local.active = self._previous
+        self._previous = None
+
+    def serialize(self):
+        """Convert Profiler results to python dictionary."""
+        return {
+            'total_time': self.total_time,
+            'stages': OrderedDict((name, stats.serialize()) for name, stats in self.stages.items()),
+        }
+
+    def to_json(self, *args, **kwargs):
+        """Convert Profiler results to JSON string."""
+        return json.dumps(self.serialize(), *args, **kwargs)
+
+    def report(self):
+        """Return a table of the stages, with the stages that took the most self time first."""
+        lines = ['%-40s %8s %10s %10s %10s %7s' % ('stage', 'calls', 'items', 'time (s)', 'self (s)', 'self %')]
+        for name, stats in sorted(self.stages.items(), key=lambda item: -item[1].self_time):
+            percent = 100 * stats.self_time / self.total_time if self.total_time else 0.0
+            lines.append('%-40s %8d %10d %10.3f %10.3f %7.1f' % (
+                name, stats.calls, stats.items, stats.time, stats.self_time, percent
+            ))
+        lines.append('%-40s %8s %10s %10.3f' % ('total', '', '', self.total_time))
+        return '\n'.join(lines)
@@ -23,7 +23,9 @@ class BaseReader(six.with_metaclass(ABCMeta)):
         """Quickly check if this reader can parse the input. Reader subclasses should override this.
 
         Used to quickly skip attempting to parse when trying different readers. If in doubt, return True, and then
-        raise ReaderError in the parse method if it fails.
+        raise ReaderError in the parse method if it fails. When called from ``Document.from_string``, fstring is only
+        the first ``SNIFF_SIZE`` bytes of the file (see :mod:`chemdataextractor.doc.document`), so detection should
+        rely on signatures near the start of the file.
         """
         return True
 
@@ -39,3 +41,15 @@ class BaseReader(six.with_metaclass(ABCMeta)):
     def readstring(self, fstring):
         """Read a file string and return a Document."""
         return self.parse(fstring)
+
+    def readshared(self, fstring, shared):
+        """Read a file string and return a Document, reusing work done by other readers that tried the same input.
+
+        Readers that can share an intermediate representation of the input (such as a parsed tree) should store it in
+        the shared dict, so the next reader that needs it doesn't have to create it again. A reader that raises
+        ReaderError after modifying a shared value must remove it from the shared dict first.
+
+        :param bytes fstring: The contents of the file.
+        :param dict shared: Values shared between the readers that are tried on this input.
+        """
+        return self.readstring(fstring)
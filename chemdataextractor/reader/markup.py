@@ -21,7 +21,8 @@ from lxml.html import HTMLParser
 import six
 
 from ..errors import ReaderError
-from ..doc.document import Document
+from ..profiler import stage
+from ..doc.document import Document, SNIFF_SIZE
 from ..doc.text import Title, Heading, Paragraph, Caption, Citation, Footnote, Text, Sentence
 from ..doc.table import Table, Cell
 from ..doc.figure import Figure
@@ -29,12 +30,17 @@ from ..scrape import INLINE_ELEMENTS
 from ..scrape.clean import clean
 from ..scrape.csstranslator import CssHTMLTranslator
 from ..text import get_encoding
+from ..utils import BoundedCache
 from .base import BaseReader
 
 
 log = logging.getLogger(__name__)
 
 
+#: Compiled XPath expressions, keyed by (reader class, CSS selector) for CSS selectors and by expression for XPath.
+compiled_selectors = BoundedCache(maxsize=5000, name='reader.compiled_selectors')
+
+
 class LxmlReader(six.with_metaclass(ABCMeta, BaseReader)):
     """Abstract base class for lxml-based readers."""
 
@@ -180,15 +186,36 @@ class LxmlReader(six.with_metaclass(ABCMeta, BaseReader)):
         tab = Table(caption, headings=hrows, rows=rows, footnotes=footnotes, id=el.get('id', None))
         return [tab]
 
+    @staticmethod
+    def _compile_xpath(query):
+        """Return a compiled XPath for an XPath expression string, compiling it only once per process."""
+        xpath = compiled_selectors.get(query)
+        if xpath is None:
+            xpath = etree.XPath(query, smart_strings=False)
+            compiled_selectors[query] = xpath
+        return xpath
+
+    @classmethod
+    def _compile_css(cls, query):
+        """Return a compiled XPath for a CSS selector, compiling it only once per process for each reader class."""
+        key = (cls, query)
+        xpath = compiled_selectors.get(key)
+        if xpath is None:
+            xpath = etree.XPath(CssHTMLTranslator().css_to_xpath(query), smart_strings=False)
+            compiled_selectors[key] = xpath
+        return xpath
+
     def _xpath(self, query, root):
-        result = root.xpath(query, smart_strings=False)
+        if isinstance(query, six.string_types):
+            query = self._compile_xpath(query)
+        result = query(root)
         if type(result) is not list:
             result = [result]
-        log.debug('Selecting XPath: {}: {}'.format(query, result))
+        log.debug('Selecting XPath: %s: %s', query.path, result)
         return result
 
     def _css(self, query, root):
-        return self._xpath(CssHTMLTranslator().css_to_xpath(query), root)
+        return self._xpath(self._compile_css(query), root)
 
     def _is_inline(self, element):
         """Return True if an element is inline."""
@@ -202,12 +229,48 @@ class LxmlReader(six.with_metaclass(ABCMeta, BaseReader)):
         pass
 
     def parse(self, fstring):
-        root = self._make_tree(fstring)
-        if root is None:
-            raise ReaderError
-        root = self._css(self.root_css, root)[0]
-        for cleaner in self.cleaners:
-            cleaner(root)
+        return self.parse_tree(self._make_tree(fstring))
+
+    def readshared(self, fstring, shared):
+        """Read a file string, reusing a tree already parsed by another reader with the same _make_tree method."""
+        # Subclasses that customize parsing of the raw string can't use a tree parsed by another reader
+        cls = type(self)
+        if (six.get_unbound_function(cls.parse) is not six.get_unbound_function(LxmlReader.parse) or
+                six.get_unbound_function(cls.readstring) is not six.get_unbound_function(BaseReader.readstring)):
+            return super(LxmlReader, self).readshared(fstring, shared)
+        key = six.get_unbound_function(type(self)._make_tree)
+        if key not in shared:
+            shared[key] = self._make_tree(fstring)
+        root = self._find_root(shared[key])
+        try:
+            return self._parse_root(root)
+        except ReaderError:
+            # The cleaners have changed the tree, so the next reader must parse its own
+            del shared[key]
+            raise
+
+    def parse_tree(self, tree):
+        """Parse an lxml element tree and return a Document."""
+        return self._parse_root(self._find_root(tree))
+
+    def _find_root(self, tree):
+        """Return the root element of the document in a tree.
+
+        Raises ReaderError without changing the tree if this reader can't find its root element, so the tree can then be
+        passed to another reader.
+        """
+        if tree is None:
+            raise ReaderError('Unable to parse tree')
+        roots = self._css(self.root_css, tree)
+        if not roots:
+            raise ReaderError('No root element matching %s' % self.root_css)
+        return roots[0]
+
+    def _parse_root(self, root):
+        """Clean the root element of a document and return a Document. The element is changed in place."""
+        with stage('cleaner'):
+            for cleaner in self.cleaners:
+                cleaner(root)
         specials = {}
         refs = defaultdict(list)
         titles = self._css(self.title_css, root)
@@ -245,7 +308,7 @@ class XmlReader(LxmlReader):
         return True
 
     def _make_tree(self, fstring):
-        root = etree.fromstring(fstring, parser=XMLParser(recover=True, encoding=get_encoding(fstring)))
+        root = etree.fromstring(fstring, parser=XMLParser(recover=True, encoding=get_encoding(fstring, max_bytes=SNIFF_SIZE)))
         return root
 
 
@@ -259,5 +322,5 @@ class HtmlReader(LxmlReader):
         return True
 
     def _make_tree(self, fstring):
-        root = etree.fromstring(fstring, parser=HTMLParser(encoding=get_encoding(fstring)))
+        root = etree.fromstring(fstring, parser=HTMLParser(encoding=get_encoding(fstring, max_bytes=SNIFF_SIZE)))
         return root
@@ -11,6 +11,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
+import itertools
+import multiprocessing
 
 from pdfminer.converter import PDFPageAggregator
 from pdfminer.layout import LAParams, LTTextLine, LTTextBox, LTFigure
@@ -26,8 +28,51 @@ from .base import BaseReader
 from ..errors import ReaderError
 
 
+#: Reader and list of pages for the layout analysis worker processes of a PdfReader.
+_worker_input = None
+
+
+def _init_worker(reader, fstring):
+    """Open the file in a worker process and list its pages, so each chunk can go straight to its pages."""
+    global _worker_input
+    _worker_input = (reader, list(PDFPage.create_pages(reader._open(fstring))))
+
+
+def _process_chunk(pagenos):
+    """Run layout analysis on a chunk of pages in a worker process.
+
+    Elements are returned as (class, text) pairs, because elements hold references to taggers that can't be pickled.
+    """
+    reader, pages = _worker_input
+    return [
+        (pageno, [(el.__class__, el.text) for el in elements])
+        for pageno, elements in reader._analyse_pages((pageno, pages[pageno]) for pageno in sorted(pagenos))
+    ]
+
+
 class PdfReader(BaseReader):
-    """"""
+    """Reader for PDF documents, using pdfminer layout analysis to group text into paragraphs.
+
+    Usage::
+
+        reader = PdfReader(pages=range(10), processes=4)
+        for pageno, elements in reader.iter_pages(fstring):
+            print(pageno, elements)
+    """
+
+    def __init__(self, pages=None, processes=None, chunksize=4):
+        """
+
+        :param list[int] pages: (Optional) The pages to read, counting from 0. Default is all pages.
+        :param int processes: (Optional) Number of worker processes to run layout analysis in. Default is to run it in
+                              this process. The file contents are copied to each worker, and each worker parses the
+                              page tree of the file once when it starts, so workers only pay off for long documents.
+        :param int chunksize: Number of pages to send to a worker process at a time. Smaller chunks spread the pages
+                              more evenly between workers, but add more overhead per page.
+        """
+        self.pages = pages
+        self.processes = processes
+        self.chunksize = chunksize
 
     def detect(self, fstring, fname=None):
         """"""
@@ -47,22 +92,65 @@ class PdfReader(BaseReader):
                 elements.extend(self._process_layout(lt_obj))
         return elements
 
+    def _open(self, fstring):
+        """Return a pdfminer PDFDocument for the file contents."""
+        document = PDFDocument(PDFParser(six.BytesIO(fstring)))
+        if not document.is_extractable:
+            raise ReaderError('PDF text extraction not allowed')
+        return document
+
+    def _iter_page_elements(self, fstring, pagenos=None):
+        """Run layout analysis on each page in pagenos (or all pages) in this process, yielding (page number, elements)."""
+        if pagenos is not None and not pagenos:
+            return
+        pages = enumerate(PDFPage.create_pages(self._open(fstring)))
+        if pagenos is not None:
+            last = max(pagenos)
+            pages = ((pageno, page) for pageno, page in itertools.takewhile(lambda p: p[0] <= last, pages)
+                     if pageno in pagenos)
+        for page in self._analyse_pages(pages):
+            yield page
+
+    def _analyse_pages(self, pages):
+        """Run layout analysis on each of an iterable of (page number, PDFPage), yielding (page number, elements)."""
+        rsrcmgr = PDFResourceManager()
+        laparams = LAParams()
+        device = PDFPageAggregator(rsrcmgr, laparams=laparams)
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        for pageno, page in pages:
+            interpreter.process_page(page)
+            yield pageno, self._process_layout(device.get_result())
+
+    def iter_pages(self, fstring):
+        """Iterate (page number, elements) for each selected page in order, as soon as layout analysis of it finishes.
+
+        :param bytes fstring: The contents of a PDF file.
+        """
+        pagenos = set(self.pages) if self.pages is not None else None
+        if not self.processes or self.processes <= 1:
+            for page in self._iter_page_elements(fstring, pagenos):
+                yield page
+            return
+        if not isinstance(fstring, six.binary_type):
+            # Buffers such as memory-mapped files can't be sent to worker processes
+            fstring = memoryview(fstring).tobytes()
+        pagecount = sum(1 for _ in PDFPage.create_pages(self._open(fstring)))
+        selected = [i for i in range(pagecount) if pagenos is None or i in pagenos]
+        chunks = [set(selected[i:i + self.chunksize]) for i in range(0, len(selected), self.chunksize)]
+        pool = multiprocessing.Pool(self.processes, initializer=_init_worker, initargs=(self, fstring))
+        try:
+            # imap returns chunks in order, so pages are merged back in order as they finish
+            for chunk in pool.imap(_process_chunk, chunks):
+                for pageno, elements in chunk:
+                    yield pageno, [element_cls(text) for element_cls, text in elements]
+        finally:
+            pool.terminate()
+
     def parse(self, fstring):
         try:
-            f = six.BytesIO(fstring)
-            parser = PDFParser(f)
-            document = PDFDocument(parser)
-            if not document.is_extractable:
-                raise ReaderError('PDF text extraction not allowed')
-            rsrcmgr = PDFResourceManager()
-            laparams = LAParams()
-            device = PDFPageAggregator(rsrcmgr, laparams=laparams)
-            interpreter = PDFPageInterpreter(rsrcmgr, device)
             elements = []
-            for page in PDFPage.create_pages(document):
-                interpreter.process_page(page)
-                layout = device.get_result()
-                elements.extend(self._process_layout(layout))
+            for pageno, page_elements in self.iter_pages(fstring):
+                elements.extend(page_elements)
             return Document(*elements)
         except Exception as e:
             raise ReaderError(e)
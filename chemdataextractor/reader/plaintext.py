@@ -15,7 +15,7 @@ import re
 
 import six
 
-from ..doc.document import Document
+from ..doc.document import Document, SNIFF_SIZE
 from .base import BaseReader
 from ..text import get_encoding
 
@@ -32,7 +32,10 @@ class PlainTextReader(BaseReader):
         return True
 
     def parse(self, fstring):
-        if isinstance(fstring, six.binary_type):
-            fstring = fstring.decode(get_encoding(fstring))
+        if not isinstance(fstring, six.text_type):
+            encoding = get_encoding(fstring, max_bytes=SNIFF_SIZE)
+            if not isinstance(fstring, six.binary_type):
+                fstring = memoryview(fstring).tobytes()
+            fstring = fstring.decode(encoding)
         para_strings = [p.strip() for p in re.split(r'\r\n[ \t]*\r\n|\r[ \t]*\r|\n[ \t]*\n', fstring)]
         return Document(*para_strings)
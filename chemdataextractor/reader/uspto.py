@@ -11,13 +11,37 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
+import logging
 
+from ..errors import ReaderError
 from ..scrape.clean import clean
 from ..doc.table import Table, Cell
 from ..doc.text import Caption, Footnote
+from ..utils import iter_decompressed
 from .markup import XmlReader
 
 
+log = logging.getLogger(__name__)
+
+
+def iter_xml_documents(f):
+    """Split a file of concatenated XML documents, yielding the bytes of each document in turn.
+
+    Each document must start with an XML declaration at the beginning of a line, as in USPTO bulk data files. Only one
+    document is held in memory at a time.
+
+    :param file f: A binary file-like object.
+    """
+    lines = []
+    for line in f:
+        if line.startswith(b'<?xml') and lines:
+            yield b''.join(lines)
+            lines = []
+        lines.append(line)
+    if lines:
+        yield b''.join(lines)
+
+
 # TODO: The below has only been tested with us-patent-grant-v42
 
 
@@ -57,6 +81,25 @@ class UsptoXmlReader(XmlReader):
         # TODO: Other DTDs
         return False
 
+    def read_bulk(self, f):
+        """Iterate the Documents in a USPTO bulk data file of concatenated patent grant XML documents.
+
+        The file is read incrementally, and each document's XML and tree are released before the next is read, so
+        multi-gigabyte weekly files can be processed in constant memory. Gzip, bzip2, xz, zip and tar input is
+        decompressed as it is read. Documents that aren't patent grants are skipped.
+
+        :param file|string f: A binary file-like object or path to a file.
+        """
+        for name, stream in iter_decompressed(f):
+            for i, fstring in enumerate(iter_xml_documents(stream)):
+                if not self.detect(fstring[:4096]):
+                    log.debug('Skipping document %s in %s: not a patent grant', i, name)
+                    continue
+                try:
+                    yield self.readstring(fstring)
+                except ReaderError:
+                    log.debug('Skipping document %s in %s: unable to read', i, name)
+
     def _parse_table(self, el, refs, specials):
         hdict = {}
         for row, tr in enumerate(self._css(self.table_body_row_css, el)):
@@ -121,7 +164,7 @@ class UsptoXmlReader(XmlReader):
             r.extend([Cell('')] * (len(max(rows, key=len)) - len(r)))
         rows = [r for r in rows if any(r)]
 
-        tab = Table(label=label, caption=caption or Caption(''), headings=hrows, rows=rows, footnotes=footnotes, id=el.get('id', None))
+        tab = Table(label=label, caption=caption if caption is not None else Caption(''), headings=hrows, rows=rows, footnotes=footnotes, id=el.get('id', None))
         return [tab]
 
     def _parse_table_rows(self, els, refs, specials):
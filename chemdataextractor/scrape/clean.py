@@ -14,7 +14,7 @@ from __future__ import unicode_literals
 import copy
 import logging
 import re
-from lxml.etree import fromstring, tostring
+from lxml.etree import fromstring, tostring, XPath
 from lxml.html import fromstring as html_fromstring
 import six
 
@@ -24,6 +24,23 @@ from . import BLOCK_ELEMENTS
 log = logging.getLogger(__name__)
 
 
+#: Whitespace around a newline, which is collapsed to a single newline.
+NEWLINE_RE = re.compile(r'\s*\n\s*')
+
+#: Runs of spaces and tabs, which are collapsed to a single space.
+SPACE_RE = re.compile(r'[ \t]+')
+
+
+def _fix_whitespace(text):
+    """Collapse whitespace in text down to a single space or a single newline."""
+    # Skip the substitutions when they can't change anything, which is the case for most text
+    if '\n' in text:
+        text = NEWLINE_RE.sub('\n', text)
+    if '\t' in text or '  ' in text:
+        text = SPACE_RE.sub(' ', text)
+    return text
+
+
 class Cleaner(object):
     """Clean HTML or XML by removing tags completely or replacing with their contents.
 
@@ -73,12 +90,22 @@ class Cleaner(object):
         :param bool fix_whitespace: Normalize whitespace to a single space and ensure newlines around block elements.
         :param dict namespaces: Namespace prefixes to register for the XPaths.
         """
+        self._compiled = {}
         # TODO: This is weird. Why don't we change to proper individual keyword arguments with class attribs as default
         for name, value in kwargs.items():
             if not hasattr(self, name):
                 raise TypeError('Unknown parameter: %s=%r' % (name, value))
             setattr(self, name, value)
 
+    def _xpath(self, name):
+        """Return the compiled XPath for the named XPath attribute, compiling it only when it is first used or changed."""
+        expr = getattr(self, name)
+        compiled = self._compiled.get(name)
+        if compiled is None or compiled.path != expr:
+            compiled = XPath(expr, namespaces=self.namespaces)
+            self._compiled[name] = compiled
+        return compiled
+
     def __call__(self, doc):
         """Clean the document."""
         if hasattr(doc, 'getroot'):
@@ -86,19 +113,20 @@ class Cleaner(object):
 
         if self.fix_whitespace:
             # Ensure newlines around block elements
-            for el in doc.iterdescendants():
-                if el.tag in BLOCK_ELEMENTS:
-                    el.tail = (el.tail or '') + '\n'
-                    previous = el.getprevious()
-                    parent = el.getparent()
-                    if previous is None:
-                        parent.text = (parent.text or '') + '\n'
-                    else:
-                        previous.tail = (previous.tail or '') + '\n'
+            for el in doc.iter(*BLOCK_ELEMENTS):
+                if el is doc:
+                    continue
+                el.tail = (el.tail or '') + '\n'
+                previous = el.getprevious()
+                parent = el.getparent()
+                if previous is None:
+                    parent.text = (parent.text or '') + '\n'
+                else:
+                    previous.tail = (previous.tail or '') + '\n'
 
         # Remove elements that match kill_xpath
         if self.kill_xpath:
-            for el in doc.xpath(self.kill_xpath, namespaces=self.namespaces):
+            for el in self._xpath('kill_xpath')(doc):
                 #log.debug('Killing: %s' % tostring(el))
                 parent = el.getparent()
                 # We can't kill the root element!
@@ -112,12 +140,23 @@ class Cleaner(object):
                         previous.tail = (previous.tail or '') + el.tail
                 parent.remove(el)
 
-        # Collect all the allowed elements
-        to_keep = [el for el in doc.xpath(self.allow_xpath, namespaces=self.namespaces)] if self.allow_xpath else []
-
         # Replace elements that match strip_xpath with their contents
         if self.strip_xpath:
-            for el in doc.xpath(self.strip_xpath, namespaces=self.namespaces):
+            # Collect all the allowed elements
+            to_keep = set(self._xpath('allow_xpath')(doc)) if self.allow_xpath else set()
+            # Text to append to each (element, 'text' or 'tail') is collected and joined at the end, because appending
+            # to the text of an lxml element copies the whole string, which is quadratic when stripping many elements
+            appended = {}
+
+            def pop_text(el, attr):
+                value = getattr(el, attr)
+                parts = appended.pop((el, attr), None)
+                return (value or '') + ''.join(parts) if parts else value
+
+            def append_text(el, attr, text):
+                appended.setdefault((el, attr), []).append(text)
+
+            for el in self._xpath('strip_xpath')(doc):
                 # Skip if allowed by allow_xpath
                 if el in to_keep:
                     continue
@@ -127,34 +166,35 @@ class Cleaner(object):
                 if parent is None:
                     continue
                 # Append the text to previous tail (or parent text if no previous), ensuring newline if block level
-                if el.text and isinstance(el.tag, six.string_types):
+                text = pop_text(el, 'text')
+                if text and isinstance(el.tag, six.string_types):
                     if previous is None:
-                        parent.text = (parent.text or '') + el.text
+                        append_text(parent, 'text', text)
                     else:
-                        previous.tail = (previous.tail or '') + el.text
+                        append_text(previous, 'tail', text)
                 # Append the tail to last child tail, or previous tail, or parent text, ensuring newline if block level
-                if el.tail:
+                tail = pop_text(el, 'tail')
+                if tail:
                     if len(el):
-                        last = el[-1]
-                        last.tail = (last.tail or '') + el.tail
+                        append_text(el[-1], 'tail', tail)
                     elif previous is None:
-                        parent.text = (parent.text or '') + el.tail
+                        append_text(parent, 'text', tail)
                     else:
-                        previous.tail = (previous.tail or '') + el.tail
-                index = parent.index(el)
-                parent[index:index+1] = el[:]
+                        append_text(previous, 'tail', tail)
+                # Move the children before the element and remove it, avoiding the linear search of parent.index
+                for child in list(el):
+                    el.addprevious(child)
+                parent.remove(el)
+            for (el, attr), parts in appended.items():
+                setattr(el, attr, (getattr(el, attr) or '') + ''.join(parts))
 
         # Collapse whitespace down to a single space or a single newline
         if self.fix_whitespace:
             for el in doc.iter():
                 if el.text is not None:
-                    el.text = re.sub(r'\s*\n\s*', '\n', el.text)
-                    el.text = re.sub(r'[ \t]+', ' ', el.text)
-                    # el.text = re.sub(r'\s+', ' ', el.text)
+                    el.text = _fix_whitespace(el.text)
                 if el.tail is not None:
-                    el.tail = re.sub(r'\s*\n\s*', '\n', el.tail)
-                    el.tail = re.sub(r'[ \t]+', ' ', el.tail)
-                    # el.tail = re.sub(r'\s+', ' ', el.tail)
+                    el.tail = _fix_whitespace(el.tail)
 
     def clean_html(self, html):
         """Apply ``Cleaner`` to HTML string or document and return a cleaned string or document."""
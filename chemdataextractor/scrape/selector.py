@@ -17,17 +17,21 @@ import logging
 import re
 from bs4 import UnicodeDammit
 
-from lxml.etree import XMLParser, fromstring, tostring
+from lxml.etree import XMLParser, XPath, fromstring, tostring
 from lxml.html import HTMLParser
 import six
 
-from ..utils import flatten
+from ..utils import BoundedCache, flatten
 from .csstranslator import CssHTMLTranslator, CssXmlTranslator
 
 
 log = logging.getLogger(__name__)
 
 
+#: Compiled XPath expressions, keyed by (expression, namespaces), and CSS translations, keyed by (translator, selector).
+compiled_selectors = BoundedCache(maxsize=5000, name='scrape.compiled_selectors')
+
+
 class Selector(object):
     """Tool for selecting content from HTML or XML using XPath selectors."""
 
@@ -92,8 +96,26 @@ class Selector(object):
         """Tag name of the root of this selector."""
         return self._root.tag
 
+    def _compile_xpath(self, query):
+        """Return a compiled XPath for an expression with the namespaces of this selector."""
+        key = (query, tuple(sorted(self.namespaces.items())))
+        xpath = compiled_selectors.get(key)
+        if xpath is None:
+            xpath = XPath(query, namespaces=self.namespaces, smart_strings=False)
+            compiled_selectors[key] = xpath
+        return xpath
+
+    def _css_to_xpath(self, query):
+        """Return the XPath expression for a CSS selector, translating it only once per translator class."""
+        key = (type(self._translator), query)
+        xpath = compiled_selectors.get(key)
+        if xpath is None:
+            xpath = self._translator.css_to_xpath(query)
+            compiled_selectors[key] = xpath
+        return xpath
+
     def xpath(self, query):
-        result = self._root.xpath(query, namespaces=self.namespaces, smart_strings=False)
+        result = self._compile_xpath(query)(self._root)
         if type(result) is not list:
             result = [result]
         #log.debug('Selecting XPath: {}: {}'.format(query, result))
@@ -101,7 +123,7 @@ class Selector(object):
         return SelectorList(*result)
 
     def css(self, query):
-        return self.xpath(self._translator.css_to_xpath(query))
+        return self.xpath(self._css_to_xpath(query))
 
     def re(self, regex):
         if isinstance(regex, six.string_types):
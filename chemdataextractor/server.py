@@ -0,0 +1,465 @@
+# -*- coding: utf-8 -*-
+"""
+chemdataextractor.server
+~~~~~~~~~~~~~~~~~~~~~~~~
+
+Long-running extraction service that keeps models loaded between requests.
+
+Usage::
+
+    service = ExtractionService()
+    service.start()
+    response = service.extract({'text': 'The melting point of benzene is 5.5 °C.'})
+    print(response['records'])
+    service.stop()
+
+Requests are dictionaries with either the ``text`` of a plain text document, or the contents of a ``document`` in any
+format that can be read, with an optional ``fname`` to help determine the format. An optional ``id`` is copied to the
+response. The response has the extracted ``records``, or an ``error`` message.
+
+Requests are processed by a single worker thread, because the pipeline components are not thread-safe. Requests that
+arrive together are processed in a batch, and the sentences of all documents in a batch are tagged together.
+
+:func:`make_server` serves the service over HTTP, on localhost or a Unix socket, and :func:`serve_jsonl` reads requests
+from a stream of JSON lines.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from collections import deque
+import json
+import logging
+import os
+import stat
+import threading
+from timeit import default_timer
+
+import six
+from six.moves import BaseHTTPServer, queue, socketserver
+from six.moves.urllib.parse import parse_qs, urlparse
+
+from . import __version__
+from .data import model_cache
+from .doc.document import Document
+from .doc.element import CaptionedElement
+from .doc.text import Text, tag_sentences
+from .memory import memory_report
+from .reader import PlainTextReader
+from .utils import BoundedCache
+
+
+log = logging.getLogger(__name__)
+
+
+#: Text used to load the models before the first request.
+WARM_UP_TEXT = 'The solution of 4-bromophenol in ethanol was stirred at 25 °C for 2 h to give a white solid: mp 142 °C.'
+
+
+class _Job(object):
+    """A request waiting to be processed by the service."""
+
+    __slots__ = ('request', 'response', 'start', '_done')
+
+    def __init__(self, request, response=None):
+        self.request = request
+        self.response = response
+        self.start = default_timer()
+        self._done = threading.Event()
+        if response is not None:
+            self._done.set()
+
+    def finish(self, response):
+        self.response = response
+        self._done.set()
+
+    def wait(self, timeout=None):
+        """Wait for the request to be processed and return the response, or None if timeout seconds pass first."""
+        self._done.wait(timeout)
+        return self.response
+
+
+class ServiceMetrics(object):
+    """Throughput and latency of the requests processed by a service."""
+
+    def __init__(self, window=1000):
+        """
+
+        :param int window: Number of most recent requests to calculate latency percentiles from.
+        """
+        self.start = default_timer()
+        #: Number of requests processed.
+        self.requests = 0
+        #: Number of requests that failed.
+        self.errors = 0
+        #: Number of batches processed.
+        self.batches = 0
+        #: Number of sentences tagged.
+        self.sentences = 0
+        #: Total time in seconds spent processing batches.
+        self.busy_time = 0.0
+        self._latencies = deque(maxlen=window)
+
+    def record_batch(self, jobs, sentences, elapsed):
+        """Record a processed batch of jobs."""
+        now = default_timer()
+        self.batches += 1
+        self.sentences += sentences
+        self.busy_time += elapsed
+        for job in jobs:
+            self.requests += 1
+            if 'error' in job.response:
+                self.errors += 1
+            self._latencies.append(now - job.start)
+
+    def percentile(self, p):
+        """Return the latency in seconds that p percent of recent requests were processed within."""
+        if not self._latencies:
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))]
+
+    def serialize(self):
+        """Convert ServiceMetrics to python dictionary."""
+        uptime = default_timer() - self.start
+        return {
+            'uptime': uptime,
+            'requests': self.requests,
+            'errors': self.errors,
+            'batches': self.batches,
+            'sentences': self.sentences,
+            'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+            'requests_per_second': self.requests / uptime if uptime else 0.0,
+            'sentences_per_second': self.sentences / self.busy_time if self.busy_time else 0.0,
+            'utilization': self.busy_time / uptime if uptime else 0.0,
+            'latency': {'p50': self.percentile(50), 'p90': self.percentile(90), 'p99': self.percentile(99)},
+        }
+
+
+def _document_sentences(doc):
+    """Return the sentences of the text elements and captions of a document, which are tagged in a batch.
+
+    Table cells are left out, because tables annotate each distinct cell text once and cache the result.
+    """
+    sentences = []
+    for el in doc.elements:
+        if isinstance(el, CaptionedElement):
+            el = el.caption
+        if isinstance(el, Text):
+            sentences.extend(el.sentences)
+    return sentences
+
+
+class ExtractionService(object):
+    """Extract records from documents in a worker thread that keeps the models loaded, batching concurrent requests."""
+
+    def __init__(self, max_batch=32, max_wait=0.01):
+        """
+
+        :param int max_batch: Maximum number of requests to process in one batch.
+        :param float max_wait: Time in seconds to wait for more requests after the first request of a batch arrives.
+        """
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.metrics = ServiceMetrics()
+        self._queue = queue.Queue()
+        self._worker = None
+        # Held while processing a batch, so the memory report sees the caches between batches
+        self._lock = threading.Lock()
+        # Held while the metrics are updated or copied, so reading them doesn't wait for a batch to finish
+        self._metrics_lock = threading.Lock()
+        self._memory = None
+        self._memory_wanted = False
+
+    @property
+    def running(self):
+        """Whether the worker thread is running."""
+        return self._worker is not None and self._worker.is_alive()
+
+    def warm_up(self):
+        """Load the tokenizer, tagger and dictionary models by extracting records from a short text."""
+        start = default_timer()
+        with self._lock:
+            Document(WARM_UP_TEXT).records
+        log.info('Loaded models in %.1fs' % (default_timer() - start))
+
+    def start(self):
+        """Start the worker thread."""
+        if self.running:
+            raise RuntimeError('Service is already running')
+        self._worker = threading.Thread(target=self._run, name='cde-service')
+        self._worker.daemon = True
+        self._worker.start()
+
+    def stop(self):
+        """Stop the worker thread after the requests already submitted have been processed."""
+        if self.running:
+            self._queue.put(None)
+            self._worker.join()
+        self._worker = None
+
+    def submit(self, request):
+        """Submit a request to be processed, and return a job whose ``wait()`` method returns the response.
+
+        :param dict request: The request.
+        """
+        job = _Job(request)
+        self._queue.put(job)
+        return job
+
+    def extract(self, request, timeout=None):
+        """Process a request and return the response.
+
+        :param dict request: The request.
+        :param float timeout: (Optional) Time in seconds to wait for the response.
+        """
+        response = self.submit(request).wait(timeout)
+        if response is None:
+            response = {'error': 'Timed out'}
+            if 'id' in request:
+                response['id'] = request['id']
+        return response
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            jobs = [job]
+            deadline = default_timer() + self.max_wait
+            stop = False
+            while len(jobs) < self.max_batch:
+                try:
+                    job = self._queue.get(timeout=max(0, deadline - default_timer()))
+                except queue.Empty:
+                    break
+                if job is None:
+                    stop = True
+                    break
+                jobs.append(job)
+            try:
+                self._process(jobs)
+            except Exception as e:
+                log.exception('Failed to process batch')
+                for job in jobs:
+                    if job.response is None:
+                        job.finish(self._error(job.request, e))
+            if stop:
+                break
+
+    def _process(self, jobs):
+        """Extract the records of each request in a batch, tagging the sentences of all documents together."""
+        with self._lock:
+            start = default_timer()
+            docs = []
+            for job in jobs:
+                try:
+                    docs.append((job, self._document(job.request)))
+                except Exception as e:
+                    job.finish(self._error(job.request, e))
+            sentences = []
+            for job, doc in docs:
+                try:
+                    sentences.extend(_document_sentences(doc))
+                except Exception as e:
+                    job.finish(self._error(job.request, e))
+            try:
+                tag_sentences(sentences)
+            except Exception:
+                # Leave each sentence to be tagged as its document is processed, so the error is reported by request
+                log.exception('Failed to tag batch of %s sentences' % len(sentences))
+            for job, doc in docs:
+                if job.response is not None:
+                    continue
+                try:
+                    response = {'records': doc.records.serialize()}
+                    if 'id' in job.request:
+                        response['id'] = job.request['id']
+                    job.finish(response)
+                except Exception as e:
+                    job.finish(self._error(job.request, e))
+            with self._metrics_lock:
+                self.metrics.record_batch(jobs, len(sentences), default_timer() - start)
+            if self._memory_wanted:
+                self._update_memory()
+
+    def _document(self, request):
+        """Return the Document for a request."""
+        if not isinstance(request, dict):
+            raise ValueError('Request must be an object')
+        if request.get('text') is not None:
+            text = request['text']
+            return PlainTextReader().readstring(text.encode('utf-8') if isinstance(text, six.text_type) else text)
+        if request.get('document') is not None:
+            contents = request['document']
+            if isinstance(contents, six.text_type):
+                contents = contents.encode('utf-8')
+            return Document.from_string(contents, fname=request.get('fname'))
+        raise ValueError('Request must have a text or document')
+
+    def _error(self, request, e):
+        """Return the response for a request that failed with an exception."""
+        log.debug('Request failed: %s: %s' % (e.__class__.__name__, e))
+        response = {'error': '%s: %s' % (e.__class__.__name__, e)}
+        if isinstance(request, dict) and 'id' in request:
+            response['id'] = request['id']
+        return response
+
+    def cache_stats(self):
+        """Return the hits and misses of each named cache, added up over caches with the same name."""
+        stats = {}
+        for cache in list(BoundedCache._named):
+            cache_stats = stats.setdefault(cache.name, {'size': 0, 'hits': 0, 'misses': 0})
+            cache_stats['size'] += len(cache)
+            cache_stats['hits'] += cache.hits
+            cache_stats['misses'] += cache.misses
+        for cache_stats in stats.values():
+            lookups = cache_stats['hits'] + cache_stats['misses']
+            cache_stats['hit_rate'] = cache_stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def _update_memory(self):
+        """Make a new memory report. Must be called between batches, while holding the batch lock."""
+        self._memory = memory_report()
+        self._memory_wanted = False
+
+    def serialize_metrics(self):
+        """Return the throughput and latency of requests, and the statistics of caches and loaded models.
+
+        The memory report walks the caches, so it can't be made while a batch is being processed. Instead the report
+        from the end of an earlier batch is returned, and a new report is made when the current batch finishes.
+        """
+        with self._metrics_lock:
+            data = self.metrics.serialize()
+        data['queue'] = self._queue.qsize()
+        data['caches'] = self.cache_stats()
+        if self._lock.acquire(False):
+            try:
+                self._update_memory()
+            finally:
+                self._lock.release()
+        else:
+            self._memory_wanted = True
+        data['memory'] = self._memory
+        data['models'] = model_cache.serialize()
+        return data
+
+
+class _RequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Handle HTTP requests to an ExtractionService.
+
+    - ``POST /extract`` with a JSON request, plain text, or the contents of a document. The file name of a document can
+      be given with a ``fname`` query parameter.
+    - ``GET /metrics`` returns the service metrics.
+    - ``GET /health`` returns ``{"status": "ok"}``.
+    """
+
+    server_version = 'ChemDataExtractor/%s' % __version__
+
+    def _send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/metrics':
+            self._send_json(200, self.server.service.serialize_metrics())
+        elif path == '/health':
+            self._send_json(200, {'status': 'ok'})
+        else:
+            self._send_json(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != '/extract':
+            self._send_json(404, {'error': 'Not found'})
+            return
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        content_type = (self.headers.get('Content-Type') or '').split(';')[0].strip()
+        if content_type == 'application/json':
+            try:
+                request = json.loads(body.decode('utf-8'))
+            except ValueError as e:
+                self._send_json(400, {'error': 'Invalid JSON: %s' % e})
+                return
+        elif content_type == 'text/plain':
+            request = {'text': body}
+        else:
+            request = {'document': body, 'fname': parse_qs(url.query).get('fname', [None])[0]}
+        response = self.server.service.extract(request)
+        self._send_json(422 if 'error' in response else 200, response)
+
+    def address_string(self):
+        # Unix socket clients have no address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, format, *args):
+        log.debug('%s %s' % (self.address_string(), format % args))
+
+
+class _HTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(service, host='127.0.0.1', port=8000, socket_path=None):
+    """Return an HTTP server for a service. Call ``serve_forever()`` on it to handle requests.
+
+    :param ExtractionService service: The service.
+    :param string host: (Optional) Host to listen on. Default is localhost only.
+    :param int port: (Optional) Port to listen on.
+    :param string socket_path: (Optional) Path of a Unix socket to listen on instead of host and port. An existing
+                               socket left at the path by a previous server is replaced.
+    """
+    if socket_path is not None:
+        if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            os.remove(socket_path)
+        server = _UnixHTTPServer(socket_path, _RequestHandler)
+    else:
+        server = _HTTPServer((host, port), _RequestHandler)
+    server.service = service
+    return server
+
+
+def serve_jsonl(service, input, output):
+    """Read a JSON request from each line of input, and write a JSON response to a line of output in the same order.
+
+    Requests are submitted as soon as they are read, so consecutive lines are processed in batches.
+
+    :param file input: Text stream to read requests from.
+    :param file output: Text stream to write responses to.
+    """
+    pending = queue.Queue()
+
+    def write_responses():
+        while True:
+            job = pending.get()
+            if job is None:
+                break
+            output.write(six.text_type(json.dumps(job.wait(), ensure_ascii=False)) + '\n')
+            output.flush()
+
+    writer = threading.Thread(target=write_responses, name='cde-jsonl-writer')
+    writer.daemon = True
+    writer.start()
+    for line in input:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            pending.put(_Job(line, {'error': 'Invalid JSON: %s' % e}))
+            continue
+        pending.put(service.submit(request))
+    pending.put(None)
+    writer.join()
@@ -15,6 +15,7 @@ import re
 import unicodedata
 
 from bs4 import UnicodeDammit
+import six
 
 
 #: Control characters.
@@ -218,15 +219,50 @@ ISSN_RE = re.compile(r'^\d{4}-\d{3}[\dX]$', re.U)
 CONTROL_RE = re.compile('[^\u0020-\uD7FF\u0009\u000A\u000D\uE000-\uFFFD\u10000-\u10FFFF]+')
 
 
-def get_encoding(input_string, guesses=None, is_html=False):
+def get_encoding(input_string, guesses=None, is_html=False, max_bytes=None):
     """Return the encoding of a byte string. Uses bs4 UnicodeDammit.
 
     :param string input_string: Encoded byte string.
     :param list[string] guesses: (Optional) List of encoding guesses to prioritize.
     :param bool is_html: Whether the input is HTML.
+    :param int max_bytes: (Optional) Detect the encoding from this many bytes at a time, so large inputs such as
+                          memory-mapped files aren't copied in full. The encoding is detected from the start of the
+                          input, unless the start is ASCII. Then the first part of the rest of the input that isn't
+                          ASCII is tried as UTF-8 and then as Windows-1252, a superset of Latin-1, before the encoding
+                          is guessed from it.
     """
-    converted = UnicodeDammit(input_string, override_encodings=[guesses] if guesses else [], is_html=is_html)
-    return converted.original_encoding
+    guesses = [guesses] if isinstance(guesses, six.string_types) else list(guesses or [])
+    if max_bytes is None or len(input_string) <= max_bytes:
+        return _detect_encoding(input_string, guesses, is_html, truncated=False)
+    encoding = _detect_encoding(input_string[:max_bytes], guesses, is_html, truncated=True)
+    if encoding != 'ascii':
+        return encoding
+    for start in range(max_bytes, len(input_string), max_bytes):
+        sample = input_string[start:start + max_bytes]
+        if not isinstance(sample, six.binary_type):
+            sample = memoryview(sample).tobytes()
+        try:
+            sample.decode('ascii')
+        except UnicodeDecodeError:
+            # The previous samples are ASCII, so this one doesn't start part way through a character
+            truncated = start + max_bytes < len(input_string)
+            return _detect_encoding(sample, guesses + ['utf-8', 'windows-1252'], is_html, truncated=truncated)
+    return 'ascii'
+
+
+def _detect_encoding(input_string, guesses, is_html, truncated):
+    """Return the encoding of a byte string, which is part of a longer input if truncated is True."""
+    if not isinstance(input_string, (six.binary_type, six.text_type)):
+        # UnicodeDammit needs a byte string, so copy other buffers such as memory-mapped files
+        input_string = memoryview(input_string).tobytes()
+    if truncated and isinstance(input_string, six.binary_type):
+        try:
+            input_string.decode('utf-8')
+        except UnicodeDecodeError as e:
+            # Drop a character cut off by the end of the sample, so it doesn't rule out UTF-8
+            if e.reason == 'unexpected end of data':
+                input_string = input_string[:e.start]
+    return UnicodeDammit(input_string, override_encodings=guesses, is_html=is_html).original_encoding
 
 
 def levenshtein(s1, s2, allow_substring=False):
@@ -315,33 +351,44 @@ def like_number(text):
     return False
 
 
+def char_shape(c):
+    """Return the word shape character for a single character."""
+    if c.isdigit():
+        return 'd'  # Digits
+    elif c in GREEK:
+        return 'g'  # Greek letters
+    elif c.isalpha():
+        return 'X' if c.isupper() else 'x'  # Uppercase or lowercase alphabetical
+    elif c in QUOTES:
+        return "'"  # Quotes and apostrophes
+    elif c in {':', ';'}:
+        return ':'  # Colons and semicolons
+    elif c in {'!', '?', '.'}:
+        return '.'  # Sentence ends
+    elif c in {'(', '[', '{', ')', ']', '}'}:
+        return 'b'  # Brackets
+    elif c in {'°', '%'}:
+        return 'u'  # units
+    elif c in {'■', '◼', '●', '▲', '○', '◆', '▼', '⧫', '△', '◇', '▽', '⬚', '□'}:
+        return 'l'  # list markers
+    elif c in {',', '$', '&', '-'}:
+        return c  # Stay the same
+    else:
+        return '*'  # Everything else, symbols etc: {'=', '+', '*', '_', '|', '@', '×', '÷', '±', '<', '≤', '>', '≥', '≦', '≡', '≅', '≈', '≃', '≲', '→', '←', '⇄', '≪', '≫', '↔', '≠', '∝', '∈', '⇌', '⇋', '⋯', '~', '·', '•', '√', '⊃', '∑', '∏', '®', '∞', '∂', '∫', '∇', '∧', '⟨', '⟩'}
+
+
+#: Cache of word shape characters, which is bounded by the number of distinct characters.
+_char_shapes = {}
+
+
 def word_shape(text):
     prev_m = ''
     seq = 0
     shape = []
     for c in text:
-        if c.isdigit():
-            m = 'd'  # Digits
-        elif c in GREEK:
-            m = 'g'  # Greek letters
-        elif c.isalpha():
-            m = 'X' if c.isupper() else 'x'  # Uppercase or lowercase alphabetical
-        elif c in QUOTES:
-            m = "'"  # Quotes and apostrophes
-        elif c in {':', ';'}:
-            m = ':'  # Colons and semicolons
-        elif c in {'!', '?', '.'}:
-            m = '.'  # Sentence ends
-        elif c in {'(', '[', '{', ')', ']', '}'}:
-            m = 'b'  # Brackets
-        elif c in {'°', '%'}:
-            m = 'u'  # units
-        elif c in {'■', '◼', '●', '▲', '○', '◆', '▼', '⧫', '△', '◇', '▽', '⬚', '□'}:
-            m = 'l'  # list markers
-        elif c in {',', '$', '&', '-'}:
-            m = c  # Stay the same
-        else:
-            m = '*'  # Everything else, symbols etc: {'=', '+', '*', '_', '|', '@', '×', '÷', '±', '<', '≤', '>', '≥', '≦', '≡', '≅', '≈', '≃', '≲', '→', '←', '⇄', '≪', '≫', '↔', '≠', '∝', '∈', '⇌', '⇋', '⋯', '~', '·', '•', '√', '⊃', '∑', '∏', '®', '∞', '∂', '∫', '∇', '∧', '⟨', '⟩'}
+        m = _char_shapes.get(c)
+        if m is None:
+            m = _char_shapes[c] = char_shape(c)
         if m == prev_m:
             seq += 1
         else:
@@ -18,9 +18,91 @@ import unicodedata
 import six
 
 from . import CONTROLS, HYPHENS, QUOTES, DOUBLE_QUOTES, ACCENTS, SINGLE_QUOTES, APOSTROPHES, SLASHES, TILDES, MINUSES
+from ..utils import memoize
 from .processors import BaseProcessor
 
 
+class CharReplacer(object):
+    """Apply a sequence of single character replacement steps to text in one pass.
+
+    Each step is a (characters, replacement) pair, equivalent to calling ``text.replace(char, replacement)`` for each
+    of the characters in turn. Every step replaces single characters, so applying the steps one after another is the
+    same as mapping each character through all of the steps. The steps are composed into a single table when the
+    CharReplacer is created, and applied with one precompiled regular expression.
+    """
+
+    def __init__(self, steps):
+        """
+
+        :param list[tuple(set[string], string)] steps: List of (characters, replacement) pairs.
+        """
+        chars = set()
+        for step_chars, replacement in steps:
+            chars.update(step_chars)
+        self.table = {}
+        for char in chars:
+            result = char
+            for step_chars, replacement in steps:
+                result = ''.join(replacement if c in step_chars else c for c in result)
+            if result != char:
+                self.table[char] = result
+        self.regex = re.compile('[%s]' % ''.join(re.escape(char) for char in sorted(self.table)), re.U)
+        self._replace = lambda match: self.table[match.group()]
+
+    def __call__(self, text):
+        # Searching first is faster for the common case that there is nothing to replace
+        if self.table and self.regex.search(text):
+            return self.regex.sub(self._replace, text)
+        return text
+
+
+@memoize
+def _normalizer_replacer(hyphens, quotes, slashes, tildes):
+    """Return the CharReplacer for the character replacements of a Normalizer configuration."""
+    steps = [
+        # Strip out any control characters (they occasionally creep in somehow)
+        (CONTROLS, ''),
+        # Normalize unusual whitespace not caught by unicodedata
+        ({'\u000b', '\u000c', '\u0085'}, ' '),
+        ({'\u2028', '\u2029'}, '\n'),
+    ]
+    # Normalize all hyphens, minuses and dashes to ascii hyphen-minus and remove soft hyphen entirely
+    if hyphens:
+        # TODO: Better normalization of em/en dashes to '--' if surrounded by spaces or start/end?
+        steps.append((HYPHENS | MINUSES, '-'))
+        steps.append(({'\u00ad'}, ''))
+    # Normalize all quotes and primes to ascii apostrophe and quotation mark
+    if quotes:
+        steps.append((DOUBLE_QUOTES, '"'))  # \u0022
+        steps.append((SINGLE_QUOTES | APOSTROPHES | ACCENTS, "'"))  # \u0027
+        steps.append(({'′', '‵'}, "'"))  # \u2032 prime, \u2035 reversed prime
+        steps.append(({'″', '‶'}, "''"))  # \u2033 double prime, \u2036 reversed double prime
+        steps.append(({'‴', '‷'}, "'''"))  # \u2034 triple prime, \u2037 reversed triple prime
+        steps.append(({'⁗'}, "''''"))  # \u2057 quadruple prime
+    if slashes:
+        steps.append((SLASHES, '/'))
+    if tildes:
+        steps.append((TILDES, '~'))
+    return CharReplacer(steps)
+
+
+#: CharReplacer for ExcessNormalizer, which converts all quotes to apostrophes and all brackets to parentheses.
+excess_replace = CharReplacer([
+    (QUOTES, "'"),
+    ({'(', '<', '[', '{'}, '('),
+    ({')', '>', ']', '}'}, '('),
+])
+
+#: Alternative chemical spellings that ChemNormalizer unifies, keyed by lowercase spelling.
+CHEM_SPELLINGS = {
+    'sulph': 'sulf',
+    'aluminum': 'aluminium',
+    'cesium': 'caesium',
+}
+
+CHEM_SPELLING_RE = re.compile('|'.join(CHEM_SPELLINGS), flags=re.I)
+
+
 class BaseNormalizer(six.with_metaclass(ABCMeta, BaseProcessor)):
     """Abstract normalizer class from which all normalizers inherit.
 
@@ -83,46 +165,16 @@ class Normalizer(BaseNormalizer):
         if self.form is not None:
             text = unicodedata.normalize(self.form, text)
 
-        # Strip out any control characters (they occasionally creep in somehow)
-        for control in CONTROLS:
-            text = text.replace(control, '')
-
-        # Normalize unusual whitespace not caught by unicodedata
-        text = text.replace('\u000b', ' ').replace('\u000c', ' ').replace(u'\u0085', ' ')
-        text = text.replace('\u2028', '\n').replace('\u2029', '\n').replace('\r\n', '\n').replace('\r', '\n')
-
-        # Normalize all hyphens, minuses and dashes to ascii hyphen-minus and remove soft hyphen entirely
-        if self.hyphens:
-            # TODO: Better normalization of em/en dashes to '--' if surrounded by spaces or start/end?
-            for hyphen in HYPHENS | MINUSES:
-                text = text.replace(hyphen, '-')
-            text = text.replace('\u00ad', '')
-
-        # Normalize all quotes and primes to ascii apostrophe and quotation mark
-        if self.quotes:
-            for double_quote in DOUBLE_QUOTES:
-                text = text.replace(double_quote, '"')  # \u0022
-            for single_quote in (SINGLE_QUOTES | APOSTROPHES | ACCENTS):
-                text = text.replace(single_quote, "'")  # \u0027
-            text = text.replace('′', "'")     # \u2032 prime
-            text = text.replace('‵', "'")     # \u2035 reversed prime
-            text = text.replace('″', "''")    # \u2033 double prime
-            text = text.replace('‶', "''")    # \u2036 reversed double prime
-            text = text.replace('‴', "'''")   # \u2034 triple prime
-            text = text.replace('‷', "'''")   # \u2037 reversed triple prime
-            text = text.replace('⁗', "''''")  # \u2057 quadruple prime
+        # Replace control characters, unusual whitespace, hyphens, quotes, slashes and tildes in a single pass
+        if '\r' in text:
+            # Line breaks are normalized after control characters and whitespace, but before the other replacements
+            text = _normalizer_replacer(False, False, False, False)(text)
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        text = _normalizer_replacer(self.hyphens, self.quotes, self.slashes, self.tildes)(text)
 
         if self.ellipsis:
             text = text.replace('…', '...').replace(' . . . ', ' ... ')  # \u2026
 
-        if self.slashes:
-            for slash in SLASHES:
-                text = text.replace(slash, '/')
-
-        if self.tildes:
-            for tilde in TILDES:
-                text = text.replace(tilde, '~')
-
         if self.strip:
             text = text.strip()
 
@@ -154,14 +206,10 @@ class ExcessNormalizer(Normalizer):
         text = super(ExcessNormalizer, self).normalize(text.lower())
         # Remove all whitespace
         text = ''.join(text.split())
-        # Convert all apostrophes, quotes, accents, primes to single ascii apostrophe
-        for quote in QUOTES:
-            text = text.replace(quote, "'")
-        # Convert all brackets to regular parentheses
-        for ob in {'(', '<', '[', '{', '&lt;'}:
-            text = text.replace(ob, '(')
-        for cb in {')', '>', ']', '}', '&gt;'}:
-            text = text.replace(cb, '(')
+        # Convert all apostrophes, quotes, accents, primes to single ascii apostrophe and brackets to parentheses
+        text = excess_replace(text)
+        if '&' in text:
+            text = text.replace('&lt;', '(').replace('&gt;', '(')
         return text
 
 
@@ -183,9 +231,7 @@ class ChemNormalizer(Normalizer):
         text = super(ChemNormalizer, self).normalize(text)
         # Normalize element spelling
         if self.chem_spell:
-            text = re.sub(r'sulph', r'sulf', text, flags=re.I)
-            text = re.sub(r'aluminum', r'aluminium', text, flags=re.I)
-            text = re.sub(r'cesium', r'caesium', text, flags=re.I)
+            text = CHEM_SPELLING_RE.sub(lambda m: CHEM_SPELLINGS[m.group().lower()], text)
         return text
 
 
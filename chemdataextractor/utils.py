@@ -11,17 +11,36 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
+from collections import OrderedDict
+import bz2
 import errno
 import functools
+import gzip
+import io
 import logging
 import os
+import tarfile
+import weakref
+import zipfile
+
+try:
+    import lzma
+except ImportError:
+    lzma = None
 
 import six
 
+from .config import config
+
 
 log = logging.getLogger(__name__)
 
 
+#: Maximum number of entries of named caches, overriding the maxsize they are created with. Initialized from the
+#: ``cache_limits`` config value. Use :func:`chemdataextractor.memory.set_cache_limit` to change a limit at runtime.
+cache_limits = dict(config.get('cache_limits') or {})
+
+
 def memoized_property(fget):
     """Decorator to create memoized properties."""
     attr_name = '_{}'.format(fget.__name__)
@@ -31,18 +50,36 @@ def memoized_property(fget):
         if not hasattr(self, attr_name):
             setattr(self, attr_name, fget(self))
         return getattr(self, attr_name)
+    # Record the attribute the value is stored in, so memoized values can be found and cleared
+    fget_memoized.memoized_attr = attr_name
     return property(fget_memoized)
 
 
+def memoized_attributes(obj):
+    """Return the names of the attributes of obj that hold the values of its memoized properties."""
+    names = []
+    for cls in type(obj).__mro__:
+        for value in vars(cls).values():
+            attr_name = getattr(getattr(value, 'fget', None), 'memoized_attr', None)
+            if attr_name is not None and attr_name in getattr(obj, '__dict__', ()) and attr_name not in names:
+                names.append(attr_name)
+    return names
+
+
 def memoize(obj):
-    """Decorator to create memoized functions, methods or classes."""
-    cache = obj.cache = {}
+    """Decorator to create memoized functions, methods or classes.
+
+    Results are stored in a :class:`BoundedCache` named ``memoize.<name>``, which is unbounded unless a limit is set.
+    """
+    cache = obj.cache = BoundedCache(maxsize=None, name='memoize.%s' % obj.__name__)
+    missing = object()
 
     @functools.wraps(obj)
     def memoizer(*args, **kwargs):
-        if args not in cache:
-            cache[args] = obj(*args, **kwargs)
-        return cache[args]
+        result = cache.get(args, missing)
+        if result is missing:
+            result = cache[args] = obj(*args, **kwargs)
+        return result
     return memoizer
 
 
@@ -60,6 +97,95 @@ def python_2_unicode_compatible(klass):
     return klass
 
 
+class BoundedCache(object):
+    """Dictionary-like cache that holds at most ``maxsize`` entries, discarding the least recently used.
+
+    Hit and miss counts are kept, so the effectiveness of a cache can be checked with :meth:`stats`. A ``maxsize`` of
+    None means the cache is unbounded, and 0 disables caching.
+
+    Named caches are included in :func:`chemdataextractor.memory.memory_report` and cleared by
+    :func:`chemdataextractor.memory.clear_caches`, and their maxsize can be overridden with :data:`cache_limits`.
+    """
+
+    #: All live named caches.
+    _named = weakref.WeakSet()
+
+    def __init__(self, maxsize=10000, name=None):
+        """
+
+        :param int maxsize: Maximum number of entries. None for unbounded, 0 to disable.
+        :param string name: (Optional) Name to report the cache under. Instances may share a name.
+        """
+        self.name = name
+        self.maxsize = cache_limits.get(name, maxsize) if name is not None else maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        if name is not None:
+            self._named.add(self)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __setitem__(self, key, value):
+        if self.maxsize == 0:
+            return
+        self._data.pop(key, None)
+        self._data[key] = value
+        if self.maxsize is not None:
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def items(self):
+        """Return a list of the (key, value) pairs in the cache, least recently used first."""
+        return list(self._data.items())
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if it is not in the cache."""
+        try:
+            value = self._data.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        # Re-insert to mark as most recently used
+        self._data[key] = value
+        self.hits += 1
+        return value
+
+    def clear(self):
+        """Remove all entries and reset the hit and miss counts."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def resize(self, maxsize):
+        """Change the maximum number of entries, discarding the least recently used entries over the new maximum.
+
+        :param int maxsize: Maximum number of entries. None for unbounded, 0 to disable.
+        """
+        self.maxsize = maxsize
+        if maxsize is not None:
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self):
+        """Return a dict with the size, maxsize, hits, misses and hit rate of this cache."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
 class Singleton(type):
     """Singleton metaclass."""
     _instances = {}
@@ -95,3 +221,90 @@ def ensure_dir(path):
     except OSError as e:
         if e.errno != errno.EEXIST:
             raise
+
+
+def _peek(f, size):
+    """Return up to size bytes from the current position of a binary file without consuming them."""
+    if hasattr(f, 'peek'):
+        return f.peek(size)[:size]
+    pos = f.tell()
+    data = f.read(size)
+    f.seek(pos)
+    return data
+
+
+def _strip_extension(name, extensions):
+    """Remove a compression extension from a file name, if present."""
+    if name:
+        for extension in extensions:
+            if name.lower().endswith(extension):
+                return name[:-len(extension)]
+    return name
+
+
+def iter_decompressed(f, name=None):
+    """Iterate the files in a possibly compressed file or archive, yielding (name, file-like object) pairs.
+
+    Gzip, bzip2 and xz compressed files are decompressed as they are read, without unpacking them to disk. Each regular
+    file in a zip or tar archive (including a compressed tar archive) is yielded in turn, and must be read before moving
+    on to the next. Anything else is yielded unchanged as a single file. The format is determined from the first bytes
+    of the file, not from its name.
+
+    :param file|string f: A binary file-like object or path to a file.
+    :param string name: (Optional) The file name. Defaults to the name of the file object.
+    """
+    if isinstance(f, six.string_types):
+        with io.open(f, 'rb') as fobj:
+            for member in _iter_decompressed(fobj, name or f):
+                yield member
+    else:
+        for member in _iter_decompressed(f, name or getattr(f, 'name', None)):
+            yield member
+
+
+def _iter_decompressed(f, name):
+    magic = _peek(f, 262)
+    if magic.startswith(b'\x1f\x8b'):
+        stream = gzip.GzipFile(fileobj=f, mode='rb')
+        name = _strip_extension(name, ['.gz', '.gzip'])
+    elif magic.startswith(b'BZh'):
+        stream = bz2.BZ2File(f)
+        name = _strip_extension(name, ['.bz2'])
+    elif magic.startswith(b'\xfd7zXZ\x00'):
+        if lzma is None:
+            raise IOError('xz decompression requires the lzma module')
+        stream = lzma.LZMAFile(f)
+        name = _strip_extension(name, ['.xz'])
+    elif magic.startswith(b'PK\x03\x04'):
+        archive = zipfile.ZipFile(f)
+        try:
+            for info in archive.infolist():
+                if info.filename.endswith('/'):
+                    continue
+                member = archive.open(info)
+                try:
+                    yield info.filename, member
+                finally:
+                    member.close()
+        finally:
+            archive.close()
+        return
+    elif magic[257:262] == b'ustar':
+        # Stream mode, so compressed tar archives don't need to be seekable
+        archive = tarfile.open(fileobj=f, mode='r|')
+        try:
+            for info in archive:
+                if info.isfile():
+                    yield info.name, archive.extractfile(info)
+        finally:
+            archive.close()
+        return
+    else:
+        yield name, f
+        return
+    # Decompressed contents may themselves be a tar archive
+    try:
+        for member in _iter_decompressed(stream, name):
+            yield member
+    finally:
+        stream.close()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+bench_abbrev
+~~~~~~~~~~~~
+
+Time abbreviation detection on the tokens of each paragraph in the documents in tests/data.
+
+Run with ``python bench_abbrev.py [repeats]``.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import io
+import os
+import sys
+import time
+
+from chemdataextractor.nlp.abbrev import AbbreviationDetector, ChemAbbreviationDetector
+from chemdataextractor.nlp.tokenize import ChemWordTokenizer
+from chemdataextractor.reader import AcsHtmlReader, RscHtmlReader, UsptoXmlReader
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'data')
+INPUTS = [
+    (AcsHtmlReader(), os.path.join(DATA_DIR, 'acs', 'acs.jmedchem.6b00723.html')),
+    (RscHtmlReader(), os.path.join(DATA_DIR, 'rsc', '10.1039_C6OB02074G.html')),
+    (UsptoXmlReader(), os.path.join(DATA_DIR, 'uspto', 'US06840965B2.xml')),
+]
+
+
+def load_sentences():
+    """Return the tokens of each paragraph of the test documents, tokenized without the sentence tokenizer model."""
+    tokenizer = ChemWordTokenizer()
+    sentences = []
+    for reader, path in INPUTS:
+        with io.open(path, 'rb') as f:
+            for el in reader.readstring(f.read()).elements:
+                if hasattr(el, 'text'):
+                    sentences.append(tokenizer.tokenize(el.text))
+    return sentences
+
+
+def main(repeats=10):
+    sentences = load_sentences()
+    print('%d paragraphs, %d tokens' % (len(sentences), sum(len(tokens) for tokens in sentences)))
+    for detector in [AbbreviationDetector(), ChemAbbreviationDetector()]:
+        best = None
+        for _ in range(repeats):
+            start = time.time()
+            definitions = [detector.detect_spans(tokens) for tokens in sentences]
+            elapsed = time.time() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print('%-25s %4d definitions  best %.1f ms' % (
+            detector.__class__.__name__, sum(len(d) for d in definitions), best * 1000
+        ))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
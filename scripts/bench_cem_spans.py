@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+bench_cem_spans
+~~~~~~~~~~~~~~~
+
+Time the adjustment of chemical entity mention boundaries and splitting of mentions, using every one, two and three
+token sequence in the documents in tests/data as mentions, against trying each rule pattern in turn.
+
+Run with ``python bench_cem_spans.py [repeats]``.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import io
+import os
+import re
+import sys
+import time
+
+from chemdataextractor.nlp.cem import CemSpanProcessor, IGNORE_PREFIX, IGNORE_SUFFIX, SPECIALS, SPLITS
+from chemdataextractor.nlp.tokenize import ChemWordTokenizer, regex_span_tokenize
+from chemdataextractor.reader import AcsHtmlReader, RscHtmlReader, UsptoXmlReader
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'data')
+INPUTS = [
+    (AcsHtmlReader(), os.path.join(DATA_DIR, 'acs', 'acs.jmedchem.6b00723.html')),
+    (RscHtmlReader(), os.path.join(DATA_DIR, 'rsc', '10.1039_C6OB02074G.html')),
+    (UsptoXmlReader(), os.path.join(DATA_DIR, 'uspto', 'US06840965B2.xml')),
+]
+
+
+def load_mentions():
+    """Return every one, two and three token sequence in the test documents."""
+    tokenizer = ChemWordTokenizer()
+    mentions = []
+    for reader, path in INPUTS:
+        with io.open(path, 'rb') as f:
+            for el in reader.readstring(f.read()).elements:
+                if hasattr(el, 'text'):
+                    tokens = tokenizer.tokenize(el.text)
+                    for n in range(1, 4):
+                        mentions.extend(' '.join(tokens[i:i+n]) for i in range(len(tokens) - n + 1))
+    return mentions
+
+
+def sequential_process(text):
+    """Process a mention by trying each prefix, suffix, split and special pattern in turn."""
+    start = 0
+    end = len(text)
+    currenttext = text.lower()
+    for prefix in IGNORE_PREFIX:
+        if currenttext.startswith(prefix):
+            start += len(prefix)
+            break
+    for suffix in IGNORE_SUFFIX:
+        if currenttext.endswith(suffix):
+            end -= len(suffix)
+            break
+    currenttext = text[start:end]
+    for bpair in [('(', ')'), ('[', ']')]:
+        if len(currenttext) > 2 and currenttext[0] == bpair[0] and currenttext[-1] == bpair[1]:
+            level = 1
+            for k, char in enumerate(currenttext[1:]):
+                if char == bpair[0]:
+                    level += 1
+                elif char == bpair[1]:
+                    level -= 1
+                if level == 0 and k == len(currenttext) - 2:
+                    start += 1
+                    end -= 1
+                    break
+    if start >= end:
+        return []
+    currenttext = text[start:end]
+    split_spans = [(currenttext, start, end)]
+    comps = list(regex_span_tokenize(currenttext, '(-|\\+|\\)?-to-\\(?|···|/|\\s)'))
+    if len(comps) > 1:
+        for split in SPLITS:
+            if all(re.search(split, currenttext[comp[0]:comp[1]]) for comp in comps):
+                split_spans = [(currenttext[comp[0]:comp[1]], start + comp[0], start + comp[1]) for comp in comps]
+                break
+    spans = []
+    for split_text, split_start, split_end in split_spans:
+        for special in SPECIALS:
+            m = re.search(special, split_text)
+            if m:
+                for i in range(1, len(m.groups()) + 1):
+                    spans.append((m.group(i), split_start + m.start(i), split_start + m.end(i)))
+                break
+        else:
+            spans.append((split_text, split_start, split_end))
+    return spans
+
+
+def best_time(process, mentions, repeats, clear=None):
+    """Return the best time to process all mentions."""
+    best = None
+    for _ in range(repeats):
+        if clear:
+            clear()
+        start = time.time()
+        for mention in mentions:
+            process(mention)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(repeats=5):
+    mentions = load_mentions()
+    print('%d mentions, %d distinct' % (len(mentions), len(set(mentions))))
+    uncached = CemSpanProcessor(cache_size=0)
+    cached = CemSpanProcessor(cache_size=None)
+    for name, process, clear in [
+        ('sequential', sequential_process, None),
+        ('compiled', uncached.process, None),
+        ('cached', cached.process, cached.cache.clear),
+    ]:
+        elapsed = best_time(process, mentions, repeats, clear)
+        print('%-10s %.1f ms  %.2f us per mention' % (name, elapsed * 1000, elapsed / len(mentions) * 1000000))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
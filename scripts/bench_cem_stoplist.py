@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+bench_cem_stoplist
+~~~~~~~~~~~~~~~~~~
+
+Time the CemTagger stoplist check per candidate entity, using every one and two token sequence in the documents in
+tests/data as candidates, against checking each prefix, suffix and regular expression in turn.
+
+Run with ``python bench_cem_stoplist.py [repeats]``.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import io
+import os
+import re
+import sys
+import time
+
+from chemdataextractor.nlp.cem import CemTagger, IGNORE_PREFIX, IGNORE_SUFFIX, STOPLIST, STOP_RES
+from chemdataextractor.nlp.tokenize import ChemWordTokenizer
+from chemdataextractor.reader import AcsHtmlReader, RscHtmlReader, UsptoXmlReader
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'data')
+INPUTS = [
+    (AcsHtmlReader(), os.path.join(DATA_DIR, 'acs', 'acs.jmedchem.6b00723.html')),
+    (RscHtmlReader(), os.path.join(DATA_DIR, 'rsc', '10.1039_C6OB02074G.html')),
+    (UsptoXmlReader(), os.path.join(DATA_DIR, 'uspto', 'US06840965B2.xml')),
+]
+
+
+def load_entities():
+    """Return every lowercase one and two token sequence in the test documents."""
+    tokenizer = ChemWordTokenizer()
+    entities = []
+    for reader, path in INPUTS:
+        with io.open(path, 'rb') as f:
+            for el in reader.readstring(f.read()).elements:
+                if hasattr(el, 'text'):
+                    tokens = [token.lower() for token in tokenizer.tokenize(el.text)]
+                    entities.extend(tokens)
+                    entities.extend(' '.join(pair) for pair in zip(tokens, tokens[1:]))
+    return entities
+
+
+def sequential_in_stoplist(entity):
+    """Check the stoplist by trying each prefix, suffix and regular expression in turn."""
+    start = 0
+    end = len(entity)
+    for prefix in IGNORE_PREFIX:
+        if entity.startswith(prefix):
+            start += len(prefix)
+            break
+    for suffix in IGNORE_SUFFIX:
+        if entity.endswith(suffix):
+            end -= len(suffix)
+            break
+    if start >= end:
+        return True
+    entity = entity[start:end]
+    if entity in STOPLIST:
+        return True
+    for stop_re in STOP_RES:
+        if re.search(stop_re, entity):
+            return True
+
+
+def best_time(in_stoplist, entities, repeats):
+    """Return the best time to check all entities."""
+    best = None
+    for _ in range(repeats):
+        start = time.time()
+        for entity in entities:
+            in_stoplist(entity)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(repeats=5):
+    entities = load_entities()
+    tagger = CemTagger()
+    print('%d candidate entities, %d in stoplist' % (len(entities), sum(1 for e in entities if tagger._in_stoplist(e))))
+    for name, in_stoplist in [('sequential', sequential_in_stoplist), ('compiled', tagger._in_stoplist)]:
+        elapsed = best_time(in_stoplist, entities, repeats)
+        print('%-10s %.1f ms  %.2f us per entity' % (name, elapsed * 1000, elapsed / len(entities) * 1000000))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+bench_clean
+~~~~~~~~~~~
+
+Time the cleaners applied by each reader to the documents in tests/data, and the ``strip`` cleaner.
+
+Run with ``python bench_clean.py [repeats]``.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import copy
+import io
+import os
+import sys
+import time
+
+from chemdataextractor.reader import AcsHtmlReader, RscHtmlReader, UsptoXmlReader
+from chemdataextractor.scrape.clean import strip
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'data')
+INPUTS = [
+    (AcsHtmlReader(), os.path.join(DATA_DIR, 'acs', 'acs.jmedchem.6b00723.html')),
+    (RscHtmlReader(), os.path.join(DATA_DIR, 'rsc', '10.1039_C6OB02074G.html')),
+    (UsptoXmlReader(), os.path.join(DATA_DIR, 'uspto', 'US06840965B2.xml')),
+]
+
+
+def best_time(cleaner, root, repeats):
+    """Return the best time to apply cleaner to a fresh copy of root."""
+    best = None
+    for _ in range(repeats):
+        tree = copy.deepcopy(root)
+        start = time.time()
+        cleaner(tree)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(repeats=20):
+    for reader, path in INPUTS:
+        with io.open(path, 'rb') as f:
+            root = reader._css(reader.root_css, reader._make_tree(f.read()))[0]
+        times = [best_time(cleaner, root, repeats) for cleaner in reader.cleaners]
+        print('%-15s %6d elements  reader cleaners %6.2f ms (%s)  strip %6.2f ms' % (
+            reader.__class__.__name__, sum(1 for _ in root.iter()), sum(times) * 1000,
+            ', '.join('%.2f' % (t * 1000) for t in times), best_time(strip, root, repeats) * 1000
+        ))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+bench_lexicon
+~~~~~~~~~~~~~
+
+Time adding the tokens of the documents in tests/data to an empty Lexicon one at a time and with add_many.
+
+Run with ``python bench_lexicon.py [repeats]``.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import io
+import os
+import sys
+import time
+
+from chemdataextractor.nlp.lexicon import Lexicon
+from chemdataextractor.nlp.tokenize import ChemWordTokenizer
+from chemdataextractor.reader import AcsHtmlReader, RscHtmlReader, UsptoXmlReader
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'data')
+INPUTS = [
+    (AcsHtmlReader(), os.path.join(DATA_DIR, 'acs', 'acs.jmedchem.6b00723.html')),
+    (RscHtmlReader(), os.path.join(DATA_DIR, 'rsc', '10.1039_C6OB02074G.html')),
+    (UsptoXmlReader(), os.path.join(DATA_DIR, 'uspto', 'US06840965B2.xml')),
+]
+
+
+def load_sentences():
+    """Return the tokens of each paragraph of the test documents, tokenized without the sentence tokenizer model."""
+    tokenizer = ChemWordTokenizer()
+    sentences = []
+    for reader, path in INPUTS:
+        with io.open(path, 'rb') as f:
+            for el in reader.readstring(f.read()).elements:
+                if hasattr(el, 'text'):
+                    sentences.append(tokenizer.tokenize(el.text))
+    return sentences
+
+
+def best_time(add, sentences, repeats):
+    """Return the best time to add all sentences to an empty lexicon."""
+    lexicon = Lexicon()
+    best = None
+    for _ in range(repeats):
+        lexicon.lexemes = {}
+        start = time.time()
+        for tokens in sentences:
+            add(lexicon, tokens)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def add_each(lexicon, tokens):
+    for token in tokens:
+        lexicon.add(token)
+
+
+def add_many(lexicon, tokens):
+    lexicon.add_many(tokens)
+
+
+def main(repeats=10):
+    sentences = load_sentences()
+    tokens = [token for sentence in sentences for token in sentence]
+    print('%d tokens, %d distinct' % (len(tokens), len(set(tokens))))
+    print('add:       %.1f ms' % (best_time(add_each, sentences, repeats) * 1000))
+    print('add_many:  %.1f ms' % (best_time(add_many, sentences, repeats) * 1000))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+bench_model_memory
+~~~~~~~~~~~~~~~~~~
+
+Measure the memory used by large numbers of extracted records.
+
+Run with ``python bench_model_memory.py [count]``. Requires Python 3 for tracemalloc.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import gc
+import sys
+import time
+import tracemalloc
+
+from chemdataextractor.model import Compound, IrPeak, NmrPeak, UvvisPeak
+
+
+def measure(name, factory, count):
+    """Create count records using factory and print the memory and time taken."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.time()
+    records = [factory(i) for i in range(count)]
+    elapsed = time.time() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('%-10s %10d records %8.1f MB %6.1f bytes/record %6.2f s' % (
+        name, len(records), current / 1e6, current / len(records), elapsed
+    ))
+    del records
+
+
+def main(count=1000000):
+    # Share the value strings between records so only the cost of the records themselves is measured
+    shift, multiplicity, number = '7.26', 's', '1H'
+    measure('NmrPeak', lambda i: NmrPeak(shift=shift, multiplicity=multiplicity, number=number), count)
+    measure('IrPeak', lambda i: IrPeak(value=shift, units='cm−1'), count)
+    measure('UvvisPeak', lambda i: UvvisPeak(value=shift, units='nm'), count)
+    measure('Compound', lambda i: Compound(), count // 10)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
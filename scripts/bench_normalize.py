@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+bench_normalize
+~~~~~~~~~~~~~~~
+
+Measure the throughput of the normalizers on the whitespace-separated tokens and the paragraphs of the documents in
+tests/data.
+
+Run with ``python bench_normalize.py [repeats]``.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import io
+import os
+import sys
+import time
+
+from chemdataextractor.reader import AcsHtmlReader, RscHtmlReader, UsptoXmlReader
+from chemdataextractor.text.normalize import normalize, strict_normalize, excess_normalize, chem_normalize
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'data')
+INPUTS = [
+    (AcsHtmlReader(), os.path.join(DATA_DIR, 'acs', 'acs.jmedchem.6b00723.html')),
+    (RscHtmlReader(), os.path.join(DATA_DIR, 'rsc', '10.1039_C6OB02074G.html')),
+    (UsptoXmlReader(), os.path.join(DATA_DIR, 'uspto', 'US06840965B2.xml')),
+]
+NORMALIZERS = [
+    ('normalize', normalize),
+    ('strict_normalize', strict_normalize),
+    ('excess_normalize', excess_normalize),
+    ('chem_normalize', chem_normalize),
+]
+
+
+def load_texts():
+    """Return the paragraph texts of the test documents."""
+    texts = []
+    for reader, path in INPUTS:
+        with io.open(path, 'rb') as f:
+            texts.extend(el.text for el in reader.readstring(f.read()).elements if hasattr(el, 'text'))
+    return texts
+
+
+def throughput(normalizer, texts, repeats):
+    """Return the best number of texts normalized per second over a number of repeats."""
+    best = None
+    for _ in range(repeats):
+        start = time.time()
+        for text in texts:
+            normalizer(text)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(texts) / best
+
+
+def main(repeats=5):
+    paragraphs = load_texts()
+    tokens = [token for text in paragraphs for token in text.split()]
+    print('%d tokens, %d paragraphs' % (len(tokens), len(paragraphs)))
+    for name, normalizer in NORMALIZERS:
+        print('%-18s %10.0f tokens/s %10.0f paragraphs/s' % (
+            name, throughput(normalizer, tokens, repeats), throughput(normalizer, paragraphs, repeats)
+        ))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+bench_readers
+~~~~~~~~~~~~~
+
+Time reader parsing of the documents in tests/data.
+
+Run with ``python bench_readers.py [repeats]``.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import io
+import os
+import sys
+import time
+
+from chemdataextractor.reader import AcsHtmlReader, RscHtmlReader, UsptoXmlReader
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'data')
+INPUTS = [
+    (AcsHtmlReader(), os.path.join(DATA_DIR, 'acs', 'acs.jmedchem.6b00723.html')),
+    (RscHtmlReader(), os.path.join(DATA_DIR, 'rsc', '10.1039_C6OB02074G.html')),
+    (UsptoXmlReader(), os.path.join(DATA_DIR, 'uspto', 'US06840965B2.xml')),
+]
+
+
+def main(repeats=20):
+    for reader, path in INPUTS:
+        with io.open(path, 'rb') as f:
+            fstring = f.read()
+        start = time.time()
+        first = reader.readstring(fstring)
+        first_time = time.time() - start
+        times = []
+        for _ in range(repeats):
+            start = time.time()
+            reader.readstring(fstring)
+            times.append(time.time() - start)
+        print('%-15s %4d elements  first %.1f ms  best %.1f ms  mean %.1f ms' % (
+            reader.__class__.__name__, len(first.elements), first_time * 1000, min(times) * 1000,
+            sum(times) / len(times) * 1000
+        ))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+bench_table_cells
+~~~~~~~~~~~~~~~~~
+
+Time table record extraction on the RSC and ACS test documents and a long synthetic table, without sharing cell
+results, sharing them within each table, and sharing them between all tables.
+
+Run with ``python bench_table_cells.py [repeats] [--rule-based]``. Requires the ChemDataExtractor data files
+(``cde data download``), unless ``--rule-based`` is given to tag cells with rule-based stand-ins for the models.
+
+Heading parses are cached for the whole process, so they are parsed in a first run that isn't timed.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+from collections import Counter
+import io
+import os
+import sys
+import time
+
+from chemdataextractor import Document
+from chemdataextractor.benchmark import generate_table_html, use_rule_based_taggers
+from chemdataextractor.doc import Table
+from chemdataextractor.utils import BoundedCache
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'data')
+PATHS = [
+    os.path.join(DATA_DIR, 'rsc', '10.1039_C6OB02074G.html'),
+    os.path.join(DATA_DIR, 'acs', 'acs.jmedchem.6b00723.html'),
+]
+
+
+def load_tables(rule_based=False):
+    """Read the test documents and the synthetic table and return a fresh list of their tables."""
+    tables = []
+    for path in PATHS:
+        with io.open(path, 'rb') as f:
+            tables.extend(Document.from_file(f, fname=os.path.basename(path)).tables)
+    tables.extend(Document.from_string(generate_table_html(), fname='table.html').tables)
+    if rule_based:
+        for table in tables:
+            use_rule_based_taggers(table)
+    return tables
+
+
+def run(cell_cache, repeats, rule_based=False):
+    """Return the best time to get the records of all tables over a number of repeats."""
+    Table.cell_cache = cell_cache
+    best = None
+    for _ in range(repeats):
+        if cell_cache is not None:
+            cell_cache.clear()
+        tables = load_tables(rule_based)
+        start = time.time()
+        for table in tables:
+            table.records
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(repeats=3, rule_based=False):
+    tables = load_tables(rule_based)
+    texts = Counter(cell.text for table in tables for row in table.headings + table.rows for cell in row)
+    print('%d tables, %d cells, %d distinct cell texts' % (len(tables), sum(texts.values()), len(texts)))
+    for table in tables:
+        table.records
+    print('No sharing:             %.3f s' % run(BoundedCache(maxsize=0), repeats, rule_based))
+    print('Per table interning:    %.3f s' % run(None, repeats, rule_based))
+    worker_cache = BoundedCache(maxsize=100000)
+    print('Worker-wide interning:  %.3f s' % run(worker_cache, repeats, rule_based))
+    print('Worker cache: %s' % worker_cache.stats())
+
+
+if __name__ == '__main__':
+    args = [arg for arg in sys.argv[1:] if arg != '--rule-based']
+    main(int(args[0]) if args else 3, rule_based='--rule-based' in sys.argv[1:])
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+bench_tokenize
+~~~~~~~~~~~~~~
+
+Time word tokenization of the paragraphs in the documents in tests/data, and of all their text joined into one long
+sentence.
+
+Run with ``python bench_tokenize.py [repeats]``.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import io
+import os
+import sys
+import time
+
+from chemdataextractor.nlp.tokenize import ChemWordTokenizer, FineWordTokenizer, WordTokenizer
+from chemdataextractor.reader import AcsHtmlReader, RscHtmlReader, UsptoXmlReader
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'data')
+INPUTS = [
+    (AcsHtmlReader(), os.path.join(DATA_DIR, 'acs', 'acs.jmedchem.6b00723.html')),
+    (RscHtmlReader(), os.path.join(DATA_DIR, 'rsc', '10.1039_C6OB02074G.html')),
+    (UsptoXmlReader(), os.path.join(DATA_DIR, 'uspto', 'US06840965B2.xml')),
+]
+
+
+def load_texts():
+    """Return the text of each paragraph of the test documents."""
+    texts = []
+    for reader, path in INPUTS:
+        with io.open(path, 'rb') as f:
+            for el in reader.readstring(f.read()).elements:
+                if hasattr(el, 'text') and el.text:
+                    texts.append(el.text)
+    return texts
+
+
+def best_time(tokenizer, texts, repeats):
+    """Return the best time to tokenize all texts, starting each time with an empty chunk cache."""
+    best = None
+    for _ in range(repeats):
+        tokenizer.chunk_cache.clear()
+        start = time.time()
+        for text in texts:
+            tokenizer.span_tokenize(text)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(repeats=10):
+    texts = load_texts()
+    long_text = [' '.join(texts)]
+    print('%d paragraphs, %d characters' % (len(texts), len(long_text[0])))
+    for tokenizer in [WordTokenizer(), ChemWordTokenizer(), FineWordTokenizer()]:
+        name = tokenizer.__class__.__name__
+        paragraphs_time = best_time(tokenizer, texts, repeats)
+        hit_rate = tokenizer.chunk_cache.stats()['hit_rate']
+        print('%-18s paragraphs %.1f ms  one sentence %.1f ms  chunk cache hit rate %.2f' % (
+            name, paragraphs_time * 1000, best_time(tokenizer, long_text, repeats) * 1000, hit_rate
+        ))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+test_batch
+~~~~~~~~~~
+
+Test resumable, sharded batch extraction.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from chemdataextractor.batch import (Checkpoint, checkpoint_path, find_documents, in_shard, output_path, parse_shard,
+                                     read_manifest, run_batch, write_atomic)
+
+
+logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.input_dir = os.path.join(self.dir, 'input')
+        self.output_dir = os.path.join(self.dir, 'output')
+        self._write('input/empty.html', b'<html><body></body></html>')
+        self._write('input/sub/empty.html', b'<html><body></body></html>')
+        # Archives with more than one file can't be read as a single document
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as z:
+            z.writestr('a.html', '<html></html>')
+            z.writestr('b.html', '<html></html>')
+        self._write('input/broken.zip', archive.getvalue())
+        self._write('input/.hidden.html', b'<html><body></body></html>')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _write(self, name, contents):
+        path = os.path.join(self.dir, *name.split('/'))
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with io.open(path, 'wb') as f:
+            f.write(contents)
+        return path
+
+    def test_parse_shard(self):
+        """Test parsing INDEX/COUNT shards."""
+        self.assertEqual((2, 8), parse_shard('2/8'))
+        for value in ['8/8', '-1/8', '0/0', '1', 'a/b']:
+            with self.assertRaises(ValueError):
+                parse_shard(value)
+
+    def test_in_shard(self):
+        """Test each document is in exactly one shard."""
+        names = ['doc%s.html' % i for i in range(100)]
+        shards = [[name for name in names if in_shard(name, (i, 4))] for i in range(4)]
+        self.assertEqual(sorted(names), sorted(sum(shards, [])))
+        self.assertTrue(all(shards))
+        self.assertTrue(all(in_shard(name, (0, 1)) for name in names))
+
+    def test_find_documents(self):
+        """Test documents are found in subdirectories, skipping hidden files."""
+        documents = find_documents(self.input_dir)
+        self.assertEqual(['broken.zip', 'empty.html', 'sub/empty.html'], [name for name, path in documents])
+        self.assertTrue(all(os.path.isfile(path) for name, path in documents))
+
+    def test_read_manifest(self):
+        """Test manifest paths are relative to the manifest, and names don't go outside the output directory."""
+        manifest = self._write('manifest.txt', b'# Documents\ninput/empty.html\n\n../other/doc.html\n')
+        self.assertEqual([
+            ('input/empty.html', os.path.join(self.dir, 'input/empty.html')),
+            ('other/doc.html', os.path.join(self.dir, '../other/doc.html')),
+        ], read_manifest(manifest))
+
+    def test_write_atomic(self):
+        """Test writing a file replaces it and leaves no temporary files."""
+        path = os.path.join(self.output_dir, 'a', 'out.json')
+        write_atomic(path, '[1]')
+        write_atomic(path, '[2]')
+        self.assertEqual(['out.json'], os.listdir(os.path.dirname(path)))
+        with io.open(path, encoding='utf8') as f:
+            self.assertEqual('[2]', f.read())
+
+    def test_run_batch(self):
+        """Test outputs and checkpoint entries are written, and finished documents are skipped when resumed."""
+        documents = find_documents(self.input_dir)
+        checkpoint = Checkpoint(checkpoint_path(self.output_dir))
+        summary = run_batch(documents, self.output_dir, checkpoint)
+        self.assertEqual({'processed': 2, 'failed': 1, 'skipped': 0, 'records': 0}, summary)
+        with io.open(output_path(self.output_dir, 'sub/empty.html'), encoding='utf8') as f:
+            self.assertEqual([], json.load(f))
+        self.assertFalse(os.path.exists(output_path(self.output_dir, 'broken.zip')))
+        # A run interrupted while writing the checkpoint leaves a partial line
+        with io.open(checkpoint.path, 'a', encoding='utf8') as f:
+            f.write('{"name": "sub/em')
+        checkpoint = Checkpoint(checkpoint.path)
+        self.assertEqual('failed', checkpoint.entries['broken.zip']['status'])
+        self.assertEqual('done', checkpoint.entries['sub/empty.html']['status'])
+        summary = run_batch(documents, self.output_dir, checkpoint)
+        self.assertEqual({'processed': 0, 'failed': 0, 'skipped': 3, 'records': 0}, summary)
+        summary = run_batch(documents, self.output_dir, checkpoint, retry_failed=True)
+        self.assertEqual({'processed': 0, 'failed': 1, 'skipped': 2, 'records': 0}, summary)
+
+    def test_checkpoint(self):
+        """Test a partly written last line is removed, so entries recorded after it can be read again."""
+        checkpoint = Checkpoint(os.path.join(self.output_dir, 'checkpoint.jsonl'))
+        checkpoint.record({'name': 'a.html', 'status': 'done'})
+        with io.open(checkpoint.path, 'a', encoding='utf8') as f:
+            f.write('{"name": "b.ht')
+        checkpoint = Checkpoint(checkpoint.path)
+        self.assertEqual(['a.html'], list(checkpoint.entries))
+        checkpoint.record({'name': 'b.html', 'status': 'failed'})
+        checkpoint = Checkpoint(checkpoint.path)
+        self.assertEqual({'a.html': 'done', 'b.html': 'failed'},
+                         {name: entry['status'] for name, entry in checkpoint.entries.items()})
+
+    def test_run_batch_shards(self):
+        """Test shards with separate checkpoints process every document once between them."""
+        documents = find_documents(self.input_dir)
+        names = []
+        for i in range(3):
+            checkpoint = Checkpoint(checkpoint_path(self.output_dir, (i, 3)))
+            run_batch(documents, self.output_dir, checkpoint, shard=(i, 3))
+            names.extend(checkpoint.entries)
+        self.assertEqual(['broken.zip', 'empty.html', 'sub/empty.html'], sorted(names))
+
+
+if __name__ == '__main__':
+    unittest.main()
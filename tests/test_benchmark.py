@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+test_benchmark
+~~~~~~~~~~~~~~
+
+Test the synthetic document generator and benchmark results.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import json
+import logging
+import unittest
+
+from chemdataextractor.benchmark import best_time, generate_html, generate_table_html, generate_text, load_inputs, run, \
+    format_results, use_rule_based_taggers
+from chemdataextractor.doc import Document, Heading, Paragraph, Table, Title
+
+
+logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+
+class TestSyntheticDocuments(unittest.TestCase):
+
+    def test_html(self):
+        """Test the synthetic HTML document has the requested paragraphs and tables."""
+        d = Document.from_string(generate_html(paragraphs=12, tables=3), fname='synthetic.html')
+        self.assertEqual(12, len([el for el in d.elements if isinstance(el, Paragraph)]))
+        self.assertEqual(12, len([el for el in d.elements if isinstance(el, Heading)]))
+        self.assertIsInstance(d.elements[0], Title)
+        tables = [el for el in d.elements if isinstance(el, Table)]
+        self.assertEqual(3, len(tables))
+        self.assertEqual(['Compound', 'λabs/nm', 'λem/nm', 'ΦF', 'Mp/°C'], [c.text for c in tables[0].headings[0]])
+        self.assertEqual(4, len(tables[0].rows))
+        paragraph = d.paragraphs[0].text
+        for statement in ['1H NMR (400 MHz, CDCl3): δ ', 'IR (KBr): ν ', 'Mp ']:
+            self.assertIn(statement, paragraph)
+
+    def test_table(self):
+        """Test the synthetic table has the requested rows and can be processed with rule-based taggers."""
+        d = Document.from_string(generate_table_html(rows=20), fname='table.html')
+        self.assertEqual(1, len(d.tables))
+        table = d.tables[0]
+        self.assertEqual(20, len(table.rows))
+        self.assertEqual(['Compound', 'Solvent', 'λabs/nm', 'ΦF', 'Mp/°C'], [c.text for c in table.headings[0]])
+        use_rule_based_taggers(table)
+        records = table.records
+        self.assertEqual(['1a'], records[0].labels)
+        self.assertEqual(1, len(records[0].uvvis_spectra))
+
+    def test_text(self):
+        """Test the synthetic plain text document is read as one paragraph for each heading and procedure."""
+        d = Document.from_string(generate_text(paragraphs=5), fname='synthetic.txt')
+        self.assertEqual(11, len(d.elements))
+
+    def test_seed(self):
+        """Test the same seed always generates the same document."""
+        self.assertEqual(generate_html(seed=3), generate_html(seed=3))
+        self.assertNotEqual(generate_html(seed=3), generate_html(seed=4))
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_results(self):
+        """Test benchmark results are JSON serializable and name the reader used."""
+        data = run(load_inputs(paragraphs=2, tables=1), repeats=1, stages=False)
+        data = json.loads(json.dumps(data))
+        readers = [(r['input'], r['component']) for r in data['results'] if r['benchmark'] == 'reader']
+        self.assertEqual([('synthetic.html', 'HtmlReader'), ('synthetic.txt', 'PlainTextReader')], readers)
+        for result in data['results']:
+            self.assertTrue(result['best_time'] is not None or result['error'])
+        self.assertEqual(len(data['results']) + 2, len(format_results(data).splitlines()))
+
+    def test_repeats(self):
+        """Test benchmarks must be run at least once."""
+        with self.assertRaises(ValueError):
+            best_time(lambda _: None, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
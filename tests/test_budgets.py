@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+test_budgets
+~~~~~~~~~~~~
+
+Micro-benchmarks that check the hot components of the pipeline stay within a time budget.
+
+These are skipped unless the CDE_BENCHMARK environment variable is set::
+
+    CDE_BENCHMARK=1 python -m pytest tests/test_budgets.py
+
+Budgets are the best time of several runs, in seconds, on a typical developer machine. Set CDE_BENCHMARK_TOLERANCE to
+multiply them, e.g. to 2 on a slower machine. Benchmarks of components that need models are skipped if the models
+aren't installed.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import io
+import logging
+import os
+import unittest
+
+from lxml import etree
+
+from chemdataextractor.benchmark import best_time, generate_html, generate_table_html, generate_text, \
+    use_rule_based_taggers
+from chemdataextractor.doc import Document, Paragraph, Table
+from chemdataextractor.errors import ModelNotFoundError
+from chemdataextractor.nlp.cem import CemTagger, CrfCemTagger
+from chemdataextractor.nlp.lexicon import Lexicon
+from chemdataextractor.nlp.tag import DictionaryTagger
+from chemdataextractor.nlp.tokenize import ChemWordTokenizer
+from chemdataextractor.reader import RscHtmlReader
+from chemdataextractor.scrape.clean import clean
+from chemdataextractor.utils import BoundedCache
+
+
+logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+
+#: Whether to run the benchmarks.
+ENABLED = bool(os.environ.get('CDE_BENCHMARK'))
+#: Factor to multiply all budgets by.
+TOLERANCE = float(os.environ.get('CDE_BENCHMARK_TOLERANCE', 1))
+#: Number of times to run each benchmark.
+REPEATS = 5
+
+RSC_PATH = os.path.join(os.path.dirname(__file__), 'data', 'rsc', '10.1039_C6OB02074G.html')
+
+#: Sentences tagged as they would be by the part of speech and chemical entity taggers, for the parser benchmarks.
+TAGGED_SENTENCES = [
+    [('To', 'TO'), ('a', 'DT'), ('solution', 'NN'), ('of', 'IN'), ('4-bromophenol', 'B-CM'), ('(', '-LRB-'),
+     ('1a', 'CD'), (')', '-RRB-'), ('(', '-LRB-'), ('2.50', 'CD'), ('g', 'NN'), (',', ','), ('14.5', 'CD'),
+     ('mmol', 'NN'), (')', '-RRB-'), ('in', 'IN'), ('THF', 'B-CM'), ('(', '-LRB-'), ('20', 'CD'), ('mL', 'NN'),
+     (')', '-RRB-'), ('was', 'VBD'), ('added', 'VBN'), ('NaH', 'B-CM'), ('(', '-LRB-'), ('0.60', 'CD'), ('g', 'NN'),
+     (',', ','), ('15.0', 'CD'), ('mmol', 'NN'), (')', '-RRB-'), ('and', 'CC'), ('the', 'DT'), ('mixture', 'NN'),
+     ('was', 'VBD'), ('stirred', 'VBN'), ('at', 'IN'), ('25', 'CD'), ('°C', 'NN'), ('for', 'IN'), ('2', 'CD'),
+     ('h', 'NN'), ('to', 'TO'), ('give', 'VB'), ('4-bromoanisole', 'B-CM'), ('(', '-LRB-'), ('2a', 'CD'),
+     (')', '-RRB-'), ('as', 'IN'), ('a', 'DT'), ('white', 'JJ'), ('solid', 'NN'), ('(', '-LRB-'), ('2.10', 'CD'),
+     ('g', 'NN'), (',', ','), ('78', 'CD'), ('%', 'NN'), (')', '-RRB-'), (':', ':'), ('mp', 'NN'), ('142', 'CD'),
+     ('–', ':'), ('144', 'CD'), ('°C', 'NN'), ('.', '.')],
+    [('1H', 'NNP'), ('NMR', 'NNP'), ('(', '-LRB-'), ('400', 'CD'), ('MHz', 'NNS'), (',', ','), ('CDCl3', 'B-CM'),
+     (')', '-RRB-'), (':', ':'), ('δ', 'NN'), ('7.26', 'CD'), ('(', '-LRB-'), ('d', 'NN'), (',', ','), ('J', 'NN'),
+     ('=', 'JJ'), ('8.4', 'CD'), ('Hz', 'NNP'), (',', ','), ('2H', 'CD'), (')', '-RRB-'), (',', ','), ('6.80', 'CD'),
+     ('(', '-LRB-'), ('d', 'NN'), (',', ','), ('J', 'NN'), ('=', 'JJ'), ('8.4', 'CD'), ('Hz', 'NNP'), (',', ','),
+     ('2H', 'CD'), (')', '-RRB-'), (',', ','), ('3.81', 'CD'), ('(', '-LRB-'), ('s', 'NN'), (',', ','),
+     ('3H', 'CD'), (')', '-RRB-'), ('.', '.')],
+    [('IR', 'NNP'), ('(', '-LRB-'), ('KBr', 'B-CM'), (')', '-RRB-'), (':', ':'), ('ν', 'NN'), ('3420', 'CD'),
+     (',', ','), ('1715', 'CD'), (',', ','), ('1600', 'CD'), ('cm−1', 'NN'), ('.', '.')],
+    [('UV-vis', 'JJ'), ('(', '-LRB-'), ('CH2Cl2', 'B-CM'), (')', '-RRB-'), (':', ':'), ('λmax', 'NN'),
+     ('(', '-LRB-'), ('ε', 'NN'), (')', '-RRB-'), ('=', 'JJ'), ('340', 'CD'), ('(', '-LRB-'), ('12', 'CD'),
+     ('500', 'CD'), (')', '-RRB-'), (',', ','), ('420', 'CD'), ('nm', 'NN'), ('(', '-LRB-'), ('8', 'CD'),
+     ('200', 'CD'), (')', '-RRB-'), ('.', '.')],
+    [('The', 'DT'), ('glass', 'NN'), ('transition', 'NN'), ('temperature', 'NN'), ('(', '-LRB-'), ('Tg', 'NN'),
+     (')', '-RRB-'), ('of', 'IN'), ('polymer', 'NN'), ('3', 'CD'), ('was', 'VBD'), ('105', 'CD'), ('°C', 'NN'),
+     ('.', '.')],
+    [('The', 'DT'), ('reaction', 'NN'), ('was', 'VBD'), ('carried', 'VBN'), ('out', 'RP'), ('in', 'IN'),
+     ('ethanol', 'B-CM'), ('at', 'IN'), ('80', 'CD'), ('°C', 'NN'), ('under', 'IN'), ('nitrogen', 'B-CM'),
+     ('.', '.')],
+]
+
+
+class _BenchmarkLexicon(Lexicon):
+    pass
+
+
+def _read_rsc():
+    with io.open(RSC_PATH, 'rb') as f:
+        return f.read()
+
+
+def _texts():
+    """Return the paragraph texts of a synthetic document."""
+    return generate_text(paragraphs=50).decode('utf-8').split('\n\n')
+
+
+def _token_lists():
+    """Return the tokens of each paragraph of a synthetic document."""
+    tokenizer = ChemWordTokenizer()
+    return [tokenizer.tokenize(text) for text in _texts()]
+
+
+@unittest.skipUnless(ENABLED, 'Set CDE_BENCHMARK to run benchmarks')
+class TestBudgets(unittest.TestCase):
+
+    def assertWithinBudget(self, budget, func, setup=None, name=None):
+        """Assert that the best time of func, passed the result of setup, is within budget seconds."""
+        name = name or self.id()
+        try:
+            first, best = best_time(func, REPEATS, setup=setup)
+        except (ModelNotFoundError, IOError) as e:
+            # CRF models are opened directly by pycrfsuite, which raises IOError if they are missing
+            raise unittest.SkipTest(e)
+        log.info('%s: best %.6fs, first %.6fs, budget %.6fs' % (name, best, first, budget * TOLERANCE))
+        self.assertLessEqual(best, budget * TOLERANCE, '%s: %.6fs over budget of %.6fs' % (name, best, budget * TOLERANCE))
+
+    def test_word_tokenizer(self):
+        """ChemWordTokenizer.span_tokenize for 100 synthetic paragraphs, without the chunk cache."""
+        tokenizer = ChemWordTokenizer()
+        texts = _texts()
+        self.assertWithinBudget(0.2, lambda _: [tokenizer.span_tokenize(text) for text in texts],
+                                setup=tokenizer.chunk_cache.clear)
+
+    def test_lexicon_add(self):
+        """Lexicon.add for each token of 100 synthetic paragraphs, starting from an empty Lexicon."""
+        lexicon = _BenchmarkLexicon()
+        tokens = [token for tokens in _token_lists() for token in tokens]
+
+        def setup():
+            lexicon.lexemes = {}
+
+        self.assertWithinBudget(0.2, lambda _: [lexicon.add(token) for token in tokens], setup=setup)
+
+    def test_crf_cem_features(self):
+        """CrfCemTagger._get_features for each token of 100 synthetic paragraphs."""
+        tagger = CrfCemTagger()
+        sentences = [[(token, 'NN') for token in tokens] for tokens in _token_lists()]
+        self.assertWithinBudget(0.5, lambda _: [
+            tagger._get_features(tokens, i) for tokens in sentences for i in range(len(tokens))
+        ])
+
+    def test_dictionary_tagger(self):
+        """DictionaryTagger.tag on 100 synthetic paragraphs, with a dictionary of the compound names in them."""
+        tokenizer = ChemWordTokenizer()
+        token_lists = _token_lists()
+        names = [text for text in _texts() if not text.startswith('A solution')]
+        tagger = DictionaryTagger(words=[tokenizer.tokenize(name) for name in names], lexicon=_BenchmarkLexicon())
+        self.assertWithinBudget(0.5, lambda _: [tagger.tag(tokens) for tokens in token_lists])
+
+    def test_cem_tagger(self):
+        """CemTagger.tag on the tagged parser benchmark sentences."""
+        tagger = CemTagger()
+        sentences = [[(token, tag if not tag.endswith('-CM') else 'NN') for token, tag in sentence]
+                     for sentence in TAGGED_SENTENCES]
+        self.assertWithinBudget(0.05, lambda _: [tagger.tag(sentence) for sentence in sentences])
+
+    def test_paragraph_parsers(self):
+        """Each Paragraph parser on the tagged parser benchmark sentences."""
+        budgets = {
+            'CompoundParser': 0.08,
+            'ChemicalLabelParser': 0.03,
+            'NmrParser': 0.03,
+            'IrParser': 0.01,
+            'UvvisParser': 0.01,
+            'MpParser': 0.8,
+            'TgParser': 0.2,
+            'ContextParser': 0.04,
+        }
+        for parser in Paragraph.parsers:
+            name = parser.__class__.__name__
+            self.assertWithinBudget(budgets[name], lambda _: [list(parser.parse(s)) for s in TAGGED_SENTENCES], name=name)
+
+    def test_table_records(self):
+        """Table.records for the tables of a synthetic document with 10 tables."""
+        html = generate_html(paragraphs=60, tables=10)
+
+        def setup():
+            return [el for el in Document.from_string(html, fname='synthetic.html').elements if hasattr(el, 'rows')]
+
+        self.assertWithinBudget(0.5, lambda tables: [table.records for table in tables], setup=setup)
+
+    def test_table_cells(self):
+        """Table.records for a long table with repeated cells, tagged with rule-based taggers, is faster with the cell
+        cache than without it."""
+        html = generate_table_html(rows=400)
+
+        def setup():
+            tables = Document.from_string(html, fname='table.html').tables
+            for table in tables:
+                use_rule_based_taggers(table)
+            return tables
+
+        try:
+            Table.cell_cache = BoundedCache(maxsize=0)
+            _, uncached = best_time(lambda tables: [table.records for table in tables], REPEATS, setup=setup)
+        finally:
+            Table.cell_cache = None
+        log.info('%s: best %.6fs without cell cache' % (self.id(), uncached))
+        self.assertWithinBudget(min(1.0, uncached), lambda tables: [table.records for table in tables], setup=setup)
+
+    def test_cleaner(self):
+        """Cleaner.__call__ on the RSC test document."""
+        contents = _read_rsc()
+        self.assertWithinBudget(0.02, clean, setup=lambda: etree.fromstring(contents, parser=etree.HTMLParser()))
+
+    def test_lxml_reader(self):
+        """LxmlReader.parse on the RSC test document."""
+        contents = _read_rsc()
+        reader = RscHtmlReader()
+        self.assertWithinBudget(0.1, lambda _: reader.parse(contents))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+test_data
+~~~~~~~~~
+
+Test loading, caching and unloading models.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import io
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from chemdataextractor.data import ModelCache, model_cache, unload_model
+from chemdataextractor.errors import ModelNotFoundError
+from chemdataextractor.nlp.lexicon import Lexicon
+from chemdataextractor.nlp.tag import CrfTagger, DictionaryTagger
+
+
+logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+
+class _User(object):
+    """Component that records when it is told to unload its model."""
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.unloaded = 0
+
+    def unload(self):
+        self.unloaded += 1
+        self.cache.release(self)
+
+
+class _WordCrfTagger(CrfTagger):
+    """CRF tagger with the word as the only feature."""
+
+    model = None
+
+    def _get_features(self, tokens, i):
+        return {'w': tokens[i]}
+
+
+class _ClusterLexicon(Lexicon):
+    pass
+
+
+class TestModelCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def _write(self, name, value):
+        path = os.path.join(self.dir, name)
+        with io.open(path, 'wb') as f:
+            f.write(value if isinstance(value, bytes) else pickle.dumps(value))
+        return path
+
+    def test_load(self):
+        """Test a model is loaded from disk once and then shared."""
+        cache = ModelCache()
+        path = self._write('a.pickle', {'a': 1})
+        model = cache.load(path)
+        self.assertIs(model, cache.load(path))
+        self.assertEqual((1, 1), (cache.loads, cache.models[0].hits))
+        self.assertGreater(cache.memory, 0)
+        self.assertIn(path, cache)
+        with self.assertRaises(ModelNotFoundError):
+            cache.load(os.path.join(self.dir, 'missing.pickle'))
+
+    def test_unload(self):
+        """Test unloading a model tells its users and loads it from disk again next time."""
+        cache = ModelCache()
+        path = self._write('a.pickle', {'a': 1})
+        user = _User(cache)
+        model = cache.load(path, user=user)
+        cache.unload(path)
+        self.assertEqual(1, user.unloaded)
+        self.assertEqual(0, len(cache))
+        self.assertIsNot(model, cache.load(path))
+        self.assertEqual(2, cache.loads)
+
+    def test_budget(self):
+        """Test the least recently loaded models are unloaded to stay within the budget, unused models first."""
+        cache = ModelCache()
+        paths = [self._write('%s.pickle' % i, list(range(1000))) for i in range(3)]
+        cache.load(paths[0])
+        size = cache.memory
+        cache.budget = size * 2
+        user = _User(cache)
+        other_user = _User(cache)
+        cache.load(paths[1], user=user)
+        cache.load(paths[2], user=other_user)
+        self.assertEqual([paths[1], paths[2]], [loaded.path for loaded in cache.models])
+        self.assertEqual(0, user.unloaded)
+        cache.load(paths[0])
+        self.assertEqual([paths[2], paths[0]], [loaded.path for loaded in cache.models])
+        self.assertEqual((1, 2), (user.unloaded, cache.evictions))
+
+    def test_register(self):
+        """Test models that each user loads a copy of are counted per copy, and removed when no longer used."""
+        cache = ModelCache()
+        path = self._write('a.dawg', b'x' * 100)
+        users = [_User(cache), _User(cache)]
+        for user in users:
+            cache.register(path, user)
+        self.assertEqual((2, 200), (cache.models[0].copies, cache.memory))
+        users[0].unload()
+        self.assertEqual(100, cache.memory)
+        users[1].unload()
+        self.assertEqual(0, len(cache))
+
+    def test_dictionary_tagger(self):
+        """Test a DictionaryTagger loads its DAWG again after it is unloaded."""
+        path = os.path.join(self.dir, 'dict.dawg')
+        DictionaryTagger(words=[['benzene'], ['acetic', 'acid']]).save(path)
+        tagger = DictionaryTagger(model=path)
+        tokens = ['Add', 'acetic', 'acid', 'to', 'benzene']
+        tags = tagger.tag(tokens)
+        self.assertIn(path, model_cache)
+        unload_model(path)
+        self.assertNotIn(path, model_cache)
+        self.assertEqual(tags, tagger.tag(tokens))
+        tagger.unload()
+        self.assertNotIn(path, model_cache)
+
+    def test_in_use(self):
+        """Test the models of a component that is in use aren't unloaded until the outermost call ends."""
+        cache = ModelCache()
+        paths = [self._write('%s.pickle' % i, list(range(1000))) for i in range(2)]
+        user = _User(cache)
+        other_user = _User(cache)
+        cache.load(paths[0], user=user)
+        cache.budget = cache.memory
+        with cache.in_use(user):
+            with cache.in_use(user):
+                cache.load(paths[1], user=other_user)
+            self.assertEqual((0, 2), (user.unloaded, len(cache)))
+        self.assertEqual((1, 1), (user.unloaded, cache.evictions))
+        self.assertEqual([paths[1]], [loaded.path for loaded in cache.models])
+
+    def test_unload_in_use(self):
+        """Test unloading a model that is in use waits until the component's outermost call ends."""
+        cache = ModelCache()
+        path = self._write('a.pickle', {'a': 1})
+        user = _User(cache)
+        cache.load(path, user=user)
+        with cache.in_use(user):
+            cache.unload(path)
+            self.assertEqual((0, 1), (user.unloaded, len(cache)))
+        self.assertEqual((1, 0), (user.unloaded, len(cache)))
+
+    def test_nested_load(self):
+        """Test a DictionaryTagger keeps its DAWG when its lexicon loads word clusters over the budget."""
+        path = os.path.join(self.dir, 'dict.dawg')
+        DictionaryTagger(words=[['benzene'], ['toluene']]).save(path)
+        lexicon = _ClusterLexicon()
+        lexicon.clusters_path = self._write('clusters.pickle', {'benzene': '0110', 'toluene': '0111'})
+        tagger = DictionaryTagger(model=path, lexicon=lexicon)
+        budget = model_cache.budget
+        model_cache.budget = os.path.getsize(path)
+        try:
+            tags = tagger.tag(['benzene', 'and', 'toluene'])
+        finally:
+            model_cache.budget = budget
+            tagger.unload()
+            lexicon.unload()
+        self.assertEqual([('benzene', 'B-CM'), ('and', None), ('toluene', 'B-CM')], tags)
+
+    def test_crf_tagger(self):
+        """Test a CrfTagger opens its model again after it is unloaded."""
+        path = os.path.join(self.dir, 'crf.model')
+        trainer = _WordCrfTagger(params={'max_iterations': 10})
+        trainer.train([[('Add', 'O'), ('benzene', 'B-CM')], [('benzene', 'B-CM'), ('boils', 'O')]], path)
+        trainer.unload()
+        tagger = _WordCrfTagger(model=path)
+        tags = tagger.tag(['Add', 'benzene'])
+        self.assertIn(path, model_cache)
+        unload_model(path)
+        self.assertFalse(tagger._loaded_model)
+        self.assertEqual(tags, tagger.tag(['Add', 'benzene']))
+        unload_model(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,10 +11,17 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
+import gzip
+import io
 import logging
+import os
+import shutil
+import tempfile
 import unittest
+import zipfile
 
-from chemdataextractor.doc.document import Document
+from chemdataextractor.doc.document import Document, SNIFF_SIZE
+from chemdataextractor.errors import ReaderError
 
 logging.basicConfig(level=logging.DEBUG)
 log = logging.getLogger(__name__)
@@ -60,5 +67,52 @@ class TestDocument(unittest.TestCase):
         self.assertEqual([e.text for e in d], els)
 
 
+class TestDocumentFromFile(unittest.TestCase):
+    """Test reading Documents from files on disk, compressed files and archives."""
+
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+        self.path = os.path.join(os.path.dirname(__file__), 'data', 'uspto', 'US06840965B2.xml')
+        with io.open(self.path, 'rb') as f:
+            self.content = f.read()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_path(self):
+        """Test Document can be read from a memory-mapped file on disk."""
+        self.assertEqual(len(Document.from_file(self.path).elements), 112)
+
+    def test_path_encoding(self):
+        """Test a memory-mapped file with non-ASCII text after the bytes used to detect its encoding is decoded."""
+        path = os.path.join(self.dirname, 'long.html')
+        with io.open(path, 'w', encoding='utf-8') as f:
+            f.write('<html><body><p>%s</p><p>λmax 340 nm</p></body></html>' % ('a' * SNIFF_SIZE))
+        self.assertEqual(Document.from_file(path).elements[1].text, 'λmax 340 nm')
+        path = os.path.join(self.dirname, 'long.txt')
+        with io.open(path, 'w', encoding='utf-8') as f:
+            f.write('%s\n\nλmax 340 nm' % ('a' * SNIFF_SIZE))
+        self.assertEqual(Document.from_file(path).elements[1].text, 'λmax 340 nm')
+
+    def test_gzip(self):
+        """Test Document can be read from a gzip compressed file."""
+        path = os.path.join(self.dirname, 'US06840965B2.xml.gz')
+        with gzip.GzipFile(path, 'wb') as f:
+            f.write(self.content)
+        self.assertEqual(len(Document.from_file(path).elements), 112)
+
+    def test_archive(self):
+        """Test Documents can be read from each file in a zip archive."""
+        path = os.path.join(self.dirname, 'patents.zip')
+        with zipfile.ZipFile(path, 'w') as f:
+            f.writestr('a.xml', self.content)
+            f.writestr('b.xml', self.content)
+        with self.assertRaises(ReaderError):
+            Document.from_file(path)
+        docs = list(Document.from_archive(path))
+        self.assertEqual([name for name, doc in docs], ['a.xml', 'b.xml'])
+        self.assertEqual([len(doc.elements) for name, doc in docs], [112, 112])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -14,8 +14,11 @@ from __future__ import unicode_literals
 import logging
 import unittest
 
+from chemdataextractor.benchmark import use_rule_based_taggers
 from chemdataextractor.doc.table import Table, Cell
-from chemdataextractor.doc.text import Caption
+from chemdataextractor.doc.text import Caption, Footnote
+from chemdataextractor.nlp.lexicon import Lexicon
+from chemdataextractor.nlp.tag import NoneTagger
 
 
 logging.basicConfig(level=logging.DEBUG)
@@ -127,5 +130,63 @@ class TestTable(unittest.TestCase):
 
         self.assertEqual(gold, [record.serialize() for record in t.records])
 
+
+class TestCell(unittest.TestCase):
+    """Cell annotation sharing tests."""
+
+    def test_footnotes(self):
+        """Test records from footnotes referenced by the caption, a heading and a cell are merged into each row."""
+        t = Table(
+            caption=Caption('Photophysical properties of the dyes', references=['c']),
+            headings=[[Cell('Compound'), Cell('λabs/nm', references=['a']), Cell('ΦF'), Cell('Mp/°C')]],
+            rows=[
+                [Cell('1a'), Cell('340'), Cell('0.52'), Cell('142–144')],
+                [Cell('1b'), Cell('352'), Cell('0.61'), Cell('150–151')],
+                [Cell('1c'), Cell('348'), Cell('0.40', references=['b']), Cell('160–162')]
+            ],
+            footnotes=[
+                Footnote('Measured in CH2Cl2 at 298 K.', id='a'),
+                Footnote('Measured at 77 K.', id='b'),
+                Footnote('Measured at 298 K.', id='c')
+            ]
+        )
+        use_rule_based_taggers(t)
+        uvvis = {'solvent': 'CH2Cl2', 'temperature': '298', 'temperature_units': 'K'}
+        gold = []
+        for label, peak, qy, temperature in [('1a', '340', '0.52', '298'), ('1b', '352', '0.61', '298'),
+                                             ('1c', '348', '0.40', '77')]:
+            gold.append({
+                'labels': [label],
+                'uvvis_spectra': [dict(uvvis, peaks=[{'value': peak, 'units': 'nm'}])],
+                'quantum_yields': [{'value': qy, 'type': 'ΦF', 'temperature': temperature, 'temperature_units': 'K'}]
+            })
+        self.assertEqual(gold, t.records.serialize())
+
+    def test_annotate_shared(self):
+        """Test cells with identical text share tokens and tags."""
+        lexicon = Lexicon()
+        tagger = NoneTagger()
+        cache = {}
+        c1 = Cell('240 (dec)', lexicon=lexicon, pos_tagger=tagger)
+        c2 = Cell('240 (dec)', lexicon=lexicon, pos_tagger=tagger)
+        c1.annotate(cache)
+        c2.annotate(cache)
+        self.assertIs(c1.tokens, c2.tokens)
+        self.assertEqual(c2.tagged_tokens, [('240', None), ('(', None), ('dec', None), (')', None)])
+
+    def test_annotate_different(self):
+        """Test cells with different text or taggers are annotated separately."""
+        lexicon = Lexicon()
+        tagger = NoneTagger()
+        cache = {}
+        c1 = Cell('240', lexicon=lexicon, pos_tagger=tagger)
+        c2 = Cell('241', lexicon=lexicon, pos_tagger=tagger)
+        c3 = Cell('240', lexicon=lexicon, pos_tagger=NoneTagger())
+        for cell in [c1, c2, c3]:
+            cell.annotate(cache)
+        self.assertEqual(c2.raw_tokens, ['241'])
+        self.assertIsNot(c1.tokens, c3.tokens)
+
+
 if __name__ == '__main__':
     unittest.main()
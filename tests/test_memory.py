@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+test_memory
+~~~~~~~~~~~
+
+Test reporting and limiting the memory used by caches.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import logging
+import sys
+import unittest
+
+from chemdataextractor.doc import Document
+from chemdataextractor.doc.text import Sentence
+from chemdataextractor.memory import approximate_size, clear_caches, format_memory_report, memory_report, set_cache_limit
+from chemdataextractor.nlp.lexicon import Lexicon
+from chemdataextractor.utils import BoundedCache, cache_limits
+
+
+logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+
+class _MemoryLexicon(Lexicon):
+    pass
+
+
+class TestApproximateSize(unittest.TestCase):
+
+    def test_containers(self):
+        """Test the contents of containers are counted, and shared objects only once."""
+        value = 'x' * 1000
+        self.assertGreater(approximate_size([value]), 1000)
+        self.assertLess(approximate_size([value, value]), 2000)
+        self.assertGreater(approximate_size({'a': [value], 'b': ['y' * 1000]}), 2000)
+
+    def test_sample(self):
+        """Test the size of a large container is estimated from a sample of its items."""
+        values = ['%05d' % i for i in range(10000)]
+        exact = approximate_size(values, sample=len(values))
+        self.assertAlmostEqual(exact, approximate_size(values, sample=100), delta=exact * 0.01)
+
+    def test_exclude(self):
+        """Test excluded types are not counted."""
+        lexicon = _MemoryLexicon()
+        self.assertEqual(sys.getsizeof([lexicon], 0), approximate_size([lexicon], exclude=(Lexicon,)))
+
+
+class TestMemoryReport(unittest.TestCase):
+
+    def tearDown(self):
+        cache_limits.pop('test_memory.cache', None)
+        cache_limits.pop('lexicon._MemoryLexicon', None)
+        _MemoryLexicon().max_lexemes = None
+
+    def test_caches(self):
+        """Test named caches are reported together, cleared and limited."""
+        caches = [BoundedCache(maxsize=10, name='test_memory.cache') for _ in range(2)]
+        for i in range(6):
+            caches[i % 2][i] = 'value %s' % i
+        report = memory_report()
+        self.assertEqual(6, report['test_memory.cache']['entries'])
+        self.assertEqual(10, report['test_memory.cache']['maxsize'])
+        self.assertGreater(report['test_memory.cache']['bytes'], 0)
+        set_cache_limit('test_memory.cache', 2)
+        self.assertEqual([2, 2], [len(cache) for cache in caches])
+        self.assertEqual(2, BoundedCache(maxsize=10, name='test_memory.cache').maxsize)
+        clear_caches()
+        self.assertEqual([0, 0], [len(cache) for cache in caches])
+
+    def test_lexicon(self):
+        """Test lexicons are reported and limited."""
+        lexicon = _MemoryLexicon()
+        lexicon.add_many(['a', 'b', 'c'])
+        self.assertEqual(len(lexicon), memory_report()['lexicon._MemoryLexicon']['entries'])
+        set_cache_limit('lexicon._MemoryLexicon', 4)
+        lexicon.add_many(['d', 'e'])
+        self.assertLessEqual(len(lexicon), 4)
+        for text in ['f', 'g', 'h', 'i', 'j']:
+            lexicon.add(text)
+            self.assertLessEqual(len(lexicon), 4)
+        self.assertEqual('j', lexicon['j'].text)
+
+    def test_document(self):
+        """Test the memoized values of documents are reported and cleared."""
+        sentence = Sentence('The mixture was stirred at 25 °C.', lexicon=_MemoryLexicon())
+        d = Document(sentence)
+        self.assertEqual(0, memory_report(documents=[d])['document.0']['entries'])
+        tokens = sentence.tokens
+        report = memory_report(documents=[d])
+        self.assertEqual(1, report['document.0']['entries'])
+        self.assertGreater(report['document.0']['bytes'], 0)
+        self.assertIn('document.0', format_memory_report(report))
+        clear_caches(documents=[d])
+        self.assertEqual(0, memory_report(documents=[d])['document.0']['entries'])
+        self.assertEqual([t.text for t in tokens], [t.text for t in sentence.tokens])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,10 +11,17 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
+import copy
+import json
 import logging
+import pickle
 import unittest
 
-from chemdataextractor.model import Compound, MeltingPoint, UvvisSpectrum, UvvisPeak
+import six
+from six.moves import copyreg
+
+from chemdataextractor.model import BaseModel, StringType, ListType, ModelType
+from chemdataextractor.model import Compound, MeltingPoint, ModelList, NmrPeak, NmrSpectrum, UvvisSpectrum, UvvisPeak
 
 
 logging.basicConfig(level=logging.DEBUG)
@@ -49,5 +56,195 @@ class TestModel(unittest.TestCase):
         self.assertEqual(Compound(uvvis_spectra=[UvvisSpectrum(peaks=[UvvisPeak(units='nm')])]).is_contextual, True)
 
 
+class TestModelStorage(unittest.TestCase):
+
+    def test_slots(self):
+        """Test the fields of built-in models are stored in slots instead of the per-instance dict."""
+        self.assertEqual(vars(NmrPeak(shift='7.26')), {})
+        self.assertEqual(vars(Compound(names=['Coumarin 343'])), {})
+        # Slots don't hide the docstrings of models
+        self.assertEqual(MeltingPoint.__doc__, 'A melting point measurement.')
+
+    def test_extra_attributes(self):
+        """Test attributes that aren't fields can be set on models."""
+        c = Compound(names=['Coumarin 343'])
+        c.source = 'test'
+        self.assertEqual(c.source, 'test')
+        self.assertEqual(c.serialize(), {'names': ['Coumarin 343']})
+        self.assertEqual(pickle.loads(pickle.dumps(c, pickle.HIGHEST_PROTOCOL)).source, 'test')
+
+    def test_multiple_inheritance(self):
+        """Test a model can inherit from several models that have fields."""
+
+        class Named(BaseModel):
+            name = StringType()
+
+        class Measured(BaseModel):
+            value = StringType()
+
+        class NamedMeasurement(Named, Measured):
+            pass
+
+        class NamedCompound(Compound, Named):
+            pass
+
+        m = NamedMeasurement(name='mp', value='240')
+        self.assertEqual(m.serialize(), {'name': 'mp', 'value': '240'})
+        c = NamedCompound(name='dye', names=['Coumarin 343'])
+        self.assertEqual(c.serialize(), {'name': 'dye', 'names': ['Coumarin 343']})
+
+    def test_dict_access(self):
+        """Test dictionary-style access still works."""
+        c = Compound(names=['Coumarin 343'])
+        self.assertEqual(c['names'], ['Coumarin 343'])
+        self.assertEqual(c.keys(), list(Compound.fields))
+        self.assertEqual(dict(c.items())['labels'], [])
+        c['labels'] = ['3a']
+        self.assertEqual(c.labels, ['3a'])
+        with self.assertRaises(KeyError):
+            c['nonexistent']
+
+    def test_default_list(self):
+        """Test default lists are independent between instances and keep in-place changes."""
+        c1 = Compound()
+        c2 = Compound()
+        c1.names.append('Coumarin 343')
+        self.assertEqual(c1.names, ['Coumarin 343'])
+        self.assertEqual(c2.names, [])
+        self.assertEqual(Compound.names.default, [])
+
+    def test_delete(self):
+        """Test deleting a field value restores the default."""
+        c = Compound(names=['Coumarin 343'])
+        del c.names
+        self.assertEqual(c.names, [])
+        p = NmrPeak(shift='7.26')
+        del p.shift
+        self.assertEqual(p.shift, None)
+
+    def test_equality(self):
+        """Test equality takes default values into account."""
+        self.assertEqual(Compound(), Compound(names=[]))
+        self.assertEqual(NmrPeak(shift='7.26'), NmrPeak(shift='7.26', intensity=None))
+        self.assertNotEqual(NmrPeak(shift='7.26'), NmrPeak(shift='7.27'))
+
+    def test_pickle(self):
+        """Test slotted models can be pickled."""
+        c = Compound(names=['Coumarin 343'], melting_points=[MeltingPoint(value='240', units='°C')])
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            self.assertEqual(pickle.loads(pickle.dumps(c, protocol)).serialize(), c.serialize())
+
+    def test_deepcopy(self):
+        """Test deep copies of models don't share mutable values."""
+        c = Compound(names=['Coumarin 343'], melting_points=[MeltingPoint(value='240', units='°C')])
+        c.source = ['test']
+        c2 = copy.deepcopy(c)
+        self.assertEqual(c2.serialize(), c.serialize())
+        self.assertEqual(c2.source, ['test'])
+        c2.names.append('C343')
+        c2.melting_points[0].value = '241'
+        c2.source.append('copy')
+        self.assertEqual(c.serialize(), {'names': ['Coumarin 343'], 'melting_points': [{'value': '240', 'units': '°C'}]})
+        self.assertEqual(c.source, ['test'])
+
+    def test_pickle_legacy(self):
+        """Test models pickled by versions that kept field values in a _values dict can be loaded."""
+
+        class LegacyCompound(object):
+            def __reduce__(self):
+                return copyreg._reconstructor, (Compound, object, None), {'_values': {'names': ['Coumarin 343'], 'labels': [], 'roles': None}}
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            c = pickle.loads(pickle.dumps(LegacyCompound(), protocol))
+            self.assertIsInstance(c, Compound)
+            self.assertEqual(c.names, ['Coumarin 343'])
+            self.assertEqual(c.serialize(), {'names': ['Coumarin 343']})
+
+    def test_added_field(self):
+        """Test fields added to a model class after creation are stored."""
+
+        class Spectrum(BaseModel):
+            solvent = StringType()
+
+        class Peak(BaseModel):
+            value = StringType()
+
+        Spectrum.peaks = ListType(ModelType(Peak))
+        s = Spectrum(solvent='CDCl3', peaks=[Peak(value='7.26')])
+        self.assertEqual(s.serialize(), {'solvent': 'CDCl3', 'peaks': [{'value': '7.26'}]})
+        self.assertEqual(Spectrum().peaks, [])
+
+
+class TestModelSerialize(unittest.TestCase):
+
+    maxDiff = None
+
+    def test_serialize_nested(self):
+        """Test nested models serialize as expected."""
+        c = Compound(
+            names=['Coumarin 343'],
+            nmr_spectra=[NmrSpectrum(nucleus='1H', peaks=[NmrPeak(shift='7.26', multiplicity='s'), NmrPeak()])],
+            melting_points=[MeltingPoint()]
+        )
+        self.assertEqual(c.serialize(), {
+            'names': ['Coumarin 343'],
+            'nmr_spectra': [{'nucleus': '1H', 'peaks': [{'shift': '7.26', 'multiplicity': 's'}, {}]}],
+            'melting_points': [{}]
+        })
+
+    def test_serialize_null(self):
+        """Test null fields are included in serialized output."""
+
+        class Measurement(BaseModel):
+            value = StringType(null=True)
+            units = StringType()
+
+        self.assertEqual(Measurement().serialize(), {'value': None})
+        self.assertEqual(Measurement().is_empty(), False)
+
+    def test_serialize_added_field(self):
+        """Test serializer includes fields added to a model class after it was first used."""
+
+        class Measurement(BaseModel):
+            value = StringType()
+
+        self.assertEqual(Measurement(value='1').serialize(), {'value': '1'})
+        Measurement.units = StringType()
+        self.assertEqual(Measurement(value='1', units='K').serialize(), {'value': '1', 'units': 'K'})
+
+    def test_is_empty(self):
+        """Test is_empty matches whether serialized output is empty."""
+        models = [
+            Compound(),
+            Compound(names=[]),
+            Compound(names=['Coumarin 343']),
+            Compound(melting_points=[MeltingPoint()]),
+            MeltingPoint(),
+            MeltingPoint(value=''),
+            MeltingPoint(value='240'),
+            UvvisSpectrum(peaks=[]),
+        ]
+        for model in models:
+            self.assertEqual(model.is_empty(), not model.serialize())
+
+    def test_populated_fields(self):
+        """Test populated_fields matches the keys in the serialized output."""
+        c = Compound(labels=['3a'], roles=['product'], names=[], melting_points=[MeltingPoint()])
+        self.assertEqual(sorted(c.populated_fields()), sorted(c.serialize().keys()))
+
+    def test_iter_json(self):
+        """Test streaming JSON export gives the same output as to_json."""
+        records = ModelList(
+            Compound(names=['Coumarin 343'], labels=['3a']),
+            Compound(melting_points=[MeltingPoint(value='240', units='°C')])
+        )
+        for kwargs in [{}, {'indent': 2}, {'indent': 2, 'ensure_ascii': False}, {'separators': (',', ':')}]:
+            self.assertEqual(''.join(records.iter_json(**kwargs)), records.to_json(**kwargs))
+        self.assertEqual(''.join(ModelList().iter_json(indent=2)), ModelList().to_json(indent=2))
+        f = six.StringIO()
+        records.write_json(f, indent=2)
+        self.assertEqual(json.loads(f.getvalue()), records.serialize())
+
+
 if __name__ == '__main__':
     unittest.main()
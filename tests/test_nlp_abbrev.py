@@ -98,6 +98,20 @@ class TestChemAbbreviationDetector(unittest.TestCase):
             ad.detect(['was', 'mostly', 'neutral', 'in', 'methanol', '(', 'MeOH', ')'])
         )
 
+    def test_replace_equivs(self):
+        """Test replacing the string equivalents of a detector that has already been used."""
+        ad = ChemAbbreviationDetector()
+        tokens = ['aqueous', 'silver', 'nitrate', '(', 'AgN', ')']
+        self.assertEqual([(['AgN'], ['silver', 'nitrate'])], ad.detect(tokens))
+        ad.abbr_equivs = [('gold', 'Au')]
+        self.assertEqual([], ad.detect(tokens))
+
+    def test_unclosed_brackets(self):
+        """Test the ChemAbbreviationDetector on a sentence with many unclosed brackets."""
+        ad = ChemAbbreviationDetector()
+        tokens = ['('] * 5000 + ['tetrahydrofuran', '(', 'THF', ')']
+        self.assertEqual([((5002, 5003), (5000, 5001))], ad.detect_spans(tokens))
+
     def test_document(self):
         elements = [
             Paragraph('''The consequences of global change on rivers include altered flow regime, and entrance of
@@ -12,11 +12,17 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
+import io
 import logging
+import os
+import re
 import unittest
 
 from chemdataextractor.doc import Span, Document
-from chemdataextractor.nlp.cem import CiDictCemTagger, CrfCemTagger, CemTagger
+from chemdataextractor.nlp.cem import CiDictCemTagger, CrfCemTagger, CemTagger, CemSpanProcessor
+from chemdataextractor.nlp.cem import IGNORE_PREFIX, IGNORE_SUFFIX, STOPLIST, STOP_RES
+from chemdataextractor.nlp.tokenize import ChemWordTokenizer
+from chemdataextractor.reader import RscHtmlReader
 
 logging.basicConfig(level=logging.DEBUG)
 log = logging.getLogger(__name__)
@@ -90,6 +96,98 @@ class TestCemTagger(unittest.TestCase):
         self.assertEqual([], Document('non-aromatic').cems)
 
 
+def sequential_in_stoplist(entity):
+    """Reference implementation of CemTagger._in_stoplist that tries each prefix, suffix and regex in turn."""
+    start = 0
+    end = len(entity)
+    for prefix in IGNORE_PREFIX:
+        if entity.startswith(prefix):
+            start += len(prefix)
+            break
+    for suffix in IGNORE_SUFFIX:
+        if entity.endswith(suffix):
+            end -= len(suffix)
+            break
+    if start >= end:
+        return True
+    entity = entity[start:end]
+    if entity in STOPLIST:
+        return True
+    return any(re.search(stop_re, entity) for stop_re in STOP_RES)
+
+
+class TestCemStoplist(unittest.TestCase):
+    """Test the compiled stoplist in CemTagger gives the same results as checking each list entry in turn."""
+
+    def test_constructed(self):
+        """Test entities built from the stoplist entries."""
+        entities = set(STOPLIST) | set(IGNORE_PREFIX) | set(IGNORE_SUFFIX)
+        for word in ['benzene', 'water', 'o-deethylase', 'high-', '-ion']:
+            entities.update(prefix + word for prefix in IGNORE_PREFIX)
+            entities.update(word + suffix for suffix in IGNORE_SUFFIX)
+        for stop in STOPLIST:
+            entities.update(prefix + stop + suffix for prefix in IGNORE_PREFIX[:3] for suffix in IGNORE_SUFFIX[:3])
+        entities.update(['http://www.rsc.org', 'rsc.org', '1234-567x', 'a.b@rsc.ac.uk', '1,234', '12.34', '[1] [2]',
+                         '= 5', '+1 2', 'cm-1 band', 'compounds 1a', 'b3lyp', 'smith et al.', 'us 6 840 965 b2',
+                         'pre-1990', '5 ml', 'fig.png', 'tel : +44', ''])
+        ct = CemTagger()
+        for entity in entities:
+            self.assertEqual(bool(sequential_in_stoplist(entity)), bool(ct._in_stoplist(entity)), entity)
+
+    def test_corpus(self):
+        """Test every one and two token entity in the RSC test document."""
+        with io.open(os.path.join(os.path.dirname(__file__), 'data', 'rsc', '10.1039_C6OB02074G.html'), 'rb') as f:
+            d = RscHtmlReader().readstring(f.read())
+        tokenizer = ChemWordTokenizer()
+        entities = set()
+        for el in d.elements:
+            if hasattr(el, 'text'):
+                tokens = [token.lower() for token in tokenizer.tokenize(el.text)]
+                entities.update(tokens)
+                entities.update(' '.join(pair) for pair in zip(tokens, tokens[1:]))
+        ct = CemTagger()
+        for entity in entities:
+            self.assertEqual(bool(sequential_in_stoplist(entity)), bool(ct._in_stoplist(entity)), entity)
+
+
+class TestCemSpanProcessor(unittest.TestCase):
+
+    def test_boundaries(self):
+        """Test removing ignored prefixes, suffixes and enclosing brackets from mentions."""
+        sp = CemSpanProcessor()
+        self.assertEqual((('cancer', 5, 11),), sp.process('anti-cancer'))
+        self.assertEqual((('Ag', 0, 2),), sp.process('Ag-based'))
+        self.assertEqual((('THF', 1, 4),), sp.process('(THF)'))
+        self.assertEqual((('Cu', 1, 3),), sp.process('[Cu]'))
+        self.assertEqual((('(THF', 0, 4),), sp.process('(THF'))
+        self.assertEqual((), sp.process('anti-'))
+
+    def test_lengthened_by_lowercase(self):
+        """Test that ignored suffixes are removed from the original text when lowercasing changes its length."""
+        sp = CemSpanProcessor()
+        self.assertEqual(((u'Sİases', 0, 6),), sp.process(u'Sİases-based'))
+
+    def test_splits_and_specials(self):
+        """Test splitting mentions and extracting the groups of special patterns."""
+        sp = CemSpanProcessor()
+        self.assertEqual((('silver', 0, 6), ('gold', 7, 11)), sp.process('silver/gold'))
+        self.assertEqual((('iron', 0, 4), ('nickel', 5, 11)), sp.process('iron-nickel'))
+        self.assertEqual((('iron-cancer', 0, 11),), sp.process('iron-cancer'))
+        self.assertEqual((('UDP', 0, 3), ('glucose', 4, 11)), sp.process('UDP-glucose'))
+        self.assertEqual((('ZnO', 0, 3),), sp.process('ZnO-NPs'))
+
+    def test_cache(self):
+        """Test that results are cached by mention text."""
+        sp = CemSpanProcessor(cache_size=10)
+        sp.process('UDP-glucose')
+        sp.process('UDP-glucose')
+        self.assertEqual(1, sp.cache.hits)
+        self.assertEqual(1, sp.cache.misses)
+        sp = CemSpanProcessor(cache_size=0)
+        self.assertEqual((('UDP', 0, 3), ('glucose', 4, 11)), sp.process('UDP-glucose'))
+        self.assertEqual(0, len(sp.cache))
+
+
 # TODO: Test entity recognition on a sentence containing a generic abbreviation that is only picked up through its definition
 
 
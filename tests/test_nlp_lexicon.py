@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+test_nlp_lexicon
+~~~~~~~~~~~~~~~~
+
+Test the Lexicon.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import logging
+import unittest
+
+from chemdataextractor.nlp.lexicon import Lexeme, Lexicon
+
+
+logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+
+TOKENS = [
+    '', 'The', 'the', 'THE', 'Coumarin', '343', '3.5', '1,000', '1/2', 'one', 'x-ray', '-', '--', 'www.bbc.co.uk',
+    'http://example.com', '.', ',', '!?', '(', ')', '°C', '%', '□', '×', 'α-helix', 'Βeta', '２', '2′-deoxy', 'Ⅻ', 'ǅ',
+    'H₂O', 'µm', '‐', '"quoted"', 'aaaabbbb', 'AAAA1111', 'naïve', '­', 'The', '343',
+]
+
+
+class TestLexicon(unittest.TestCase):
+
+    def setUp(self):
+        self.lexicon = Lexicon()
+        self.saved = self.lexicon.lexemes
+        self.lexicon.lexemes = {}
+
+    def tearDown(self):
+        self.lexicon.lexemes = self.saved
+
+    def test_add_many(self):
+        """Test add_many gives the same lexemes as adding each text individually."""
+        for text in TOKENS:
+            self.lexicon.add(text)
+        expected = self.lexicon.lexemes
+        self.lexicon.lexemes = {}
+        self.lexicon.add_many(TOKENS)
+        self.assertEqual(sorted(self.lexicon.lexemes), sorted(expected))
+        for text, lexeme in expected.items():
+            for name in Lexeme.__slots__:
+                self.assertEqual(getattr(self.lexicon.lexemes[text], name), getattr(lexeme, name), (text, name))
+
+    def test_add_many_existing(self):
+        """Test add_many keeps existing lexemes."""
+        self.lexicon.add('The')
+        lexeme = self.lexicon['The']
+        self.lexicon.add_many(['The', 'cat'])
+        self.assertIs(self.lexicon['The'], lexeme)
+        self.assertEqual(self.lexicon['cat'].shape, 'xxx')
+
+    def test_add_many_limit(self):
+        """Test add_many never stores more than max_lexemes, even for a larger batch."""
+        max_lexemes = self.lexicon.max_lexemes
+        self.lexicon.max_lexemes = 5
+        try:
+            self.lexicon.add_many(['a', 'b'])
+            self.lexicon.add_many(TOKENS)
+            self.assertEqual(len(self.lexicon), 5)
+            self.assertEqual(self.lexicon['Coumarin'].text, 'Coumarin')
+            self.assertLessEqual(len(self.lexicon), 5)
+        finally:
+            self.lexicon.max_lexemes = max_lexemes
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -804,6 +804,31 @@ class TestChemTokenizer(unittest.TestCase):
             [sent.raw_tokens for sent in t.sentences]
         )
 
+    def test_replace_rules(self):
+        """Test replacing a rule list on a tokenizer instance that has already been used."""
+        self.assertEqual(['5', '%', 'Pd→C'], self.t.tokenize('5% Pd→C'))
+        self.assertEqual(['1', '@', '2'], self.t.tokenize('1@2'))
+        self.t.SPLIT = ['→']
+        self.t.SPLIT_END = ['%']
+        self.assertEqual(['5', '%', 'Pd', '→', 'C'], self.t.tokenize('5% Pd→C'))
+        self.assertEqual(['1@2'], self.t.tokenize('1@2'))
+
+    def test_chunk_cache(self):
+        """Test repeated chunks are split once and the result depends on their position in the sentence."""
+        self.t.chunk_cache.clear()
+        self.assertEqual(['the', 'solid', '.', '1H', 'NMR', 'of', 'the', 'solid', '.'],
+                         self.t.tokenize('the solid.1H NMR of the solid.'))
+        self.assertEqual(['the', 'solid.1H', 'spectrum', 'of', 'the', 'solid.1H'],
+                         self.t.tokenize('the solid.1H spectrum of the solid.1H'))
+        self.assertEqual(['the', 'solid', '.', '1H', 'NMR'], self.t.tokenize('the solid.1H NMR'))
+        stats = self.t.chunk_cache.stats()
+        self.assertEqual(stats['hits'], 6)
+        self.assertEqual(stats['misses'], 9)
+
+    def test_long_sentence(self):
+        """Test tokenizing a sentence with many tokens."""
+        self.assertEqual(['(', 'NaCl', ',', 'KBr', ')'] * 5000, self.t.tokenize(' '.join(['(NaCl, KBr)'] * 5000)))
+
 
 class TestFineWordTokenizer(unittest.TestCase):
     """Test the fine word tokenizer."""
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+test_profiler
+~~~~~~~~~~~~~
+
+Test the pipeline stage profiler.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import io
+import json
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import unittest
+
+from nltk.tokenize.punkt import PunktSentenceTokenizer
+
+from chemdataextractor.doc import Document
+from chemdataextractor.doc.text import Paragraph, Sentence
+from chemdataextractor.nlp.lexicon import Lexicon
+from chemdataextractor.nlp.tokenize import SentenceTokenizer
+from chemdataextractor.profiler import Profiler, stage
+
+
+logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_off(self):
+        """Test that stages run outside a Profiler are not recorded anywhere."""
+        profiler = Profiler()
+        with stage('outer') as s:
+            s.count(3)
+        self.assertEqual({}, dict(profiler.stages))
+
+    def test_nested(self):
+        """Test call counts, item counts and self time of nested stages."""
+        with Profiler() as profiler:
+            for _ in range(2):
+                with stage('outer') as s:
+                    s.count(3)
+                    with stage('inner', self):
+                        pass
+        self.assertEqual(['inner.TestProfiler', 'outer'], list(profiler.stages))
+        outer = profiler.stages['outer']
+        inner = profiler.stages['inner.TestProfiler']
+        self.assertEqual((2, 6), (outer.calls, outer.items))
+        self.assertEqual((2, 0), (inner.calls, inner.items))
+        self.assertAlmostEqual(outer.time, outer.self_time + inner.time)
+        self.assertLessEqual(outer.time, profiler.total_time)
+
+    def test_exception(self):
+        """Test that a stage that raises an exception is still recorded."""
+        with Profiler() as profiler:
+            with self.assertRaises(ValueError):
+                with stage('outer'):
+                    with stage('inner'):
+                        raise ValueError
+            with stage('after'):
+                pass
+        self.assertEqual(1, profiler.stages['inner'].calls)
+        self.assertEqual(1, profiler.stages['outer'].calls)
+        self.assertAlmostEqual(profiler.stages['after'].time, profiler.stages['after'].self_time)
+
+    def test_nested_profilers(self):
+        """Test that stages are only recorded by the innermost running Profiler."""
+        with Profiler() as outer:
+            with Profiler() as inner:
+                with stage('inner'):
+                    pass
+            with stage('outer'):
+                pass
+        self.assertEqual(['inner'], list(inner.stages))
+        self.assertEqual(['outer'], list(outer.stages))
+        self.assertFalse(inner.running or outer.running)
+
+    def test_threads(self):
+        """Test that a Profiler only records stages run in the thread that started it."""
+        def run():
+            with stage('other'):
+                pass
+        with Profiler() as profiler:
+            thread = threading.Thread(target=run)
+            thread.start()
+            thread.join()
+            with stage('main'):
+                pass
+        self.assertEqual(['main'], list(profiler.stages))
+
+    def test_serialize(self):
+        """Test converting results to JSON and a report table."""
+        with Profiler() as profiler:
+            with stage('outer') as s:
+                s.count(1)
+        data = json.loads(profiler.to_json())
+        self.assertEqual({'calls': 1, 'items': 1}, {k: data['stages']['outer'][k] for k in ('calls', 'items')})
+        self.assertEqual(profiler.total_time, data['total_time'])
+        self.assertEqual(['stage', 'outer', 'total'], [line.split()[0] for line in profiler.report().splitlines()])
+
+    def test_pipeline(self):
+        """Test reading a document and tokenizing a sentence."""
+        with Profiler() as profiler:
+            html = b'<html><body><p>Hello world.</p><p>Another paragraph.</p></body></html>'
+            d = Document.from_string(html, fname='doc.html')
+            Sentence('The mixture was stirred at 25 °C.', lexicon=Lexicon()).tokens
+        self.assertEqual(2, len(d.elements))
+        self.assertEqual(2, profiler.stages['reader.HtmlReader'].items)
+        self.assertEqual(1, profiler.stages['cleaner'].calls)
+        self.assertEqual(9, profiler.stages['word_tokenizer.ChemWordTokenizer'].items)
+
+    def test_punkt_sentences(self):
+        """Test splitting a paragraph with a Punkt model, which returns a generator of spans."""
+        tmp = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp, 'punkt.pickle')
+            with io.open(path, 'wb') as f:
+                pickle.dump(PunktSentenceTokenizer(), f)
+            tokenizer = SentenceTokenizer(model=path)
+            text = 'The mixture was stirred. It was then filtered.'
+            self.assertEqual(2, len(Paragraph(text, sentence_tokenizer=tokenizer).sentences))
+            with Profiler() as profiler:
+                self.assertEqual(2, len(Paragraph(text, sentence_tokenizer=tokenizer).sentences))
+            self.assertEqual(2, profiler.stages['sentence_tokenizer.SentenceTokenizer'].items)
+            tokenizer.unload()
+        finally:
+            shutil.rmtree(tmp)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,8 +14,9 @@ from __future__ import unicode_literals
 import logging
 import unittest
 
-from chemdataextractor.doc import Paragraph
-from chemdataextractor.reader import HtmlReader
+from chemdataextractor.doc import Document, Paragraph
+from chemdataextractor.errors import ReaderError
+from chemdataextractor.reader import HtmlReader, RscHtmlReader
 
 
 logging.basicConfig(level=logging.DEBUG)
@@ -67,5 +68,51 @@ class TestReaderHtml(unittest.TestCase):
             self.assertIsInstance(el, Paragraph)
 
 
+def _remove_paragraphs(root):
+    """Cleaner that removes all paragraphs."""
+    for p in root.xpath('//p'):
+        p.getparent().remove(p)
+
+
+class _FailingHtmlReader(HtmlReader):
+    """HTML reader that fails after it has cleaned the tree."""
+
+    cleaners = [_remove_paragraphs]
+
+    def _parse_element(self, el, specials=None, refs=None, element_cls=Paragraph):
+        raise ReaderError('Unable to parse %s' % el.tag)
+
+
+class TestReaderShared(unittest.TestCase):
+
+    html = b'<html><head><meta name="citation_doi" content="10.1039/abc"></head><body><p>First para</p></body></html>'
+
+    def test_shared_tree(self):
+        """Test a tree parsed by a reader that fails is reused unchanged by the next reader."""
+        shared = {}
+        with self.assertRaises(ReaderError):
+            RscHtmlReader().readshared(self.html, shared)
+        self.assertEqual(len(shared), 1)
+        tree = list(shared.values())[0]
+        d = HtmlReader().readshared(self.html, shared)
+        self.assertEqual(len(shared), 1)
+        self.assertIs(list(shared.values())[0], tree)
+        self.assertEqual([el.text for el in d.elements], ['First para'])
+
+    def test_shared_tree_cleaned(self):
+        """Test a tree cleaned by a reader that fails isn't passed on to the next reader."""
+        shared = {}
+        with self.assertRaises(ReaderError):
+            _FailingHtmlReader().readshared(self.html, shared)
+        self.assertEqual(len(shared), 0)
+        d = HtmlReader().readshared(self.html, shared)
+        self.assertEqual([el.text for el in d.elements], ['First para'])
+
+    def test_fallback(self):
+        """Test Document.from_string falls back to the next reader when the root element is missing."""
+        d = Document.from_string(self.html, readers=[RscHtmlReader(), HtmlReader()])
+        self.assertEqual([el.text for el in d.elements], ['First para'])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+test_reader_pdf
+~~~~~~~~~~~~~~~
+
+Test PDF reader.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import logging
+import unittest
+
+from chemdataextractor.doc import Paragraph
+from chemdataextractor.reader import PdfReader
+
+
+logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+
+def make_pdf(texts):
+    """Return the contents of a minimal PDF with one page containing each text."""
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        ('<< /Type /Pages /Kids [%s] /Count %d >>' % (
+            ' '.join('%d 0 R' % (4 + 2 * i) for i in range(len(texts))), len(texts)
+        )).encode('ascii'),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    for i, text in enumerate(texts):
+        stream = ('BT /F1 12 Tf 72 720 Td (%s) Tj ET' % text).encode('ascii')
+        objects.append((
+            '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> '
+            '/Contents %d 0 R >>' % (5 + 2 * i)
+        ).encode('ascii'))
+        objects.append(b'<< /Length ' + str(len(stream)).encode('ascii') + b' >>\nstream\n' + stream + b'\nendstream')
+    pdf = b'%PDF-1.4\n'
+    offsets = []
+    for i, obj in enumerate(objects):
+        offsets.append(len(pdf))
+        pdf += ('%d 0 obj\n' % (i + 1)).encode('ascii') + obj + b'\nendobj\n'
+    xref = len(pdf)
+    pdf += ('xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)).encode('ascii')
+    for offset in offsets:
+        pdf += ('%010d 00000 n \n' % offset).encode('ascii')
+    pdf += ('trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)).encode('ascii')
+    return pdf
+
+
+class TestPdfReader(unittest.TestCase):
+
+    maxDiff = None
+
+    texts = ['Page one', 'Page two', 'Page three', 'Page four', 'Page five']
+
+    def setUp(self):
+        self.pdf = make_pdf(self.texts)
+
+    def test_parse(self):
+        """Test text is read from every page in order."""
+        d = PdfReader().readstring(self.pdf)
+        self.assertEqual([el.text for el in d.elements], self.texts)
+        for el in d.elements:
+            self.assertIsInstance(el, Paragraph)
+
+    def test_pages(self):
+        """Test only the selected pages are read."""
+        d = PdfReader(pages=[1, 3]).readstring(self.pdf)
+        self.assertEqual([el.text for el in d.elements], ['Page two', 'Page four'])
+        self.assertEqual(PdfReader(pages=[]).readstring(self.pdf).elements, [])
+
+    def test_iter_pages(self):
+        """Test pages are yielded with their page numbers."""
+        pages = [(pageno, [el.text for el in elements]) for pageno, elements in PdfReader().iter_pages(self.pdf)]
+        self.assertEqual(pages, [(i, [text]) for i, text in enumerate(self.texts)])
+
+    def test_processes(self):
+        """Test layout analysis in worker processes gives the same pages in the same order."""
+        d = PdfReader(processes=2, chunksize=2).readstring(self.pdf)
+        self.assertEqual([el.text for el in d.elements], self.texts)
+        d = PdfReader(pages=range(1, 5), processes=2, chunksize=1).readstring(self.pdf)
+        self.assertEqual([el.text for el in d.elements], self.texts[1:])
+
+
+if __name__ == '__main__':
+    unittest.main()
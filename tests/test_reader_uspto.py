@@ -11,6 +11,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
+import gzip
 import io
 import logging
 import os
@@ -52,6 +53,21 @@ class TestUsptoReader(unittest.TestCase):
         d = Document.from_file(f, readers=[UsptoXmlReader()])
         self.assertEqual(len(d.elements), 112)
 
+    def test_read_bulk(self):
+        """Test UsptoXmlReader reads each document in a compressed bulk file of concatenated documents."""
+        r = UsptoXmlReader()
+        fname = 'US06840965B2.xml'
+        f = io.open(os.path.join(os.path.dirname(__file__), 'data', 'uspto', fname), 'rb')
+        content = f.read()
+        bulk = io.BytesIO()
+        with gzip.GzipFile(fileobj=bulk, mode='wb') as gz:
+            gz.write(content + content)
+        bulk.seek(0)
+        docs = list(r.read_bulk(bulk))
+        self.assertEqual(len(docs), 2)
+        for d in docs:
+            self.assertEqual(len(d.elements), 112)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -191,6 +191,22 @@ class TestCleaner(unittest.TestCase):
         cleaner(tree)
         self.assertEqual(STRIPKS4, tostring(tree).decode())
 
+    def test_strip_allow(self):
+        """Test elements matched by allow_xpath are not stripped."""
+        cleaner = Cleaner(strip_xpath='.//*', allow_xpath='.//strong')
+        tree = html.fromstring(HTML4)
+        cleaner(tree)
+        self.assertEqual('<p>Here is a text para with some inline markup, like <strong>this</strong>. Also a link</p>', tostring(tree).decode())
+
+    def test_change_xpath(self):
+        """Test changing an XPath attribute after a Cleaner has been used takes effect."""
+        cleaner = Cleaner(strip_xpath='.//em')
+        tree = html.fromstring(HTML4)
+        cleaner(tree)
+        cleaner.strip_xpath = './/strong'
+        cleaner(tree)
+        self.assertEqual('<p>Here is a text para with some inline markup, like this. Also a <a href="#thing">link</a></p>', tostring(tree).decode())
+
 
 if __name__ == '__main__':
     unittest.main()
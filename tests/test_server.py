@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+test_server
+~~~~~~~~~~~
+
+Test the extraction service.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import io
+import json
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import unittest
+import zipfile
+
+from nltk.tokenize.punkt import PunktSentenceTokenizer
+from six.moves.urllib.error import HTTPError
+from six.moves.urllib.request import Request, urlopen
+
+from chemdataextractor.data import model_cache
+from chemdataextractor.doc.text import Sentence, Text, tag_sentences
+from chemdataextractor.nlp.lexicon import Lexicon
+from chemdataextractor.nlp.tag import BaseTagger
+from chemdataextractor.nlp.tokenize import SentenceTokenizer
+from chemdataextractor.server import ExtractionService, make_server, serve_jsonl
+
+
+logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+
+EMPTY_HTML = '<html><body></body></html>'
+
+
+def _zip_document():
+    """Return a zip file with two files, which can't be read as a document."""
+    f = io.BytesIO()
+    with zipfile.ZipFile(f, 'w') as z:
+        z.writestr('a.html', EMPTY_HTML)
+        z.writestr('b.html', EMPTY_HTML)
+    return f.getvalue()
+
+
+class _ServerLexicon(Lexicon):
+    pass
+
+
+class _CountingTagger(BaseTagger):
+    """Tag every token with a fixed tag, and count the calls to tag_sents."""
+
+    def __init__(self, tag):
+        self.fixed_tag = tag
+        self.calls = []
+
+    def tag(self, tokens):
+        return [(token, self.fixed_tag) for token in tokens]
+
+    def tag_sents(self, sentences):
+        sentences = list(sentences)
+        self.calls.append(len(sentences))
+        return [self.tag(tokens) for tokens in sentences]
+
+
+class TestTagSentences(unittest.TestCase):
+
+    def _sentence(self, text, pos_tagger, ner_tagger):
+        return Sentence(text, lexicon=_ServerLexicon(), pos_tagger=pos_tagger, ner_tagger=ner_tagger)
+
+    def test_tag_sentences(self):
+        """Test sentences that share taggers are tagged with one call to each tagger."""
+        pos_tagger = _CountingTagger('NN')
+        ner_tagger = _CountingTagger(None)
+        sents = [self._sentence('Benzene was added.', pos_tagger, ner_tagger),
+                 self._sentence('The mixture was stirred.', pos_tagger, ner_tagger)]
+        tag_sentences(sents)
+        self.assertEqual([2], pos_tagger.calls)
+        self.assertEqual([2], ner_tagger.calls)
+        self.assertEqual([('Benzene', 'NN'), ('was', 'NN'), ('added', 'NN'), ('.', 'NN')], sents[0].pos_tagged_tokens)
+        self.assertEqual([(('Benzene', 'NN'), None), (('was', 'NN'), None), (('added', 'NN'), None), (('.', 'NN'), None)],
+                         sents[0].unprocessed_ner_tagged_tokens)
+        # Tags are memoized, so the taggers aren't called again
+        tag_sentences(sents)
+        self.assertEqual([2], pos_tagger.calls)
+        self.assertEqual([2], ner_tagger.calls)
+
+    def test_tag_sentences_taggers(self):
+        """Test sentences with different taggers are tagged by their own tagger."""
+        nn_tagger = _CountingTagger('NN')
+        vb_tagger = _CountingTagger('VB')
+        ner_tagger = _CountingTagger(None)
+        sents = [self._sentence('Stir.', vb_tagger, ner_tagger),
+                 self._sentence('Benzene.', nn_tagger, ner_tagger),
+                 self._sentence('Heat.', vb_tagger, ner_tagger)]
+        tag_sentences(sents)
+        self.assertEqual([1], nn_tagger.calls)
+        self.assertEqual([2], vb_tagger.calls)
+        self.assertEqual([3], ner_tagger.calls)
+        self.assertEqual([('Heat', 'VB'), ('.', 'VB')], sents[2].pos_tagged_tokens)
+
+
+class TestExtractionService(unittest.TestCase):
+
+    maxDiff = None
+
+    def setUp(self):
+        self.service = ExtractionService(max_batch=8, max_wait=0.05)
+        self.service.start()
+
+    def tearDown(self):
+        self.service.stop()
+
+    def test_warm_up(self):
+        """Test warming up the pipeline with a Punkt sentence tokenizer, which returns a generator of spans."""
+        tmp = tempfile.mkdtemp()
+        path = os.path.join(tmp, 'punkt.pickle')
+        with io.open(path, 'wb') as f:
+            pickle.dump(PunktSentenceTokenizer(), f)
+        names = ['sentence_tokenizer', 'lexicon', 'pos_tagger', 'ner_tagger']
+        components = {name: getattr(Text, name) for name in names}
+        Text.sentence_tokenizer = SentenceTokenizer(model=path)
+        Text.lexicon = _ServerLexicon()
+        Text.pos_tagger = _CountingTagger('NN')
+        Text.ner_tagger = _CountingTagger(None)
+        try:
+            self.service.warm_up()
+            self.assertIn(path, model_cache)
+            Text.sentence_tokenizer.unload()
+        finally:
+            for name, component in components.items():
+                setattr(Text, name, component)
+            shutil.rmtree(tmp)
+
+    def test_extract(self):
+        """Test extracting the records of a document."""
+        response = self.service.extract({'id': 1, 'document': EMPTY_HTML, 'fname': 'empty.html'})
+        self.assertEqual({'id': 1, 'records': []}, response)
+
+    def test_extract_error(self):
+        """Test a document that can't be read gets an error response."""
+        response = self.service.extract({'id': 'bad', 'document': _zip_document()})
+        self.assertEqual('bad', response['id'])
+        self.assertIn('error', response)
+        self.assertEqual({'error': 'ValueError: Request must have a text or document'}, self.service.extract({}))
+
+    def test_batch(self):
+        """Test concurrent requests are processed in batches, and a failed request doesn't affect the others."""
+        jobs = [self.service.submit({'id': i, 'document': EMPTY_HTML if i != 3 else _zip_document()}) for i in range(6)]
+        responses = [job.wait(10) for job in jobs]
+        self.assertEqual([0, 1, 2, 3, 4, 5], [response['id'] for response in responses])
+        self.assertEqual([[], [], [], None, [], []], [response.get('records') for response in responses])
+        self.assertIn('error', responses[3])
+        metrics = self.service.serialize_metrics()
+        self.assertEqual(6, metrics['requests'])
+        self.assertEqual(1, metrics['errors'])
+        self.assertLess(metrics['batches'], 6)
+
+    def test_metrics(self):
+        """Test the metrics include throughput, latency and cache statistics."""
+        self.service.extract({'document': EMPTY_HTML})
+        metrics = self.service.serialize_metrics()
+        for key in ['uptime', 'requests', 'errors', 'batches', 'sentences', 'mean_batch_size', 'requests_per_second',
+                    'sentences_per_second', 'latency', 'caches', 'memory', 'models']:
+            self.assertIn(key, metrics)
+        self.assertEqual(['p50', 'p90', 'p99'], sorted(metrics['latency']))
+        self.assertGreater(metrics['latency']['p50'], 0)
+        # Metrics can be sent as JSON
+        json.dumps(metrics)
+
+    def test_metrics_during_batch(self):
+        """Test metrics don't wait for a batch to finish, and a new memory report is made when the batch finishes."""
+        self.service.extract({'document': EMPTY_HTML})
+        memory = self.service.serialize_metrics()['memory']
+        results = []
+        with self.service._lock:
+            thread = threading.Thread(target=lambda: results.append(self.service.serialize_metrics()))
+            thread.start()
+            thread.join(10)
+            self.assertFalse(thread.is_alive())
+        self.assertEqual(1, results[0]['requests'])
+        self.assertIs(memory, results[0]['memory'])
+        self.service.extract({'document': EMPTY_HTML})
+        # Wait for the worker to finish the batch
+        self.service.stop()
+        self.assertIsNot(memory, self.service._memory)
+
+    def test_jsonl(self):
+        """Test JSON lines requests get responses in the same order."""
+        lines = [json.dumps({'id': i, 'document': EMPTY_HTML}) for i in range(4)]
+        lines.insert(2, '{not json')
+        output = io.StringIO()
+        serve_jsonl(self.service, io.StringIO('\n'.join(lines) + '\n'), output)
+        responses = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(5, len(responses))
+        self.assertEqual([0, 1, None, 2, 3], [response.get('id') for response in responses])
+        self.assertTrue(responses[2]['error'].startswith('Invalid JSON'))
+
+    def test_http(self):
+        """Test extracting records and getting metrics over HTTP."""
+        server = make_server(self.service, port=0)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        try:
+            url = 'http://127.0.0.1:%s' % server.server_address[1]
+            request = Request(url + '/extract', data=json.dumps({'id': 'a', 'document': EMPTY_HTML}).encode('utf-8'),
+                              headers={'Content-Type': 'application/json'})
+            self.assertEqual({'id': 'a', 'records': []}, json.loads(urlopen(request).read().decode('utf-8')))
+            request = Request(url + '/extract?fname=empty.html', data=EMPTY_HTML.encode('utf-8'),
+                              headers={'Content-Type': 'text/html'})
+            self.assertEqual({'records': []}, json.loads(urlopen(request).read().decode('utf-8')))
+            request = Request(url + '/extract', data=b'{not json', headers={'Content-Type': 'application/json'})
+            with self.assertRaises(HTTPError) as cm:
+                urlopen(request)
+            self.assertEqual(400, cm.exception.code)
+            request = Request(url + '/extract', data=_zip_document(), headers={'Content-Type': 'application/zip'})
+            with self.assertRaises(HTTPError) as cm:
+                urlopen(request)
+            self.assertEqual(422, cm.exception.code)
+            metrics = json.loads(urlopen(url + '/metrics').read().decode('utf-8'))
+            self.assertEqual(3, metrics['requests'])
+            self.assertEqual({'status': 'ok'}, json.loads(urlopen(url + '/health').read().decode('utf-8')))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,10 +12,14 @@ from __future__ import division
 from __future__ import print_function
 from __future__ import unicode_literals
 import logging
+import re
+import unicodedata
 import unittest
 
+from chemdataextractor.text import CONTROLS, HYPHENS, MINUSES, DOUBLE_QUOTES, SINGLE_QUOTES, APOSTROPHES, ACCENTS
+from chemdataextractor.text import PRIMES, QUOTES, SLASHES, TILDES, get_encoding
 from chemdataextractor.text.latex import latex_to_unicode
-from chemdataextractor.text.normalize import normalize
+from chemdataextractor.text.normalize import normalize, Normalizer, ExcessNormalizer, ChemNormalizer
 from chemdataextractor.text.processors import extract_emails
 
 
@@ -35,6 +39,96 @@ class TestNormalization(unittest.TestCase):
         self.assertEqual(u'www.bbc.co.uk', normalize(u'www\u2024bbc\u2024co\u2024uk'))
 
 
+def sequential_normalize(normalizer, text):
+    """Reference implementation of Normalizer.normalize that applies each replacement in turn."""
+    if isinstance(normalizer, ExcessNormalizer):
+        text = text.lower()
+    if normalizer.form is not None:
+        text = unicodedata.normalize(normalizer.form, text)
+    for control in CONTROLS:
+        text = text.replace(control, '')
+    text = text.replace('\u000b', ' ').replace('\u000c', ' ').replace('\u0085', ' ')
+    text = text.replace('\u2028', '\n').replace('\u2029', '\n').replace('\r\n', '\n').replace('\r', '\n')
+    if normalizer.hyphens:
+        for hyphen in HYPHENS | MINUSES:
+            text = text.replace(hyphen, '-')
+        text = text.replace('\u00ad', '')
+    if normalizer.quotes:
+        for double_quote in DOUBLE_QUOTES:
+            text = text.replace(double_quote, '"')
+        for single_quote in (SINGLE_QUOTES | APOSTROPHES | ACCENTS):
+            text = text.replace(single_quote, "'")
+        for prime, replacement in [('\u2032', "'"), ('\u2035', "'"), ('\u2033', "''"), ('\u2036', "''"),
+                                   ('\u2034', "'''"), ('\u2037', "'''"), ('\u2057', "''''")]:
+            text = text.replace(prime, replacement)
+    if normalizer.ellipsis:
+        text = text.replace('\u2026', '...').replace(' . . . ', ' ... ')
+    if normalizer.slashes:
+        for slash in SLASHES:
+            text = text.replace(slash, '/')
+    if normalizer.tildes:
+        for tilde in TILDES:
+            text = text.replace(tilde, '~')
+    if normalizer.strip:
+        text = text.strip()
+    if normalizer.collapse:
+        text = ' '.join(text.split())
+    if isinstance(normalizer, ExcessNormalizer):
+        text = ''.join(text.split())
+        for quote in QUOTES:
+            text = text.replace(quote, "'")
+        for bracket in ['(', '<', '[', '{', '&lt;', ')', '>', ']', '}', '&gt;']:
+            text = text.replace(bracket, '(')
+    if isinstance(normalizer, ChemNormalizer) and normalizer.chem_spell:
+        text = re.sub(r'sulph', r'sulf', text, flags=re.I)
+        text = re.sub(r'aluminum', r'aluminium', text, flags=re.I)
+        text = re.sub(r'cesium', r'caesium', text, flags=re.I)
+    return text
+
+
+class TestNormalizerEquivalence(unittest.TestCase):
+    """Test the single pass normalizers give the same results as applying each replacement in turn."""
+
+    special = ''.join(sorted(CONTROLS | HYPHENS | MINUSES | QUOTES | SLASHES | TILDES | PRIMES))
+    texts = [
+        '',
+        'The quick brown fox jumped',
+        '  Leading and trailing whitespace\t\n',
+        special,
+        ' '.join(special),
+        'Line\r\nbreaks\rand\u2028separators\u2029\u000b\u000c\u0085',
+        'Soft\u00adhyphen between\r\u00ad\nline breaks and controls\r\u0003\n',
+        'Ellipsis\u2026 and . . . spaced dots',
+        'A \u2033double\u2033 and \u2057quadruple prime',
+        'Brackets (<[{&lt;}]>)&gt; in text',
+        'Sulphuric acid, SULPHATE, aluminum and Cesium chloride',
+        'Compound 1\u2010(4\u2032\u2011methyl)\u2212phenyl \u223c 5 \u2215 6',
+    ]
+    normalizers = [
+        Normalizer(),
+        Normalizer(hyphens=True),
+        Normalizer(quotes=True, strip=False, collapse=False),
+        Normalizer(form=None, hyphens=True, quotes=True, ellipsis=True, slashes=True, tildes=True, collapse=False),
+        Normalizer(strip=True, collapse=True, hyphens=True, quotes=True, ellipsis=True, tildes=True),
+        ExcessNormalizer(),
+        ChemNormalizer(),
+        ChemNormalizer(chem_spell=False, strip=False, collapse=False),
+    ]
+
+    def test_equivalence(self):
+        """Test normalizers match the reference implementation."""
+        for normalizer in self.normalizers:
+            for text in self.texts:
+                self.assertEqual(normalizer(text), sequential_normalize(normalizer, text))
+
+    def test_changed_options(self):
+        """Test changing normalizer options after creation takes effect."""
+        normalizer = Normalizer()
+        self.assertEqual(normalizer('1\u20102'), '1\u20102')
+        normalizer.hyphens = True
+        self.assertEqual(normalizer('1\u20102'), '1-2')
+
+
 class TestLaTeX(unittest.TestCase):
 
     def test_latex_to_unicode_names(self):
@@ -83,5 +177,27 @@ class TestExtraction(unittest.TestCase):
                          extract_emails('Invalid - matt@me...com, hithere@ex*ample.com'))
 
 
+class TestEncoding(unittest.TestCase):
+
+    def test_max_bytes(self):
+        """Test the encoding of a long input is detected from its start."""
+        text = ('Absorption λmax = 340 nm (ε = 12 500 M−1 cm−1) in CH2Cl2 at 25 °C. ' * 50).encode('utf-8')
+        # Cut through the middle of a multi-byte character, which must not stop the guess from being used
+        max_bytes = text.index('λ'.encode('utf-8'), 1000) + 1
+        self.assertEqual('utf-8', get_encoding(text, guesses='utf-8', max_bytes=max_bytes))
+        self.assertEqual('utf-8', get_encoding(bytearray(text), guesses='utf-8', max_bytes=max_bytes))
+
+    def test_max_bytes_ascii(self):
+        """Test the encoding of an input with an ASCII start is detected from the first part that isn't ASCII."""
+        self.assertEqual('ascii', get_encoding(b'abc', max_bytes=10))
+        self.assertEqual('ascii', get_encoding(b'abc' * 10, max_bytes=10))
+        self.assertEqual('utf-8', get_encoding(('abc' * 10 + 'α').encode('utf-8'), max_bytes=10))
+        # A Latin-1 character after the start isn't valid UTF-8
+        text = ('Absorption spectra were recorded in ethanol. ' * 100 + 'mp 142 °C.').encode('latin-1')
+        encoding = get_encoding(text, max_bytes=1000)
+        self.assertEqual('mp 142 °C.', text.decode(encoding)[-10:])
+        self.assertEqual(encoding, get_encoding(bytearray(text), max_bytes=1000))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+test_utils
+~~~~~~~~~~
+
+Test miscellaneous utility functions.
+
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+from __future__ import unicode_literals
+import bz2
+import gzip
+import io
+import logging
+import tarfile
+import unittest
+import zipfile
+
+from chemdataextractor.utils import BoundedCache, iter_decompressed, memoize
+
+
+logging.basicConfig(level=logging.DEBUG)
+log = logging.getLogger(__name__)
+
+
+class TestBoundedCache(unittest.TestCase):
+
+    def test_get(self):
+        """Test values can be stored and retrieved, counting hits and misses."""
+        cache = BoundedCache(maxsize=10)
+        self.assertEqual(cache.get('a'), None)
+        cache['a'] = 1
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('b', 2), 2)
+        self.assertEqual(cache.stats(), {'size': 1, 'maxsize': 10, 'hits': 1, 'misses': 2, 'hit_rate': 1 / 3})
+
+    def test_maxsize(self):
+        """Test the least recently used entry is discarded when the cache is full."""
+        cache = BoundedCache(maxsize=2)
+        cache['a'] = 1
+        cache['b'] = 2
+        cache.get('a')
+        cache['c'] = 3
+        self.assertEqual(len(cache), 2)
+        self.assertTrue('a' in cache)
+        self.assertFalse('b' in cache)
+        self.assertTrue('c' in cache)
+
+    def test_disabled(self):
+        """Test a maxsize of 0 stores nothing."""
+        cache = BoundedCache(maxsize=0)
+        cache['a'] = 1
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.get('a'), None)
+
+    def test_clear(self):
+        """Test clear removes entries and resets counts."""
+        cache = BoundedCache(maxsize=None)
+        cache['a'] = 1
+        cache.get('a')
+        cache.clear()
+        self.assertEqual(cache.stats(), {'size': 0, 'maxsize': None, 'hits': 0, 'misses': 0, 'hit_rate': 0.0})
+
+    def test_resize(self):
+        """Test shrinking a cache discards the least recently used entries."""
+        cache = BoundedCache(maxsize=None)
+        for i in range(5):
+            cache[i] = i
+        cache.get(0)
+        cache.resize(2)
+        self.assertEqual([4, 0], list(cache))
+        cache[5] = 5
+        self.assertEqual([0, 5], list(cache))
+
+    def test_memoize(self):
+        """Test memoized functions are called once for each arguments, including when they return None."""
+        calls = []
+
+        @memoize
+        def f(x):
+            calls.append(x)
+            return None if x == 0 else x
+
+        self.assertEqual([None, 1, None, 1], [f(0), f(1), f(0), f(1)])
+        self.assertEqual([0, 1], calls)
+        self.assertEqual('memoize.f', f.cache.name)
+
+
+class TestIterDecompressed(unittest.TestCase):
+
+    content = b'<?xml version="1.0"?>\n<doc>Some content</doc>\n'
+
+    def read_all(self, f):
+        return [(name, member.read()) for name, member in iter_decompressed(f)]
+
+    def test_plain(self):
+        """Test uncompressed input is yielded unchanged."""
+        self.assertEqual(self.read_all(io.BytesIO(self.content)), [(None, self.content)])
+
+    def test_gzip(self):
+        """Test gzip input is decompressed."""
+        f = io.BytesIO()
+        with gzip.GzipFile(fileobj=f, mode='wb') as gz:
+            gz.write(self.content)
+        f.seek(0)
+        self.assertEqual(self.read_all(f), [(None, self.content)])
+
+    def test_bz2(self):
+        """Test bzip2 input is decompressed."""
+        self.assertEqual(self.read_all(io.BytesIO(bz2.compress(self.content))), [(None, self.content)])
+
+    def test_zip(self):
+        """Test each file in a zip archive is yielded."""
+        f = io.BytesIO()
+        with zipfile.ZipFile(f, 'w') as archive:
+            archive.writestr('a.xml', self.content)
+            archive.writestr('b.xml', self.content + self.content)
+        f.seek(0)
+        self.assertEqual(self.read_all(f), [('a.xml', self.content), ('b.xml', self.content + self.content)])
+
+    def test_tar_gz(self):
+        """Test each file in a compressed tar archive is yielded."""
+        f = io.BytesIO()
+        with tarfile.open(fileobj=f, mode='w:gz') as archive:
+            for name in ['a.xml', 'b.xml']:
+                info = tarfile.TarInfo(name)
+                info.size = len(self.content)
+                archive.addfile(info, io.BytesIO(self.content))
+        f.seek(0)
+        self.assertEqual(self.read_all(f), [('a.xml', self.content), ('b.xml', self.content)])
+
+
+if __name__ == '__main__':
+    unittest.main()